@@ -0,0 +1,246 @@
+"""initial schema
+
+Tables and indexes as created by Base.metadata.create_all() before the
+attendance rollup and migrations were introduced. init_db() stamps
+existing databases with this revision instead of running it.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL enum types created implicitly by the tables below
+ENUM_TYPES = (
+    'attendancestatus', 'userrole', 'announcementpriority', 'targetaudience',
+    'employeestatus', 'notificationtype', 'documentcategory', 'leavetype',
+    'leavestatus', 'taskstatus', 'taskpriority',
+)
+
+
+def upgrade() -> None:
+    op.create_table('users',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('role', sa.Enum('HR_ADMINISTRATOR', 'EMPLOYEE', name='userrole'), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('department', sa.String(length=100), nullable=False),
+    sa.Column('avatar_url', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_department', 'users', ['department'], unique=False)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+    op.create_index('ix_users_is_active', 'users', ['is_active'], unique=False)
+    op.create_index('ix_users_role', 'users', ['role'], unique=False)
+
+    op.create_table('announcements',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_by', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('priority', sa.Enum('NORMAL', 'HIGH', 'URGENT', name='announcementpriority'), nullable=False),
+    sa.Column('target_audience', sa.Enum('ALL', 'HR', 'EMPLOYEES', name='targetaudience'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_announcements_created_at', 'announcements', ['created_at'], unique=False)
+    op.create_index('ix_announcements_id', 'announcements', ['id'], unique=False)
+    op.create_index('ix_announcements_priority', 'announcements', ['priority'], unique=False)
+    op.create_index('ix_announcements_target_audience', 'announcements', ['target_audience'], unique=False)
+
+    op.create_table('employees',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('manager_id', sa.UUID(), nullable=True),
+    sa.Column('employee_id', sa.String(length=50), nullable=False),
+    sa.Column('position', sa.String(length=100), nullable=False),
+    sa.Column('hire_date', sa.Date(), nullable=False),
+    sa.Column('salary', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('status', sa.Enum('ACTIVE', 'INACTIVE', 'ON_LEAVE', name='employeestatus'), nullable=False),
+    sa.Column('performance_score', sa.Numeric(precision=3, scale=1), nullable=True),
+    sa.CheckConstraint('performance_score >= 0 AND performance_score <= 100', name='check_performance_score'),
+    sa.ForeignKeyConstraint(['manager_id'], ['employees.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_employees_employee_id', 'employees', ['employee_id'], unique=True)
+    op.create_index('ix_employees_id', 'employees', ['id'], unique=False)
+    op.create_index('ix_employees_manager_id', 'employees', ['manager_id'], unique=False)
+    op.create_index('ix_employees_status', 'employees', ['status'], unique=False)
+    op.create_index('ix_employees_user_id', 'employees', ['user_id'], unique=True)
+
+    op.create_table('notifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('sender_id', sa.UUID(), nullable=False),
+    sa.Column('recipient_id', sa.UUID(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('type', sa.Enum('INFO', 'WARNING', 'SUCCESS', 'ERROR', name='notificationtype'), nullable=False),
+    sa.Column('is_read', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('read_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['recipient_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('attendance',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('employee_id', sa.UUID(), nullable=False),
+    sa.Column('marked_by', sa.UUID(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('check_in', sa.Time(), nullable=True),
+    sa.Column('check_out', sa.Time(), nullable=True),
+    sa.Column('hours_worked', sa.Numeric(precision=4, scale=2), nullable=True),
+    sa.Column('status', sa.Enum('PRESENT', 'ABSENT', 'LATE', 'ON_LEAVE', name='attendancestatus'), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['marked_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id', 'date', name='uq_employee_date')
+    )
+    op.create_index('ix_attendance_date', 'attendance', ['date'], unique=False)
+    op.create_index('ix_attendance_employee_id', 'attendance', ['employee_id'], unique=False)
+    op.create_index('ix_attendance_id', 'attendance', ['id'], unique=False)
+    op.create_index('ix_attendance_status', 'attendance', ['status'], unique=False)
+
+    op.create_table('documents',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('employee_id', sa.UUID(), nullable=False),
+    sa.Column('uploaded_by', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('category', sa.Enum('CONTRACT', 'POLICY', 'REPORT', 'OTHER', name='documentcategory'), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_documents_category', 'documents', ['category'], unique=False)
+    op.create_index('ix_documents_employee_id', 'documents', ['employee_id'], unique=False)
+    op.create_index('ix_documents_id', 'documents', ['id'], unique=False)
+    op.create_index('ix_documents_uploaded_at', 'documents', ['uploaded_at'], unique=False)
+
+    op.create_table('leave_requests',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('employee_id', sa.UUID(), nullable=False),
+    sa.Column('reviewed_by', sa.UUID(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('type', sa.Enum('SICK', 'VACATION', 'PERSONAL', 'OTHER', name='leavetype'), nullable=False),
+    sa.Column('reason', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='leavestatus'), nullable=False),
+    sa.Column('days', sa.Integer(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('days > 0', name='check_positive_days'),
+    sa.CheckConstraint('end_date >= start_date', name='check_date_range'),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_leave_requests_employee_id', 'leave_requests', ['employee_id'], unique=False)
+    op.create_index('ix_leave_requests_end_date', 'leave_requests', ['end_date'], unique=False)
+    op.create_index('ix_leave_requests_id', 'leave_requests', ['id'], unique=False)
+    op.create_index('ix_leave_requests_start_date', 'leave_requests', ['start_date'], unique=False)
+    op.create_index('ix_leave_requests_status', 'leave_requests', ['status'], unique=False)
+    op.create_index('ix_leave_requests_submitted_at', 'leave_requests', ['submitted_at'], unique=False)
+
+    op.create_table('tasks',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('employee_id', sa.UUID(), nullable=False),
+    sa.Column('assigned_by', sa.UUID(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', name='taskstatus'), nullable=False),
+    sa.Column('priority', sa.Enum('LOW', 'MEDIUM', 'HIGH', name='taskpriority'), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_due_date', 'tasks', ['due_date'], unique=False)
+    op.create_index('ix_tasks_employee_id', 'tasks', ['employee_id'], unique=False)
+    op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False)
+    op.create_index('ix_tasks_priority', 'tasks', ['priority'], unique=False)
+    op.create_index('ix_tasks_status', 'tasks', ['status'], unique=False)
+
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_status', table_name='tasks')
+    op.drop_index('ix_tasks_priority', table_name='tasks')
+    op.drop_index('ix_tasks_id', table_name='tasks')
+    op.drop_index('ix_tasks_employee_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date', table_name='tasks')
+
+    op.drop_table('tasks')
+    op.drop_index('ix_leave_requests_submitted_at', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_status', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_start_date', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_id', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_end_date', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_employee_id', table_name='leave_requests')
+
+    op.drop_table('leave_requests')
+    op.drop_index('ix_documents_uploaded_at', table_name='documents')
+    op.drop_index('ix_documents_id', table_name='documents')
+    op.drop_index('ix_documents_employee_id', table_name='documents')
+    op.drop_index('ix_documents_category', table_name='documents')
+
+    op.drop_table('documents')
+    op.drop_index('ix_attendance_status', table_name='attendance')
+    op.drop_index('ix_attendance_id', table_name='attendance')
+    op.drop_index('ix_attendance_employee_id', table_name='attendance')
+    op.drop_index('ix_attendance_date', table_name='attendance')
+
+    op.drop_table('attendance')
+    op.drop_table('notifications')
+    op.drop_index('ix_employees_user_id', table_name='employees')
+    op.drop_index('ix_employees_status', table_name='employees')
+    op.drop_index('ix_employees_manager_id', table_name='employees')
+    op.drop_index('ix_employees_id', table_name='employees')
+    op.drop_index('ix_employees_employee_id', table_name='employees')
+
+    op.drop_table('employees')
+    op.drop_index('ix_announcements_target_audience', table_name='announcements')
+    op.drop_index('ix_announcements_priority', table_name='announcements')
+    op.drop_index('ix_announcements_id', table_name='announcements')
+    op.drop_index('ix_announcements_created_at', table_name='announcements')
+
+    op.drop_table('announcements')
+    op.drop_index('ix_users_role', table_name='users')
+    op.drop_index('ix_users_is_active', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_index('ix_users_department', table_name='users')
+
+    op.drop_table('users')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for enum_name in ENUM_TYPES:
+            op.execute(f'DROP TYPE IF EXISTS {enum_name}')
@@ -0,0 +1,50 @@
+"""attendance rollup
+
+Pre-aggregated attendance counts per (date, department, status), filled
+from the existing attendance rows. Databases created by create_all()
+after the rollup was added, but before migrations, already have the
+table: it is only refilled.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if context.is_offline_mode() or 'attendance_rollup' not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table('attendance_rollup',
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        # attendancestatus was created with the attendance table
+        sa.Column('status', postgresql.ENUM('PRESENT', 'ABSENT', 'LATE', 'ON_LEAVE', name='attendancestatus', create_type=False), nullable=False),
+        sa.Column('record_count', sa.Integer(), nullable=False),
+        sa.Column('hours_worked', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.PrimaryKeyConstraint('date', 'department', 'status')
+        )
+
+    # Offline (--sql) scripts leave it empty; ensure_rollup() fills it on startup
+    if not context.is_offline_mode():
+        from app.services.rollup import rebuild_rollup
+
+        session = Session(bind=op.get_bind())
+        rebuild_rollup(session)
+        session.flush()
+
+
+def downgrade() -> None:
+    op.drop_table('attendance_rollup')
@@ -0,0 +1,75 @@
+"""query indexes
+
+Composite indexes for the hot filters, replacing single-column indexes
+they make redundant:
+
+- attendance (date, status): daily status counts and the HR attendance
+  list; replaces ix_attendance_date. Per-employee history
+  (employee_id = ? ORDER BY date DESC) is served by uq_employee_date,
+  so ix_attendance_employee_id goes too.
+- tasks (employee_id, status, due_date): an employee's open tasks and
+  today's schedule; replaces ix_tasks_employee_id.
+- notifications (recipient_id, is_read, created_at): inbox and unread
+  counts (the table had no index at all).
+- leave_requests (status, start_date, end_date): pending counts and
+  approved leave overlapping a date; replaces ix_leave_requests_status.
+
+The ix_<table>_id indexes duplicated the primary keys and are dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, index) pairs that only repeated the primary key
+PRIMARY_KEY_INDEXES = (
+    ('users', 'ix_users_id'),
+    ('employees', 'ix_employees_id'),
+    ('attendance', 'ix_attendance_id'),
+    ('tasks', 'ix_tasks_id'),
+    ('documents', 'ix_documents_id'),
+    ('announcements', 'ix_announcements_id'),
+    ('leave_requests', 'ix_leave_requests_id'),
+)
+
+
+def upgrade() -> None:
+    op.create_index('ix_attendance_date_status', 'attendance', ['date', 'status'], unique=False)
+    op.create_index('ix_tasks_employee_status_due', 'tasks', ['employee_id', 'status', 'due_date'], unique=False)
+    op.create_index('ix_notifications_recipient_unread', 'notifications', ['recipient_id', 'is_read', 'created_at'], unique=False)
+    op.create_index('ix_leave_requests_status_dates', 'leave_requests', ['status', 'start_date', 'end_date'], unique=False)
+
+    op.drop_index('ix_attendance_date', table_name='attendance')
+    op.drop_index('ix_attendance_employee_id', table_name='attendance')
+    op.drop_index('ix_tasks_employee_id', table_name='tasks')
+    op.drop_index('ix_leave_requests_status', table_name='leave_requests')
+
+    for table_name, index_name in PRIMARY_KEY_INDEXES:
+        op.drop_index(index_name, table_name=table_name)
+
+
+def downgrade() -> None:
+    for table_name, index_name in PRIMARY_KEY_INDEXES:
+        op.create_index(index_name, table_name, ['id'], unique=False)
+
+    op.create_index('ix_leave_requests_status', 'leave_requests', ['status'], unique=False)
+    op.create_index('ix_tasks_employee_id', 'tasks', ['employee_id'], unique=False)
+    op.create_index('ix_attendance_employee_id', 'attendance', ['employee_id'], unique=False)
+    op.create_index('ix_attendance_date', 'attendance', ['date'], unique=False)
+
+    op.drop_index('ix_leave_requests_status_dates', table_name='leave_requests')
+    op.drop_index('ix_notifications_recipient_unread', table_name='notifications')
+    op.drop_index('ix_tasks_employee_status_due', table_name='tasks')
+    op.drop_index('ix_attendance_date_status', table_name='attendance')
@@ -5,9 +5,10 @@ Endpoints for user authentication and authorization
 
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models.user import User, UserRole
 from ..models.employee import Employee, EmployeeStatus
 from ..models.notification import Notification, NotificationType
@@ -21,20 +22,22 @@ from ..schemas.user import (
 )
 from ..schemas.response import SuccessResponse
 from ..core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     verify_token,
 )
 from ..core.dependencies import get_current_active_user
+from ..core.principal_cache import principal_cache
+from ..core.instrumentation import TimedRoute
 from ..config import settings
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/signup", response_model=SuccessResponse[TokenResponse], status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Employee Signup
     
@@ -46,16 +49,20 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     - **phone**: Phone number (optional)
     - **department**: Department name
     """
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    # Check if email already exists (before hashing, so duplicate signups
+    # cost no bcrypt work)
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # End the read-only transaction so no connection is held while bcrypt runs
+    await db.rollback()
+    hashed_password = await get_password_hash_async(user_data.password)
+    
     # Create user
-    hashed_password = get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -67,11 +74,11 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.flush()  # Flush to get user ID
+    await db.flush()  # Flush to get user ID
     
     # Create employee record
     # Generate employee ID (format: EMP + 3-digit number)
-    employee_count = db.query(Employee).count()
+    employee_count = await db.scalar(select(func.count(Employee.id)))
     employee_id = f"EMP{str(employee_count + 1).zfill(3)}"
     
     new_employee = Employee(
@@ -83,11 +90,11 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(new_employee)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create notification for all HR administrators
-    hr_users = db.query(User).filter(User.role == UserRole.HR_ADMINISTRATOR).all()
+    hr_users = (await db.scalars(select(User).where(User.role == UserRole.HR_ADMINISTRATOR))).all()
     for hr_user in hr_users:
         notification = Notification(
             sender_id=new_user.id,
@@ -98,7 +105,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         )
         db.add(notification)
     
-    db.commit()
+    await db.commit()
     
     # Create tokens
     token_data = {"sub": str(new_user.id), "email": new_user.email, "role": new_user.role.value}
@@ -122,7 +129,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=SuccessResponse[TokenResponse])
-async def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     User Login
     
@@ -132,10 +139,12 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     - **password**: User password
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await db.scalar(select(User).where(User.email == credentials.email))
+    # End the read so the connection goes back to the pool while bcrypt runs
+    await db.commit()
     
     # Verify user exists and password is correct
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -162,8 +171,9 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    principal_cache.invalidate(user.id)
+    await db.refresh(user)
     
     # Create tokens
     token_data = {"sub": str(user.id), "email": user.email, "role": user.role.value}
@@ -187,7 +197,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=SuccessResponse[TokenRefreshResponse])
-async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(token_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
     """
     Refresh Access Token
     
@@ -225,7 +235,7 @@ async def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db))
         )
     
     # Verify user still exists and is active
-    user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    user = await db.scalar(select(User).where(User.id == user_id, User.is_active == True))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -3,16 +3,18 @@ Employee Portal API Endpoints
 Endpoints for employees to manage their own data and tasks
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import func, and_, or_, desc, select, update
 from typing import List, Optional
-from datetime import date, datetime, time as dt_time, timedelta
-from decimal import Decimal
+from datetime import date, datetime, timedelta
+import asyncio
 import uuid
 import os
 
-from ..database import get_db
+from ..config import settings
+from ..database import gather_reads, get_async_db
 from ..models.user import User, UserRole
 from ..models.employee import Employee
 from ..models.attendance import Attendance, AttendanceStatus
@@ -26,10 +28,15 @@ from ..schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskSummary
 from ..schemas.document import DocumentCreate, DocumentResponse
 from ..schemas.announcement import AnnouncementResponse
 from ..schemas.notification import NotificationResponse, NotificationSummary
-from ..core.dependencies import get_current_active_user
+from ..core.dependencies import get_current_active_user, get_current_employee_id
+from ..core.conditional import compute_etag, conditional_get, etag_matches
+from ..core.response_cache import response_cache
+from ..core.pagination import count_rows
+from ..core.instrumentation import TimedRoute
+from ..services import attendance as attendance_writes
 
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 # ============================================================================
@@ -39,7 +46,7 @@ router = APIRouter()
 @router.get("/dashboard", response_model=SuccessResponse)
 async def get_employee_dashboard(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
 ):
     """
     Get employee dashboard data
@@ -52,24 +59,79 @@ async def get_employee_dashboard(
     - Recent announcements
     - Pending tasks count
     - Attendance summary (current month)
+    
+    The queries are independent and run concurrently (see gather_reads).
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
+    return {
+        "success": True,
+        "data": await _employee_dashboard(current_user, employee_id)
+    }
+
+
+async def _employee_dashboard(current_user: User, employee_id: uuid.UUID) -> dict:
+    """The /dashboard data, from its own sessions (no request session needed)"""
     
-    # Today's attendance
     today = date.today()
-    today_attendance = db.query(Attendance).filter(
-        and_(
-            Attendance.employee_id == employee.id,
-            Attendance.date == today
-        )
-    ).first()
+    month_start = today.replace(day=1)
+    
+    (
+        position,
+        today_attendance,
+        completed_tasks,
+        month_attendance,
+        today_tasks,
+        recent_announcements,
+        pending_tasks,
+    ) = await gather_reads(
+        # Employee position
+        lambda db: db.scalar(select(Employee.position).where(Employee.id == employee_id)),
+        # Today's attendance
+        lambda db: db.scalar(select(Attendance).where(
+            and_(
+                Attendance.employee_id == employee_id,
+                Attendance.date == today
+            )
+        )),
+        # Tasks completed this month
+        lambda db: db.scalar(select(func.count(Task.id)).where(
+            and_(
+                Task.employee_id == employee_id,
+                Task.status == TaskStatus.COMPLETED,
+                Task.updated_at >= month_start
+            )
+        )),
+        # Attendance for current month
+        lambda db: db.scalars(select(Attendance).where(
+            and_(
+                Attendance.employee_id == employee_id,
+                Attendance.date >= month_start,
+                Attendance.date <= today
+            )
+        )).all(),
+        # Today's schedule (tasks due today)
+        lambda db: db.scalars(select(Task).where(
+            and_(
+                Task.employee_id == employee_id,
+                Task.due_date == today,
+                Task.status != TaskStatus.COMPLETED
+            )
+        )).all(),
+        # Recent announcements (last 5)
+        lambda db: db.scalars(select(Announcement).where(
+            or_(
+                Announcement.target_audience == TargetAudience.ALL,
+                Announcement.target_audience == TargetAudience.EMPLOYEES
+            )
+        ).order_by(desc(Announcement.created_at)).limit(5)).all(),
+        # Pending tasks count
+        lambda db: db.scalar(select(func.count()).select_from(Task).where(
+            and_(
+                Task.employee_id == employee_id,
+                Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
+            )
+        )),
+    )
     
     attendance_status = {
         "checked_in": bool(today_attendance and today_attendance.check_in),
@@ -79,25 +141,7 @@ async def get_employee_dashboard(
     }
     
     # Performance metrics
-    # Calculate tasks completed this month
-    month_start = today.replace(day=1)
-    completed_tasks = db.query(Task).filter(
-        and_(
-            Task.employee_id == employee.id,
-            Task.status == TaskStatus.COMPLETED,
-            Task.updated_at >= month_start
-        )
-    ).count()
-    
-    # Calculate attendance rate for current month
-    month_attendance = db.query(Attendance).filter(
-        and_(
-            Attendance.employee_id == employee.id,
-            Attendance.date >= month_start,
-            Attendance.date <= today
-        )
-    ).all()
-    
+    # Attendance rate for current month
     present_days = sum(1 for a in month_attendance if a.status in [AttendanceStatus.PRESENT, AttendanceStatus.LATE])
     total_days = len(month_attendance)
     attendance_rate = round((present_days / total_days * 100) if total_days > 0 else 0, 1)
@@ -111,15 +155,7 @@ async def get_employee_dashboard(
         "goals_achieved": completed_tasks // 5  # Simple goal calculation
     }
     
-    # Today's schedule (tasks due today)
-    today_tasks = db.query(Task).filter(
-        and_(
-            Task.employee_id == employee.id,
-            Task.due_date == today,
-            Task.status != TaskStatus.COMPLETED
-        )
-    ).all()
-    
+    # Today's schedule
     today_schedule = []
     for task in today_tasks:
         today_schedule.append({
@@ -130,14 +166,7 @@ async def get_employee_dashboard(
             "status": task.status.value
         })
     
-    # Recent announcements (last 5)
-    recent_announcements = db.query(Announcement).filter(
-        or_(
-            Announcement.target_audience == TargetAudience.ALL,
-            Announcement.target_audience == TargetAudience.EMPLOYEES
-        )
-    ).order_by(desc(Announcement.created_at)).limit(5).all()
-    
+    # Recent announcements
     announcements_list = []
     for ann in recent_announcements:
         announcements_list.append({
@@ -148,14 +177,6 @@ async def get_employee_dashboard(
             "created_at": ann.created_at.isoformat()
         })
     
-    # Pending tasks count
-    pending_tasks = db.query(Task).filter(
-        and_(
-            Task.employee_id == employee.id,
-            Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS])
-        )
-    ).count()
-    
     # Attendance summary for current month
     attendance_summary = {
         "month": today.strftime("%B %Y"),
@@ -167,20 +188,17 @@ async def get_employee_dashboard(
     }
     
     return {
-        "success": True,
-        "data": {
-            "user": {
-                "name": current_user.name,
-                "role": employee.position,
-                "department": current_user.department
-            },
-            "today_attendance": attendance_status,
-            "performance_metrics": performance_metrics,
-            "today_schedule": today_schedule,
-            "recent_announcements": announcements_list,
-            "pending_tasks": pending_tasks,
-            "attendance_summary": attendance_summary
-        }
+        "user": {
+            "name": current_user.name,
+            "role": position,
+            "department": current_user.department
+        },
+        "today_attendance": attendance_status,
+        "performance_metrics": performance_metrics,
+        "today_schedule": today_schedule,
+        "recent_announcements": announcements_list,
+        "pending_tasks": pending_tasks,
+        "attendance_summary": attendance_summary
     }
 
 
@@ -193,7 +211,8 @@ async def view_my_attendance(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get personal attendance history
@@ -203,14 +222,6 @@ async def view_my_attendance(
     - end_date: To date (default: today)
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Default date range
     if not end_date:
         end_date = date.today()
@@ -218,13 +229,13 @@ async def view_my_attendance(
         start_date = end_date.replace(day=1)
     
     # Get attendance records
-    attendance_records = db.query(Attendance).filter(
+    attendance_records = (await db.scalars(select(Attendance).where(
         and_(
-            Attendance.employee_id == employee.id,
+            Attendance.employee_id == employee_id,
             Attendance.date >= start_date,
             Attendance.date <= end_date
         )
-    ).order_by(desc(Attendance.date)).all()
+    ).order_by(desc(Attendance.date)))).all()
     
     # Format records
     records = []
@@ -269,60 +280,28 @@ async def view_my_attendance(
 @router.post("/attendance/checkin", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
 async def check_in(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark check-in for today
-    """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
+    Status is LATE after 9:30 AM, PRESENT otherwise
+    """
     
     today = date.today()
     now = datetime.now().time()
     
-    # Check if already checked in
-    existing = db.query(Attendance).filter(
-        and_(
-            Attendance.employee_id == employee.id,
-            Attendance.date == today
-        )
-    ).first()
-    
-    if existing and existing.check_in:
+    attendance_record = await db.run_sync(
+        attendance_writes.check_in, employee_id, today, now
+    )
+    if attendance_record is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Already checked in today"
         )
     
-    # Determine status (late if after 9:30 AM)
-    late_threshold = dt_time(9, 30, 0)
-    status_value = AttendanceStatus.LATE if now > late_threshold else AttendanceStatus.PRESENT
-    
-    if existing:
-        # Update existing record
-        existing.check_in = now
-        existing.status = status_value
-        db.commit()
-        db.refresh(existing)
-        attendance_record = existing
-    else:
-        # Create new record
-        new_attendance = Attendance(
-            employee_id=employee.id,
-            date=today,
-            check_in=now,
-            status=status_value
-        )
-        db.add(new_attendance)
-        db.commit()
-        db.refresh(new_attendance)
-        attendance_record = new_attendance
+    await db.commit()
     
     return {
         "success": True,
@@ -339,54 +318,33 @@ async def check_in(
 @router.post("/attendance/checkout", response_model=SuccessResponse)
 async def check_out(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark check-out for today
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     today = date.today()
     now = datetime.now().time()
     
-    # Check if checked in
-    attendance = db.query(Attendance).filter(
-        and_(
-            Attendance.employee_id == employee.id,
-            Attendance.date == today
-        )
-    ).first()
-    
-    if not attendance or not attendance.check_in:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Not checked in yet"
-        )
-    
-    if attendance.check_out:
+    attendance = await db.run_sync(
+        attendance_writes.check_out, employee_id, today, now
+    )
+    if attendance is None:
+        # Nothing was updated; look at today's row to explain why
+        checked_in = await db.scalar(select(Attendance.check_in.isnot(None)).where(
+            and_(
+                Attendance.employee_id == employee_id,
+                Attendance.date == today
+            )
+        ))
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Already checked out today"
+            detail="Already checked out today" if checked_in else "Not checked in yet"
         )
     
-    # Update check-out time
-    attendance.check_out = now
-    
-    # Calculate hours worked
-    check_in_dt = datetime.combine(today, attendance.check_in)
-    check_out_dt = datetime.combine(today, now)
-    hours_worked = Decimal((check_out_dt - check_in_dt).total_seconds() / 3600)
-    attendance.hours_worked = hours_worked
-    
-    db.commit()
-    db.refresh(attendance)
+    await db.commit()
     
     return {
         "success": True,
@@ -412,7 +370,8 @@ async def view_my_tasks(
     priority: Optional[str] = Query(None, pattern=r'^(low|medium|high)$'),
     sort_by: Optional[str] = Query("due_date", pattern=r'^(due_date|priority|created_at)$'),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get personal tasks
@@ -423,16 +382,23 @@ async def view_my_tasks(
     - sort_by: Sort field (due_date, priority, created_at)
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
+    return {
+        "success": True,
+        "data": await _task_list(db, employee_id, status, priority, sort_by)
+    }
+
+
+async def _task_list(
+    db: AsyncSession,
+    employee_id: uuid.UUID,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    sort_by: Optional[str] = "due_date"
+) -> dict:
+    """The /tasks data: filtered, sorted tasks plus a summary over all of them"""
     
     # Base query
-    query = db.query(Task).filter(Task.employee_id == employee.id)
+    query = select(Task).options(joinedload(Task.assigner)).where(Task.employee_id == employee_id)
     
     # Apply filters
     if status:
@@ -456,7 +422,7 @@ async def view_my_tasks(
     else:
         query = query.order_by(desc(Task.created_at))
     
-    tasks = query.all()
+    tasks = (await db.scalars(query)).all()
     
     # Format tasks
     tasks_list = []
@@ -474,7 +440,7 @@ async def view_my_tasks(
         })
     
     # Calculate summary
-    all_tasks = db.query(Task).filter(Task.employee_id == employee.id).all()
+    all_tasks = (await db.scalars(select(Task).where(Task.employee_id == employee_id))).all()
     today = date.today()
     
     summary = {
@@ -486,11 +452,8 @@ async def view_my_tasks(
     }
     
     return {
-        "success": True,
-        "data": {
-            "tasks": tasks_list,
-            "summary": summary
-        }
+        "tasks": tasks_list,
+        "summary": summary
     }
 
 
@@ -498,23 +461,16 @@ async def view_my_tasks(
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a personal task
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Create task
     new_task = Task(
-        employee_id=employee.id,
+        employee_id=employee_id,
         title=task_data.title,
         description=task_data.description,
         priority=TaskPriority(task_data.priority),
@@ -524,8 +480,8 @@ async def create_task(
     )
     
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
+    await db.refresh(new_task)
     
     return {
         "success": True,
@@ -547,20 +503,13 @@ async def update_task(
     task_id: str,
     task_data: TaskUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update task details
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Find task
     try:
         task_uuid = uuid.UUID(task_id)
@@ -570,12 +519,12 @@ async def update_task(
             detail="Invalid task ID format"
         )
     
-    task = db.query(Task).filter(
+    task = await db.scalar(select(Task).where(
         and_(
             Task.id == task_uuid,
-            Task.employee_id == employee.id
+            Task.employee_id == employee_id
         )
-    ).first()
+    ))
     
     if not task:
         raise HTTPException(
@@ -595,8 +544,8 @@ async def update_task(
     if task_data.due_date:
         task.due_date = task_data.due_date
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
     
     return {
         "success": True,
@@ -621,7 +570,8 @@ async def view_my_documents(
     category: Optional[str] = Query(None, pattern=r'^(contract|policy|report|other)$'),
     search: Optional[str] = Query(None),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get personal documents
@@ -631,16 +581,8 @@ async def view_my_documents(
     - search: Search by title
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Base query
-    query = db.query(Document).filter(Document.employee_id == employee.id)
+    query = select(Document).options(joinedload(Document.uploader)).where(Document.employee_id == employee_id)
     
     # Apply filters
     if category:
@@ -650,7 +592,7 @@ async def view_my_documents(
         query = query.filter(Document.title.ilike(f"%{search}%"))
     
     # Order by upload date descending
-    documents = query.order_by(desc(Document.uploaded_at)).all()
+    documents = (await db.scalars(query.order_by(desc(Document.uploaded_at)))).all()
     
     # Format documents
     documents_list = []
@@ -682,7 +624,8 @@ async def upload_document(
     category: str = Query(..., pattern=r'^(contract|policy|report|other)$'),
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Upload a document
@@ -693,14 +636,6 @@ async def upload_document(
     - Add more file type validation
     """
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Validate file type
     allowed_extensions = ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.png', '.jpg', '.jpeg']
     file_ext = os.path.splitext(file.filename)[1].lower()
@@ -731,7 +666,7 @@ async def upload_document(
     
     # Create document record
     new_document = Document(
-        employee_id=employee.id,
+        employee_id=employee_id,
         uploaded_by=current_user.id,
         title=title,
         category=DocumentCategory(category),
@@ -741,8 +676,8 @@ async def upload_document(
     )
     
     db.add(new_document)
-    db.commit()
-    db.refresh(new_document)
+    await db.commit()
+    await db.refresh(new_document)
     
     return {
         "success": True,
@@ -765,21 +700,45 @@ async def upload_document(
 
 @router.get("/announcements", response_model=PaginatedResponse)
 async def view_announcements(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=50),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get company announcements
     
+    Supports If-None-Match: an unchanged list returns 304 without a query.
+    Pages are cached until announcements (or their authors) change.
+    
     Query Parameters:
     - page: Page number
     - page_size: Items per page
     """
     
+    not_modified = conditional_get(request, response, ("announcements", "users"), page, page_size)
+    if not_modified:
+        return not_modified
+    
+    announcements_page = await response_cache.get_or_compute(
+        f"announcements:{page}:{page_size}",
+        ("announcements", "employees"),
+        lambda: _announcements_page(db, page, page_size),
+    )
+    
+    return {
+        "success": True,
+        "data": announcements_page
+    }
+
+
+async def _announcements_page(db: AsyncSession, page: int, page_size: int) -> dict:
+    """One page of the /announcements list"""
+    
     # Base query - get announcements for all employees
-    query = db.query(Announcement).filter(
+    query = select(Announcement).options(joinedload(Announcement.creator)).where(
         or_(
             Announcement.target_audience == TargetAudience.ALL,
             Announcement.target_audience == TargetAudience.EMPLOYEES
@@ -787,11 +746,11 @@ async def view_announcements(
     ).order_by(desc(Announcement.created_at))
     
     # Get total count
-    total = query.count()
+    total = await count_rows(db, query)
     
     # Apply pagination
     offset = (page - 1) * page_size
-    announcements = query.offset(offset).limit(page_size).all()
+    announcements = (await db.scalars(query.offset(offset).limit(page_size))).all()
     
     # Format announcements
     items = []
@@ -813,15 +772,12 @@ async def view_announcements(
     unread_count = 0
     
     return {
-        "success": True,
-        "data": {
-            "items": items,
-            "total": total,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "unread_count": unread_count
-        }
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+        "unread_count": unread_count
     }
 
 
@@ -831,23 +787,42 @@ async def view_announcements(
 
 @router.get("/notifications", response_model=SuccessResponse)
 async def get_notifications(
+    request: Request,
+    response: Response,
     unread_only: bool = Query(False),
     limit: int = Query(10, ge=1, le=50),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get notifications for the current user
     
+    Supports If-None-Match: an unchanged inbox returns 304 without a query.
+    
     Query Parameters:
     - unread_only: Only return unread notifications
     - limit: Maximum number of notifications to return
     """
     
+    not_modified = conditional_get(
+        request, response, ("notifications", "users"), current_user.id, unread_only, limit
+    )
+    if not_modified:
+        return not_modified
+    
+    return {
+        "success": True,
+        "data": await _notification_list(db, current_user.id, unread_only, limit)
+    }
+
+
+async def _notification_list(db: AsyncSession, user_id: uuid.UUID, unread_only: bool = False, limit: int = 10) -> dict:
+    """The /notifications data: latest notifications and the unread count"""
+    
     # Base query - get notifications for this user or all employees (recipient_id is None)
-    query = db.query(Notification).filter(
+    query = select(Notification).options(joinedload(Notification.sender)).where(
         or_(
-            Notification.recipient_id == current_user.id,
+            Notification.recipient_id == user_id,
             Notification.recipient_id == None
         )
     ).order_by(desc(Notification.created_at))
@@ -857,16 +832,16 @@ async def get_notifications(
         query = query.filter(Notification.is_read == False)
     
     # Apply limit
-    notifications = query.limit(limit).all()
+    notifications = (await db.scalars(query.limit(limit))).all()
     
     # Get unread count
-    unread_count = db.query(Notification).filter(
+    unread_count = await db.scalar(select(func.count()).select_from(Notification).where(
         or_(
-            Notification.recipient_id == current_user.id,
+            Notification.recipient_id == user_id,
             Notification.recipient_id == None
         ),
         Notification.is_read == False
-    ).count()
+    ))
     
     # Format notifications
     items = []
@@ -885,12 +860,9 @@ async def get_notifications(
         })
     
     return {
-        "success": True,
-        "data": {
-            "notifications": items,
-            "total": len(items),
-            "unread_count": unread_count
-        }
+        "notifications": items,
+        "total": len(items),
+        "unread_count": unread_count
     }
 
 
@@ -898,16 +870,16 @@ async def get_notifications(
 async def mark_notification_read(
     notification_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a notification as read
     """
     
     # Get notification
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == uuid.UUID(notification_id)
-    ).first()
+    ))
     
     if not notification:
         raise HTTPException(
@@ -926,7 +898,7 @@ async def mark_notification_read(
     notification.is_read = True
     notification.read_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -937,25 +909,25 @@ async def mark_notification_read(
 @router.put("/notifications/read-all", response_model=SuccessResponse)
 async def mark_all_notifications_read(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark all notifications as read for the current user
     """
     
     # Update all unread notifications for this user
-    db.query(Notification).filter(
+    await db.execute(update(Notification).where(
         or_(
             Notification.recipient_id == current_user.id,
             Notification.recipient_id == None
         ),
         Notification.is_read == False
-    ).update({
-        "is_read": True,
-        "read_at": datetime.utcnow()
-    }, synchronize_session=False)
+    ).values(
+        is_read=True,
+        read_at=datetime.utcnow()
+    ).execution_options(synchronize_session=False))
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -971,7 +943,8 @@ async def mark_all_notifications_read(
 async def submit_leave_request(
     leave_data: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit a leave request
@@ -984,14 +957,6 @@ async def submit_leave_request(
     """
     from ..models.leave_request import LeaveRequest, LeaveStatus, LeaveType
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
-    
     # Validate dates
     start_date = datetime.strptime(leave_data["start_date"], "%Y-%m-%d").date()
     end_date = datetime.strptime(leave_data["end_date"], "%Y-%m-%d").date()
@@ -1007,7 +972,7 @@ async def submit_leave_request(
     
     # Create leave request
     leave_request = LeaveRequest(
-        employee_id=employee.id,
+        employee_id=employee_id,
         type=LeaveType(leave_data["leave_type"]),
         start_date=start_date,
         end_date=end_date,
@@ -1017,8 +982,8 @@ async def submit_leave_request(
     )
     
     db.add(leave_request)
-    db.commit()
-    db.refresh(leave_request)
+    await db.commit()
+    await db.refresh(leave_request)
     
     return {
         "success": True,
@@ -1035,25 +1000,27 @@ async def submit_leave_request(
 @router.get("/leave-requests", response_model=SuccessResponse)
 async def get_my_leave_requests(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get employee's own leave requests
     """
-    from ..models.leave_request import LeaveRequest
     
-    # Get employee record
-    employee = db.query(Employee).filter(Employee.user_id == current_user.id).first()
-    if not employee:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Employee record not found"
-        )
+    return {
+        "success": True,
+        "data": await _leave_request_list(db, employee_id)
+    }
+
+
+async def _leave_request_list(db: AsyncSession, employee_id: uuid.UUID) -> dict:
+    """The /leave-requests data, newest first"""
+    from ..models.leave_request import LeaveRequest
     
     # Get leave requests
-    leave_requests = db.query(LeaveRequest).filter(
-        LeaveRequest.employee_id == employee.id
-    ).order_by(desc(LeaveRequest.created_at)).all()
+    leave_requests = (await db.scalars(select(LeaveRequest).where(
+        LeaveRequest.employee_id == employee_id
+    ).order_by(desc(LeaveRequest.submitted_at)))).all()
     
     items = []
     for lr in leave_requests:
@@ -1070,10 +1037,125 @@ async def get_my_leave_requests(
             "notes": lr.notes
         })
     
+    return {
+        "leave_requests": items,
+        "total": len(items)
+    }
+
+
+# ============================================================================
+# Bootstrap
+# ============================================================================
+
+# Tables each bootstrap section is read from, for its ETag. "users" is
+# there for names (author, sender, assigner, the employee's own); logins
+# only write users.last_login, which does not bump it (IGNORED_COLUMNS).
+BOOTSTRAP_SECTIONS = {
+    "dashboard": ("attendance", "tasks", "announcements", "employees", "users"),
+    "notifications": ("notifications", "users"),
+    "announcements": ("announcements", "users"),
+    "tasks": ("tasks", "users"),
+    "leave-requests": ("leave_requests",),
+}
+
+
+@router.get("/bootstrap", response_model=SuccessResponse)
+async def get_bootstrap(
+    request: Request,
+    response: Response,
+    sections: Optional[str] = Query(None, description="Comma-separated sections (default: all)"),
+    current_user: User = Depends(get_current_active_user),
+    employee_id: uuid.UUID = Depends(get_current_employee_id),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Everything the employee landing page needs, in one request
+    
+    Each section is what its own endpoint returns with default
+    parameters (/dashboard, /notifications, /announcements, /tasks,
+    /leave-requests), built from one token check and principal lookup.
+    
+    Every section gets its own ETag (data.etags). Send the ones you hold
+    in If-None-Match (comma-separated): matching sections are not
+    queried and are listed in data.unchanged instead; if every requested
+    section is unchanged the response is 304. The ETag header covers the
+    whole response, and is repeated on the 304. The dashboard's reads run
+    on their own connections, alongside the other sections.
+    
+    Query Parameters:
+    - sections: e.g. `dashboard,notifications`
+    """
+    
+    if sections:
+        requested = list(dict.fromkeys(name.strip() for name in sections.split(",") if name.strip()))
+    else:
+        requested = list(BOOTSTRAP_SECTIONS)
+    unknown = [name for name in requested if name not in BOOTSTRAP_SECTIONS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown sections: {', '.join(unknown)}. Choose from: {', '.join(BOOTSTRAP_SECTIONS)}"
+        )
+    
+    # ETags are computed before any query, so a write committed meanwhile changes the next ones
+    today = date.today()
+    parts = {
+        "dashboard": (employee_id, today),
+        "notifications": (current_user.id,),
+        "announcements": (),
+        "tasks": (employee_id, today),
+        "leave-requests": (employee_id,),
+    }
+    etags = {}
+    unchanged = []
+    if settings.ETAG_TTL > 0:
+        if_none_match = request.headers.get("if-none-match")
+        for name in requested:
+            etags[name] = compute_etag(BOOTSTRAP_SECTIONS[name], "bootstrap", name, *parts[name])
+            if etag_matches(if_none_match, etags[name]):
+                unchanged.append(name)
+        
+        # The whole response's validator, for clients that revalidate it as one
+        combined = compute_etag((), "bootstrap", *etags.values())
+        headers = {"ETag": combined, "Cache-Control": "private, no-cache"}
+        if len(unchanged) == len(requested) or etag_matches(if_none_match, combined):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+    
+    builders = {
+        "notifications": lambda: _notification_list(db, current_user.id),
+        "announcements": lambda: response_cache.get_or_compute(
+            "announcements:1:10",
+            ("announcements", "employees"),
+            lambda: _announcements_page(db, 1, 10),
+        ),
+        "tasks": lambda: _task_list(db, employee_id),
+        "leave-requests": lambda: _leave_request_list(db, employee_id),
+    }
+    
+    async def session_sections() -> dict:
+        # One AsyncSession runs one statement at a time: these go in turn
+        return {
+            name: await builders[name]()
+            for name in requested
+            if name in builders and name not in unchanged
+        }
+    
+    data = {}
+    if "dashboard" in requested and "dashboard" not in unchanged:
+        data["dashboard"], rest = await asyncio.gather(
+            _employee_dashboard(current_user, employee_id),
+            session_sections(),
+        )
+    else:
+        rest = await session_sections()
+    data.update(rest)
+    
     return {
         "success": True,
         "data": {
-            "leave_requests": items,
-            "total": len(items)
+            "sections": {name: data[name] for name in requested if name in data},
+            "etags": etags,
+            "unchanged": unchanged
         }
     }
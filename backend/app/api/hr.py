@@ -3,28 +3,52 @@ HR Portal API Endpoints
 Endpoints for HR administrators to manage employees, attendance, and analytics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, extract
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Request, Response, UploadFile, File
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy import func, and_, or_, desc, extract, select
+from pydantic import ValidationError
+from typing import List, Optional, Union
 from datetime import date, datetime, time as dt_time, timedelta
 from decimal import Decimal
 import uuid
+import os
 
-from ..database import get_db
+from ..config import settings
+from ..database import gather_reads, get_async_db, run_in_report_process, run_in_sync_session
 from ..models.user import User, UserRole
 from ..models.employee import Employee, EmployeeStatus
 from ..models.attendance import Attendance, AttendanceStatus
 from ..models.notification import Notification, NotificationType
-from ..schemas.response import SuccessResponse, PaginatedResponse
+from ..schemas.response import SuccessResponse, PaginatedResponse, CursorPaginatedResponse
 from ..schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse, EmployeeListItem
-from ..schemas.attendance import AttendanceMarkManual, AttendanceResponse, AttendanceSummary
+from ..schemas.attendance import AttendanceBulkMark, AttendanceMarkManual, AttendanceResponse, AttendanceSummary
 from ..schemas.notification import NotificationCreate, NotificationResponse
 from ..core.dependencies import get_current_active_user, require_role
-from ..core.security import get_password_hash
+from ..core.security import get_password_hash_async
+from ..core.coalescing import flight_key, report_flights
+from ..core.conditional import conditional_get
+from ..core.response_cache import attendance_tags, response_cache
+from ..core.pagination import Keyset, count_rows
+from ..core.principal_cache import principal_cache
+from ..core import profiling
+from ..core.instrumentation import TimedRoute
+from ..services import rollup
+from ..services import attendance as attendance_writes
+from ..services import attendance_import
+from ..services import exports
+from ..services.analytics import hr_analytics_report
+from ..services.dashboard import gather_dashboard_stats
+from ..services.search import apply_search
 
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+# Tables read by the polled dashboard endpoints (their ETags change with them)
+DASHBOARD_TABLES = ("employees", "users", "attendance", "attendance_rollup", "leave_requests")
+RECENT_ACTIVITY_TABLES = ("employees", "users", "attendance", "leave_requests")
 
 
 # ============================================================================
@@ -33,8 +57,9 @@ router = APIRouter()
 
 @router.get("/dashboard/stats", response_model=SuccessResponse)
 async def get_dashboard_stats(
+    request: Request,
+    response: Response,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
 ):
     """
     Get HR dashboard statistics
@@ -47,120 +72,28 @@ async def get_dashboard_stats(
     - Department distribution
     - Monthly attendance trends (last 6 months)
     - Recent activities
-    """
-    from ..models.leave_request import LeaveRequest, LeaveStatus
-    
-    # Total employees
-    total_employees = db.query(Employee).count()
-    active_employees = db.query(Employee).filter(Employee.status == EmployeeStatus.ACTIVE).count()
-    inactive_employees = total_employees - active_employees
     
-    # Today's attendance
+    Supports If-None-Match: unchanged stats return 304 without a query.
+    Cached until attendance, employees or leave requests change;
+    concurrent misses share one computation.
+    """
     today = date.today()
-    today_attendance = db.query(Attendance).filter(Attendance.date == today).all()
-    
-    attendance_stats = {
-        "present": sum(1 for a in today_attendance if a.status == AttendanceStatus.PRESENT),
-        "absent": sum(1 for a in today_attendance if a.status == AttendanceStatus.ABSENT),
-        "late": sum(1 for a in today_attendance if a.status == AttendanceStatus.LATE),
-        "on_leave": sum(1 for a in today_attendance if a.status == AttendanceStatus.ON_LEAVE),
-    }
-    
-    total_marked = len(today_attendance)
-    attendance_stats["attendance_rate"] = round(
-        ((attendance_stats["present"] + attendance_stats["late"]) / total_marked * 100) if total_marked > 0 else 0,
-        1
+    not_modified = conditional_get(request, response, DASHBOARD_TABLES, today)
+    if not_modified:
+        return not_modified
+    
+    stats = await response_cache.get_or_compute(
+        f"dashboard_stats:{today}",
+        ("attendance", "employees", "leave"),
+        lambda: report_flights.run(
+            flight_key(request, current_user.role, today=today),
+            lambda: gather_dashboard_stats(today),
+        ),
     )
     
-    # Department distribution
-    dept_distribution = db.query(
-        User.department,
-        func.count(Employee.id).label('count')
-    ).join(Employee, User.id == Employee.user_id).group_by(User.department).all()
-    
-    departments = {dept: count for dept, count in dept_distribution}
-    
-    # Monthly attendance trends (last 6 months)
-    six_months_ago = today - timedelta(days=180)
-    monthly_trends = []
-    
-    for i in range(6):
-        month_start = (today.replace(day=1) - timedelta(days=30 * i)).replace(day=1)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        month_attendance = db.query(Attendance).filter(
-            and_(
-                Attendance.date >= month_start,
-                Attendance.date <= month_end
-            )
-        ).all()
-        
-        if month_attendance:
-            present_count = sum(1 for a in month_attendance if a.status in [AttendanceStatus.PRESENT, AttendanceStatus.LATE])
-            total_count = len(month_attendance)
-            rate = round((present_count / total_count * 100) if total_count > 0 else 0, 1)
-        else:
-            rate = 0
-        
-        monthly_trends.insert(0, {
-            "month": month_start.strftime("%b %Y"),
-            "rate": rate
-        })
-    
-    # Calculate current month's average attendance (based on today's attendance rate)
-    # This shows: (Present Today + Late Today) / Total Employees * 100
-    if total_employees > 0:
-        present_today = attendance_stats["present"] + attendance_stats["late"]
-        monthly_attendance_avg = round((present_today / total_employees * 100), 1)
-    else:
-        monthly_attendance_avg = 0
-    
-    # Recent activities (last 10 attendance records)
-    recent_attendance = db.query(Attendance).join(
-        Employee, Attendance.employee_id == Employee.id
-    ).join(
-        User, Employee.user_id == User.id
-    ).order_by(desc(Attendance.created_at)).limit(10).all()
-    
-    recent_activities = []
-    for att in recent_attendance:
-        employee_name = att.employee.user.name
-        if att.check_in:
-            recent_activities.append({
-                "id": str(att.id),
-                "type": "attendance",
-                "description": f"{employee_name} checked in",
-                "timestamp": att.created_at.isoformat()
-            })
-    
-    # Leave requests statistics
-    pending_leave_requests = db.query(LeaveRequest).filter(
-        LeaveRequest.status == LeaveStatus.PENDING
-    ).count()
-    
-    # Count employees on approved leave today
-    approved_leaves_today = db.query(LeaveRequest).filter(
-        and_(
-            LeaveRequest.status == LeaveStatus.APPROVED,
-            LeaveRequest.start_date <= today,
-            LeaveRequest.end_date >= today
-        )
-    ).count()
-    
     return {
         "success": True,
-        "data": {
-            "total_employees": total_employees,
-            "active_employees": active_employees,
-            "inactive_employees": inactive_employees,
-            "today_attendance": attendance_stats,
-            "pending_leave_requests": pending_leave_requests,
-            "approved_leaves_today": approved_leaves_today,
-            "departments": departments,
-            "monthly_attendance_trend": monthly_trends,
-            "monthly_attendance_avg": monthly_attendance_avg,
-            "recent_activities": recent_activities
-        }
+        "data": stats
     }
 
 
@@ -168,17 +101,19 @@ async def get_dashboard_stats(
 # Employee Management
 # ============================================================================
 
-@router.get("/employees", response_model=PaginatedResponse)
+@router.get("/employees", response_model=Union[PaginatedResponse, CursorPaginatedResponse])
 async def list_employees(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     search: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
     status: Optional[str] = Query(None, pattern=r'^(active|inactive|on_leave)$'),
-    sort_by: Optional[str] = Query("created_at", pattern=r'^(name|hire_date|department|created_at)$'),
+    sort_by: Optional[str] = Query(None, pattern=r'^(relevance|name|hire_date|department|created_at)$'),
     sort_order: Optional[str] = Query("desc", pattern=r'^(asc|desc)$'),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get paginated list of all employees
@@ -186,23 +121,31 @@ async def list_employees(
     Query Parameters:
     - page: Page number (default: 1)
     - page_size: Items per page (default: 20, max: 100)
-    - search: Search by name or email
+    - search: Search by name, email, employee ID or position
     - department: Filter by department
     - status: Filter by status (active/inactive/on_leave)
-    - sort_by: Sort field (name, hire_date, department, created_at) - default: created_at
+    - sort_by: Sort field (relevance, name, hire_date, department, created_at) -
+      default: relevance when searching, otherwise created_at
     - sort_order: Sort order (asc/desc) - default: desc (newest first)
+    - cursor: Use keyset pagination; pass an empty value for the first page,
+      then the returned next_cursor (page is ignored)
+    - include_total: Also count all matches in cursor mode (default: false)
     """
     
     # Base query
-    query = db.query(Employee).join(User, Employee.user_id == User.id)
+    query = select(Employee).join(User, Employee.user_id == User.id).options(
+        contains_eager(Employee.user)
+    )
     
     # Apply filters
+    relevance = None
     if search:
-        search_filter = or_(
-            User.name.ilike(f"%{search}%"),
-            User.email.ilike(f"%{search}%")
-        )
-        query = query.filter(search_filter)
+        query, relevance = apply_search(db, query, search)
+    
+    if not sort_by:
+        sort_by = "relevance" if search else "created_at"
+    if sort_by == "relevance" and not search:
+        sort_by = "created_at"
     
     if department:
         query = query.filter(User.department == department)
@@ -211,7 +154,9 @@ async def list_employees(
         query = query.filter(Employee.status == status)
     
     # Apply sorting
-    if sort_by == "name":
+    if sort_by == "relevance":
+        sort_column = relevance
+    elif sort_by == "name":
         sort_column = User.name
     elif sort_by == "hire_date":
         sort_column = Employee.hire_date
@@ -222,17 +167,21 @@ async def list_employees(
     else:
         sort_column = User.created_at
     
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
-    
-    # Get total count
-    total = query.count()
+    keyset = Keyset(db, f"employees:{sort_by}", [sort_column, Employee.id], descending=(sort_order == "desc"))
     
-    # Apply pagination
-    offset = (page - 1) * page_size
-    employees = query.offset(offset).limit(page_size).all()
+    if cursor is not None:
+        total = await count_rows(db, query) if include_total else None
+        rows = (await db.execute(keyset.apply(query, cursor, page_size))).all()
+        employees, next_cursor, has_more = keyset.split(rows, page_size)
+    else:
+        # Get total count
+        total = await count_rows(db, query)
+        
+        # Apply pagination
+        offset = (page - 1) * page_size
+        employees = (await db.scalars(
+            query.order_by(*keyset.order_by()).offset(offset).limit(page_size)
+        )).all()
     
     # Format response
     items = []
@@ -250,6 +199,18 @@ async def list_employees(
             "salary": float(emp.salary) if emp.salary else None
         })
     
+    if cursor is not None:
+        return {
+            "success": True,
+            "data": {
+                "items": items,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "page_size": page_size,
+                "total": total
+            }
+        }
+    
     total_pages = (total + page_size - 1) // page_size
     
     return {
@@ -268,7 +229,7 @@ async def list_employees(
 async def add_employee(
     employee_data: EmployeeCreate,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new employee
@@ -277,7 +238,7 @@ async def add_employee(
     """
     
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == employee_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == employee_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -293,9 +254,9 @@ async def add_employee(
     
     # Generate employee ID (format: EMP-YYYYMMDD-XXXX)
     today_str = datetime.now().strftime("%Y%m%d")
-    last_employee = db.query(Employee).filter(
+    last_employee = await db.scalar(select(Employee).where(
         Employee.employee_id.like(f"EMP-{today_str}-%")
-    ).order_by(desc(Employee.employee_id)).first()
+    ).order_by(desc(Employee.employee_id)).limit(1))
     
     if last_employee:
         last_num = int(last_employee.employee_id.split('-')[-1])
@@ -305,10 +266,14 @@ async def add_employee(
     
     employee_id = f"EMP-{today_str}-{new_num:04d}"
     
+    # End the read so the connection goes back to the pool while bcrypt runs
+    await db.commit()
+    password_hash = await get_password_hash_async(employee_data.password)
+    
     # Create user
     new_user = User(
         email=employee_data.email,
-        password_hash=get_password_hash(employee_data.password),
+        password_hash=password_hash,
         name=employee_data.name,
         role=UserRole.EMPLOYEE,
         department=employee_data.department,
@@ -316,7 +281,7 @@ async def add_employee(
         is_active=True
     )
     db.add(new_user)
-    db.flush()  # Get user ID
+    await db.flush()  # Get user ID
     
     # Create employee
     new_employee = Employee(
@@ -328,8 +293,8 @@ async def add_employee(
         status=EmployeeStatus.ACTIVE
     )
     db.add(new_employee)
-    db.commit()
-    db.refresh(new_employee)
+    await db.commit()
+    await db.refresh(new_employee)
     
     return {
         "success": True,
@@ -355,7 +320,7 @@ async def update_employee(
     employee_id: str,
     employee_data: EmployeeUpdate,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update employee information
@@ -370,7 +335,9 @@ async def update_employee(
             detail="Invalid employee ID format"
         )
     
-    employee = db.query(Employee).filter(Employee.id == emp_uuid).first()
+    employee = await db.scalar(
+        select(Employee).options(joinedload(Employee.user)).where(Employee.id == emp_uuid)
+    )
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -383,8 +350,14 @@ async def update_employee(
         user.name = employee_data.name
     if employee_data.phone:
         user.phone = employee_data.phone
-    if employee_data.department:
+    if employee_data.department and employee_data.department != user.department:
+        # Write the department first: the UPDATE locks the user row (the
+        # whole database on SQLite), so a concurrent check-in is either
+        # already committed and moved below, or books the new department
+        old_department = user.department
         user.department = employee_data.department
+        await db.flush()
+        await db.run_sync(rollup.move_employee_department, employee.id, old_department, employee_data.department)
     
     # Update employee fields
     if employee_data.position:
@@ -396,8 +369,9 @@ async def update_employee(
     if employee_data.performance_score is not None:
         employee.performance_score = employee_data.performance_score
     
-    db.commit()
-    db.refresh(employee)
+    await db.commit()
+    principal_cache.invalidate(employee.user_id)
+    await db.refresh(employee)
     
     return {
         "success": True,
@@ -422,7 +396,7 @@ async def update_employee(
 async def delete_employee(
     employee_id: str,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Deactivate an employee (soft delete)
@@ -437,7 +411,9 @@ async def delete_employee(
             detail="Invalid employee ID format"
         )
     
-    employee = db.query(Employee).filter(Employee.id == emp_uuid).first()
+    employee = await db.scalar(
+        select(Employee).options(joinedload(Employee.user)).where(Employee.id == emp_uuid)
+    )
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -448,7 +424,8 @@ async def delete_employee(
     employee.status = EmployeeStatus.INACTIVE
     employee.user.is_active = False
     
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(employee.user_id)
     
     return {
         "success": True,
@@ -460,17 +437,19 @@ async def delete_employee(
 # Attendance Management
 # ============================================================================
 
-@router.get("/attendance", response_model=PaginatedResponse)
+@router.get("/attendance", response_model=Union[PaginatedResponse, CursorPaginatedResponse])
 async def view_all_attendance(
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     employee_id: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     status: Optional[str] = Query(None, pattern=r'^(present|absent|late|on_leave)$'),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get attendance records for all employees
@@ -483,13 +462,18 @@ async def view_all_attendance(
     - start_date: Filter from date
     - end_date: Filter to date
     - status: Filter by status
+    - cursor: Use keyset pagination; pass an empty value for the first page,
+      then the returned next_cursor (page is ignored)
+    - include_total: Also count all matches in cursor mode (default: false)
     """
     
     # Base query
-    query = db.query(Attendance).join(
+    query = select(Attendance).join(
         Employee, Attendance.employee_id == Employee.id
     ).join(
         User, Employee.user_id == User.id
+    ).options(
+        contains_eager(Attendance.employee).contains_eager(Employee.user)
     )
     
     # Apply filters
@@ -513,14 +497,21 @@ async def view_all_attendance(
         query = query.filter(Attendance.status == status)
     
     # Order by date descending
-    query = query.order_by(desc(Attendance.date), desc(Attendance.created_at))
+    keyset = Keyset(db, "attendance", [Attendance.date, Attendance.created_at, Attendance.id])
     
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    offset = (page - 1) * page_size
-    attendance_records = query.offset(offset).limit(page_size).all()
+    if cursor is not None:
+        total = await count_rows(db, query) if include_total else None
+        rows = (await db.execute(keyset.apply(query, cursor, page_size))).all()
+        attendance_records, next_cursor, has_more = keyset.split(rows, page_size)
+    else:
+        # Get total count
+        total = await count_rows(db, query)
+        
+        # Apply pagination
+        offset = (page - 1) * page_size
+        attendance_records = (await db.scalars(
+            query.order_by(*keyset.order_by()).offset(offset).limit(page_size)
+        )).all()
     
     # Format response
     items = []
@@ -540,20 +531,24 @@ async def view_all_attendance(
             "notes": att.notes
         })
     
-    # Calculate summary
-    all_records = db.query(Attendance).filter(
-        and_(
-            Attendance.date >= (start_date or date.today() - timedelta(days=30)),
-            Attendance.date <= (end_date or date.today())
-        )
-    ).all()
+    if cursor is not None:
+        return {
+            "success": True,
+            "data": {
+                "items": items,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "page_size": page_size,
+                "total": total
+            }
+        }
     
-    summary = {
-        "present": sum(1 for a in all_records if a.status == AttendanceStatus.PRESENT),
-        "absent": sum(1 for a in all_records if a.status == AttendanceStatus.ABSENT),
-        "late": sum(1 for a in all_records if a.status == AttendanceStatus.LATE),
-        "on_leave": sum(1 for a in all_records if a.status == AttendanceStatus.ON_LEAVE)
-    }
+    # Calculate summary
+    summary = await db.run_sync(
+        rollup.status_counts,
+        start_date or date.today() - timedelta(days=30),
+        end_date or date.today()
+    )
     
     total_pages = (total + page_size - 1) // page_size
     
@@ -574,7 +569,7 @@ async def view_all_attendance(
 async def mark_attendance_manual(
     attendance_data: AttendanceMarkManual,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Manually mark attendance for an employee
@@ -589,7 +584,9 @@ async def mark_attendance_manual(
             detail="Invalid employee ID format"
         )
     
-    employee = db.query(Employee).filter(Employee.id == emp_uuid).first()
+    employee = await db.scalar(
+        select(Employee).options(joinedload(Employee.user)).where(Employee.id == emp_uuid)
+    )
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -597,12 +594,12 @@ async def mark_attendance_manual(
         )
     
     # Check if attendance already exists for this date
-    existing = db.query(Attendance).filter(
+    existing = await db.scalar(select(Attendance).where(
         and_(
             Attendance.employee_id == emp_uuid,
             Attendance.date == attendance_data.date
         )
-    ).first()
+    ))
     
     # Calculate hours worked
     hours_worked = None
@@ -611,6 +608,8 @@ async def mark_attendance_manual(
         check_out_dt = datetime.combine(attendance_data.date, attendance_data.check_out)
         hours_worked = Decimal((check_out_dt - check_in_dt).total_seconds() / 3600)
     
+    before = rollup.snapshot(existing)
+    
     if existing:
         # Update existing record
         existing.check_in = attendance_data.check_in
@@ -619,12 +618,10 @@ async def mark_attendance_manual(
         existing.status = AttendanceStatus(attendance_data.status)
         existing.notes = attendance_data.notes
         existing.marked_by = current_user.id
-        db.commit()
-        db.refresh(existing)
         attendance_record = existing
     else:
         # Create new record
-        new_attendance = Attendance(
+        attendance_record = Attendance(
             employee_id=emp_uuid,
             date=attendance_data.date,
             check_in=attendance_data.check_in,
@@ -634,10 +631,13 @@ async def mark_attendance_manual(
             notes=attendance_data.notes,
             marked_by=current_user.id
         )
-        db.add(new_attendance)
-        db.commit()
-        db.refresh(new_attendance)
-        attendance_record = new_attendance
+        db.add(attendance_record)
+    
+    await db.run_sync(
+        rollup.record_attendance_change, employee.user.department, before, rollup.snapshot(attendance_record)
+    )
+    await db.commit()
+    await db.refresh(attendance_record)
     
     return {
         "success": True,
@@ -656,17 +656,198 @@ async def mark_attendance_manual(
     }
 
 
+@router.post("/attendance/bulk", response_model=SuccessResponse)
+async def mark_attendance_bulk(
+    payload: AttendanceBulkMark,
+    current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Mark attendance for many (employee, date) entries in one request
+    
+    Valid entries are created or overwritten in chunked upserts within a
+    single transaction; invalid entries (bad fields, unknown employee,
+    duplicate employee/date in the batch) are skipped and reported.
+    Results are returned in request order.
+    """
+    
+    # Validate every entry in one pass
+    results = []
+    accepted = {}  # (employee uuid, date) -> index of first entry
+    for index, raw in enumerate(payload.entries):
+        result = {
+            "index": index,
+            "employee_id": raw.get("employee_id") if isinstance(raw.get("employee_id"), str) else None,
+            "date": None,
+            "result": "failed",
+        }
+        results.append(result)
+        
+        try:
+            entry = AttendanceMarkManual.model_validate(raw)
+        except ValidationError as e:
+            result["error"] = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )
+            continue
+        result["date"] = entry.date.isoformat()
+        
+        try:
+            emp_uuid = uuid.UUID(entry.employee_id)
+        except ValueError:
+            result["error"] = "Invalid employee ID format"
+            continue
+        
+        key = (emp_uuid, entry.date)
+        if key in accepted:
+            result["error"] = f"Duplicate of entry {accepted[key]}"
+            continue
+        accepted[key] = index
+        result["entry"] = entry
+    
+    departments = await db.run_sync(
+        attendance_writes.find_employee_departments, {emp_uuid for emp_uuid, _ in accepted}
+    )
+    
+    rows = []
+    for (emp_uuid, day), index in accepted.items():
+        entry = results[index].pop("entry")
+        if emp_uuid not in departments:
+            results[index]["error"] = "Employee not found"
+            continue
+        rows.append({
+            "employee_id": emp_uuid,
+            "date": day,
+            "status": AttendanceStatus(entry.status),
+            "check_in": entry.check_in,
+            "check_out": entry.check_out,
+            "notes": entry.notes,
+        })
+    
+    written = {}
+    if rows:
+        written = await db.run_sync(attendance_writes.bulk_upsert, rows, departments, current_user.id)
+        await db.commit()
+    
+    summary = {"total": len(results), "created": 0, "updated": 0, "failed": 0}
+    for (emp_uuid, day), (attendance_id, created) in written.items():
+        result = results[accepted[(emp_uuid, day)]]
+        result["result"] = "created" if created else "updated"
+        result["id"] = str(attendance_id)
+    for result in results:
+        summary[result["result"]] += 1
+    
+    return {
+        "success": True,
+        "data": {
+            "results": results,
+            "summary": summary
+        },
+        "message": f"Marked attendance for {summary['created'] + summary['updated']} of {summary['total']} entries"
+    }
+
+
+@router.post("/attendance/import", response_model=SuccessResponse)
+async def import_attendance(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=r'^(csv|ndjson)$'),
+    batch_size: int = Query(attendance_import.DEFAULT_BATCH_SIZE, ge=100, le=10000),
+    current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
+):
+    """
+    Import a badge-reader dump (CSV or NDJSON swipes)
+    
+    The file is streamed line by line in a worker thread and written in
+    batched upserts, one transaction per batch. Format defaults to the
+    file extension (.ndjson/.jsonl, otherwise CSV).
+    
+    Rows need `employee_id` (EMP-... code) and `timestamp`, or `date` and
+    `time`. The response reports throughput and rejected rows.
+    """
+    
+    if format is None:
+        extension = os.path.splitext(file.filename or "")[1].lower()
+        format = "ndjson" if extension in (".ndjson", ".jsonl") else "csv"
+    
+    lines = attendance_import.text_lines(file.file)
+    try:
+        report = await run_in_sync_session(
+            attendance_import.import_swipes, lines, format, batch_size
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File must be UTF-8 encoded"
+        )
+    finally:
+        lines.detach()
+    
+    return {
+        "success": True,
+        "data": report.as_dict(),
+        "message": f"Imported {report.swipes_accepted} swipes, rejected {report.rejected} rows"
+    }
+
+
+# ============================================================================
+# Exports
+# ============================================================================
+
+@router.get("/exports/{dataset}")
+async def export_dataset(
+    request: Request,
+    dataset: str = Path(..., pattern=r'^(attendance|employees|leave-requests)$'),
+    format: str = Query("csv", pattern=r'^(csv|ndjson)$'),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    department: Optional[str] = Query(None),
+    current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
+):
+    """
+    Stream attendance, employees or leave requests as CSV or NDJSON
+    
+    Rows come from a server-side cursor, so any date range exports in
+    bounded memory and the download starts immediately. Identical
+    exports requested at the same time share one query and stream.
+    
+    Query Parameters:
+    - format: csv (default) or ndjson
+    - start_date / end_date: Attendance date, hire date, or leave
+      overlapping the range
+    - department: Filter by department
+    """
+    
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date"
+        )
+    
+    query = exports.DATASETS[dataset](start_date, end_date, department)
+    filename = f"{dataset}-{date.today().isoformat()}.{format}"
+    key = flight_key(
+        request, current_user.role,
+        dataset=dataset, format=format, start_date=start_date, end_date=end_date, department=department,
+    )
+    
+    return StreamingResponse(
+        report_flights.stream(key, lambda: exports.stream_export(query, format)),
+        media_type=exports.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
 # ============================================================================
 # HR Analytics
 # ============================================================================
 
 @router.get("/analytics", response_model=SuccessResponse)
 async def get_hr_analytics(
+    request: Request,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     department: Optional[str] = Query(None),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
 ):
     """
     Get detailed HR analytics data
@@ -675,6 +856,9 @@ async def get_hr_analytics(
     - start_date: From date (default: 30 days ago)
     - end_date: To date (default: today)
     - department: Filter by department
+    
+    Cached per range and department until attendance or employees in
+    the range change; concurrent misses share one computation.
     """
     
     # Default date range
@@ -683,143 +867,34 @@ async def get_hr_analytics(
     if not start_date:
         start_date = end_date - timedelta(days=30)
     
-    # Base query
-    query = db.query(Attendance).join(
-        Employee, Attendance.employee_id == Employee.id
-    ).join(
-        User, Employee.user_id == User.id
-    ).filter(
-        and_(
-            Attendance.date >= start_date,
-            Attendance.date <= end_date
-        )
+    analytics = await response_cache.get_or_compute(
+        f"analytics:{start_date}:{end_date}:{department or ''}",
+        attendance_tags(start_date, end_date) + ["employees"],
+        lambda: report_flights.run(
+            flight_key(request, current_user.role, start_date=start_date, end_date=end_date, department=department),
+            lambda: _compute_hr_analytics(start_date, end_date, department),
+        ),
     )
     
-    if department:
-        query = query.filter(User.department == department)
-    
-    all_attendance = query.all()
-    
-    # Attendance trends (daily)
-    attendance_trends = []
-    current_date = start_date
-    while current_date <= end_date:
-        day_records = [a for a in all_attendance if a.date == current_date]
-        if day_records:
-            present_count = sum(1 for a in day_records if a.status in [AttendanceStatus.PRESENT, AttendanceStatus.LATE])
-            total_count = len(day_records)
-            rate = round((present_count / total_count * 100) if total_count > 0 else 0, 1)
-        else:
-            rate = 0
-        
-        attendance_trends.append({
-            "date": current_date.isoformat(),
-            "rate": rate
-        })
-        current_date += timedelta(days=1)
-    
-    # Department comparison
-    dept_query = db.query(
-        User.department,
-        func.count(Attendance.id).label('total'),
-        func.sum(
-            func.case(
-                (Attendance.status.in_([AttendanceStatus.PRESENT, AttendanceStatus.LATE]), 1),
-                else_=0
-            )
-        ).label('present')
-    ).join(
-        Employee, Attendance.employee_id == Employee.id
-    ).join(
-        User, Employee.user_id == User.id
-    ).filter(
-        and_(
-            Attendance.date >= start_date,
-            Attendance.date <= end_date
-        )
-    ).group_by(User.department).all()
-    
-    department_comparison = []
-    for dept, total, present in dept_query:
-        rate = round((present / total * 100) if total > 0 else 0, 1)
-        department_comparison.append({
-            "department": dept,
-            "attendance_rate": rate
-        })
-    
-    # Top performers (by attendance rate)
-    employee_stats = {}
-    for att in all_attendance:
-        emp_id = str(att.employee_id)
-        if emp_id not in employee_stats:
-            employee_stats[emp_id] = {
-                "name": att.employee.user.name,
-                "total": 0,
-                "present": 0
-            }
-        employee_stats[emp_id]["total"] += 1
-        if att.status in [AttendanceStatus.PRESENT, AttendanceStatus.LATE]:
-            employee_stats[emp_id]["present"] += 1
-    
-    top_performers = []
-    for emp_id, stats in employee_stats.items():
-        rate = round((stats["present"] / stats["total"] * 100) if stats["total"] > 0 else 0, 1)
-        top_performers.append({
-            "employee_id": emp_id,
-            "name": stats["name"],
-            "attendance_rate": rate,
-            "total_days": stats["total"]
-        })
-    
-    top_performers.sort(key=lambda x: x["attendance_rate"], reverse=True)
-    top_performers = top_performers[:10]  # Top 10
-    
-    # Attendance issues (low attendance)
-    attendance_issues = []
-    for emp_id, stats in employee_stats.items():
-        rate = round((stats["present"] / stats["total"] * 100) if stats["total"] > 0 else 0, 1)
-        if rate < 80:  # Less than 80% attendance
-            absent_days = stats["total"] - stats["present"]
-            late_days = sum(1 for a in all_attendance if str(a.employee_id) == emp_id and a.status == AttendanceStatus.LATE)
-            attendance_issues.append({
-                "employee_id": emp_id,
-                "name": stats["name"],
-                "absent_days": absent_days,
-                "late_days": late_days
-            })
-    
-    # Average hours per employee
-    total_hours = sum(float(a.hours_worked) for a in all_attendance if a.hours_worked)
-    avg_hours = round(total_hours / len(employee_stats) if employee_stats else 0, 1)
-    
-    # Peak hours (most common check-in and check-out times)
-    check_ins = [a.check_in for a in all_attendance if a.check_in]
-    check_outs = [a.check_out for a in all_attendance if a.check_out]
-    
-    peak_check_in = max(set(check_ins), key=check_ins.count).isoformat() if check_ins else "09:00:00"
-    peak_check_out = max(set(check_outs), key=check_outs.count).isoformat() if check_outs else "18:00:00"
-    
     return {
         "success": True,
-        "data": {
-            "attendance_trends": attendance_trends,
-            "department_comparison": department_comparison,
-            "top_performers": top_performers,
-            "attendance_issues": attendance_issues,
-            "leave_patterns": {
-                "sick_leave": 0,  # Will be implemented with leave requests
-                "vacation": 0,
-                "personal": 0
-            },
-            "average_hours_per_employee": avg_hours,
-            "peak_hours": {
-                "check_in": peak_check_in,
-                "check_out": peak_check_out
-            }
-        }
+        "data": analytics
     }
 
 
+async def _compute_hr_analytics(start_date: date, end_date: date, department: Optional[str]) -> dict:
+    """
+    Build the /analytics payload
+    
+    Runs in the report process pool: the per-employee analytics is CPU
+    work that would otherwise hold this worker's GIL and stall every other
+    request (check-ins) while it runs. The computation is shared by
+    coalesced requests and may outlive the one that started it.
+    """
+    
+    return await run_in_report_process(hr_analytics_report, start_date, end_date, department)
+
+
 # ============================================================================
 # Notifications
 # ============================================================================
@@ -828,7 +903,7 @@ async def get_hr_analytics(
 async def send_notification(
     data: NotificationCreate,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send a notification to an employee or all employees
@@ -842,10 +917,10 @@ async def send_notification(
     
     # If recipient_id is provided, verify the user exists
     if data.recipient_id:
-        recipient = db.query(User).filter(
+        recipient = await db.scalar(select(User).where(
             User.id == uuid.UUID(data.recipient_id),
             User.role == UserRole.EMPLOYEE
-        ).first()
+        ))
         
         if not recipient:
             raise HTTPException(
@@ -867,8 +942,8 @@ async def send_notification(
     )
     
     db.add(notification)
-    db.commit()
-    db.refresh(notification)
+    await db.commit()
+    await db.refresh(notification)
     
     recipient_text = "all employees" if not data.recipient_id else "employee"
     
@@ -889,22 +964,23 @@ async def send_notification(
 async def get_sent_notifications(
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get notifications sent by the current HR user
     """
     
-    notifications = db.query(Notification).filter(
+    notifications = (await db.scalars(select(Notification).options(
+        joinedload(Notification.recipient)
+    ).where(
         Notification.sender_id == current_user.id
-    ).order_by(desc(Notification.created_at)).limit(limit).all()
+    ).order_by(desc(Notification.created_at)).limit(limit))).all()
     
     items = []
     for notif in notifications:
         recipient_name = "All Employees"
         if notif.recipient_id:
-            recipient = db.query(User).filter(User.id == notif.recipient_id).first()
-            recipient_name = recipient.name if recipient else "Unknown"
+            recipient_name = notif.recipient.name if notif.recipient else "Unknown"
         
         items.append({
             "id": str(notif.id),
@@ -929,19 +1005,21 @@ async def get_sent_notifications(
 async def get_hr_notifications(
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get notifications received by the current HR user
     """
     
     # Get notifications where HR is the recipient or recipient is None (broadcast)
-    notifications = db.query(Notification).filter(
+    notifications = (await db.scalars(select(Notification).options(
+        joinedload(Notification.sender)
+    ).where(
         or_(
             Notification.recipient_id == current_user.id,
             Notification.recipient_id == None
         )
-    ).order_by(desc(Notification.created_at)).limit(limit).all()
+    ).order_by(desc(Notification.created_at)).limit(limit))).all()
     
     items = []
     unread_count = 0
@@ -949,8 +1027,7 @@ async def get_hr_notifications(
     for notif in notifications:
         sender_name = "System"
         if notif.sender_id:
-            sender = db.query(User).filter(User.id == notif.sender_id).first()
-            sender_name = sender.name if sender else "Unknown"
+            sender_name = notif.sender.name if notif.sender else "Unknown"
         
         if not notif.is_read:
             unread_count += 1
@@ -979,7 +1056,7 @@ async def get_hr_notifications(
 async def mark_hr_notification_read(
     notification_id: str,
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a notification as read for HR user
@@ -993,13 +1070,13 @@ async def mark_hr_notification_read(
             detail="Invalid notification ID format"
         )
     
-    notification = db.query(Notification).filter(
+    notification = await db.scalar(select(Notification).where(
         Notification.id == notif_uuid,
         or_(
             Notification.recipient_id == current_user.id,
             Notification.recipient_id == None
         )
-    ).first()
+    ))
     
     if not notification:
         raise HTTPException(
@@ -1009,7 +1086,7 @@ async def mark_hr_notification_read(
     
     notification.is_read = True
     notification.read_at = datetime.now()
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -1020,25 +1097,25 @@ async def mark_hr_notification_read(
 @router.put("/notifications/read-all", response_model=SuccessResponse)
 async def mark_all_hr_notifications_read(
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark all notifications as read for HR user
     """
     
-    notifications = db.query(Notification).filter(
+    notifications = (await db.scalars(select(Notification).where(
         or_(
             Notification.recipient_id == current_user.id,
             Notification.recipient_id == None
         ),
         Notification.is_read == False
-    ).all()
+    ))).all()
     
     for notif in notifications:
         notif.is_read = True
         notif.read_at = datetime.now()
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -1052,9 +1129,10 @@ async def mark_all_hr_notifications_read(
 
 @router.get("/recent-activity", response_model=SuccessResponse)
 async def get_recent_activity(
+    request: Request,
+    response: Response,
     limit: int = Query(10, ge=1, le=50),
     current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
-    db: Session = Depends(get_db)
 ):
     """
     Get recent activity in the system
@@ -1064,9 +1142,17 @@ async def get_recent_activity(
     - Employee clock in (with time)
     - Employee clock out (with time)
     - Leave requests submitted
+    
+    Supports If-None-Match: an unchanged feed returns 304 without a query.
+    The relative "time" labels are at most ETAG_TTL seconds behind. The
+    three queries run concurrently (see gather_reads).
     """
     from ..models.leave_request import LeaveRequest
     
+    not_modified = conditional_get(request, response, RECENT_ACTIVITY_TABLES, limit)
+    if not_modified:
+        return not_modified
+    
     activities = []
     
     # Helper function to format time difference
@@ -1096,14 +1182,33 @@ async def get_recent_activity(
             days = time_diff.days
             return f"{days} day{'s' if days != 1 else ''} ago"
     
-    # 1. Get recent employees created (last 7 days)
     # Use naive datetime for comparison since DB stores naive timestamps
     now = datetime.utcnow()
     seven_days_ago = now - timedelta(days=7)
-    recent_employees = db.query(Employee).join(User).filter(
-        User.created_at >= seven_days_ago
-    ).order_by(desc(User.created_at)).limit(10).all()
+    yesterday = now - timedelta(days=1)
     
+    recent_employees, recent_attendance, recent_leave_requests = await gather_reads(
+        # Recent employees created (last 7 days)
+        lambda db: db.scalars(select(Employee).join(User).options(
+            contains_eager(Employee.user)
+        ).where(
+            User.created_at >= seven_days_ago
+        ).order_by(desc(User.created_at)).limit(10)).all(),
+        # Recent clock-ins and clock-outs (last 24 hours)
+        lambda db: db.scalars(select(Attendance).join(Employee).join(User).options(
+            contains_eager(Attendance.employee).contains_eager(Employee.user)
+        ).where(
+            Attendance.created_at >= yesterday
+        ).order_by(desc(Attendance.created_at)).limit(20)).all(),
+        # Recent leave requests (last 7 days)
+        lambda db: db.scalars(select(LeaveRequest).join(Employee).join(User).options(
+            contains_eager(LeaveRequest.employee).contains_eager(Employee.user)
+        ).where(
+            LeaveRequest.submitted_at >= seven_days_ago
+        ).order_by(desc(LeaveRequest.submitted_at)).limit(10)).all(),
+    )
+    
+    # 1. Recent employees created
     for emp in recent_employees:
         activities.append({
             "id": f"emp_{emp.id}",
@@ -1114,12 +1219,7 @@ async def get_recent_activity(
             "employee_name": emp.user.name
         })
     
-    # 2. Get recent clock-ins and clock-outs (last 24 hours)
-    yesterday = now - timedelta(days=1)
-    recent_attendance = db.query(Attendance).join(Employee).join(User).filter(
-        Attendance.created_at >= yesterday
-    ).order_by(desc(Attendance.created_at)).limit(20).all()
-    
+    # 2. Recent clock-ins and clock-outs
     for att in recent_attendance:
         # Add clock-in activity if check_in exists
         if att.check_in:
@@ -1147,11 +1247,7 @@ async def get_recent_activity(
                 "clock_time": check_out_time
             })
     
-    # 3. Get recent leave requests (last 7 days)
-    recent_leave_requests = db.query(LeaveRequest).join(Employee).join(User).filter(
-        LeaveRequest.submitted_at >= seven_days_ago
-    ).order_by(desc(LeaveRequest.submitted_at)).limit(10).all()
-    
+    # 3. Recent leave requests
     for lr in recent_leave_requests:
         # Format date range
         date_range = f"{lr.start_date.strftime('%b %d')} - {lr.end_date.strftime('%b %d')}"
@@ -1190,8 +1286,10 @@ async def get_leave_requests(
     employee_id: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all leave requests (HR only)
@@ -1201,8 +1299,11 @@ async def get_leave_requests(
     - employee_id: Filter by employee
     - page: Page number
     - page_size: Items per page
+    - cursor: Use keyset pagination; pass an empty value for the first page,
+      then the returned next_cursor (page is ignored)
+    - include_total: Also count all matches in cursor mode (default: false)
     """
-    from ..models.leave_request import LeaveRequest
+    from ..models.leave_request import LeaveRequest, LeaveStatus
     
     # Verify HR role
     if current_user.role != UserRole.HR_ADMINISTRATOR:
@@ -1212,11 +1313,13 @@ async def get_leave_requests(
         )
     
     # Base query
-    query = db.query(LeaveRequest).join(Employee).join(User)
+    query = select(LeaveRequest).join(Employee).join(User).options(
+        contains_eager(LeaveRequest.employee).contains_eager(Employee.user),
+        joinedload(LeaveRequest.reviewer)
+    )
     
     # Apply filters
     if status:
-        from ..models.leave_request import LeaveStatus
         query = query.filter(LeaveRequest.status == LeaveStatus(status))
     
     if employee_id:
@@ -1229,12 +1332,21 @@ async def get_leave_requests(
                 detail="Invalid employee ID format"
             )
     
-    # Get total count
-    total = query.count()
+    keyset = Keyset(db, "leave_requests", [LeaveRequest.submitted_at, LeaveRequest.id])
     
-    # Apply pagination and ordering
-    offset = (page - 1) * page_size
-    leave_requests = query.order_by(desc(LeaveRequest.submitted_at)).offset(offset).limit(page_size).all()
+    if cursor is not None:
+        total = await count_rows(db, query) if include_total else None
+        rows = (await db.execute(keyset.apply(query, cursor, page_size))).all()
+        leave_requests, next_cursor, has_more = keyset.split(rows, page_size)
+    else:
+        # Get total count
+        total = await count_rows(db, query)
+        
+        # Apply pagination and ordering
+        offset = (page - 1) * page_size
+        leave_requests = (await db.scalars(
+            query.order_by(*keyset.order_by()).offset(offset).limit(page_size)
+        )).all()
     
     # Format response
     items = []
@@ -1257,18 +1369,32 @@ async def get_leave_requests(
             "notes": lr.notes
         })
     
-    total_pages = (total + page_size - 1) // page_size
-    
     # Get summary counts
-    all_requests = db.query(LeaveRequest).all()
-    from ..models.leave_request import LeaveStatus
+    status_counts = dict((await db.execute(
+        select(LeaveRequest.status, func.count()).group_by(LeaveRequest.status)
+    )).all())
     summary = {
-        "total": len(all_requests),
-        "pending": sum(1 for lr in all_requests if lr.status == LeaveStatus.PENDING),
-        "approved": sum(1 for lr in all_requests if lr.status == LeaveStatus.APPROVED),
-        "rejected": sum(1 for lr in all_requests if lr.status == LeaveStatus.REJECTED)
+        "total": sum(status_counts.values()),
+        "pending": status_counts.get(LeaveStatus.PENDING, 0),
+        "approved": status_counts.get(LeaveStatus.APPROVED, 0),
+        "rejected": status_counts.get(LeaveStatus.REJECTED, 0)
     }
     
+    if cursor is not None:
+        return {
+            "success": True,
+            "data": {
+                "leave_requests": items,
+                "next_cursor": next_cursor,
+                "has_more": has_more,
+                "page_size": page_size,
+                "total": total,
+                "summary": summary
+            }
+        }
+    
+    total_pages = (total + page_size - 1) // page_size
+    
     return {
         "success": True,
         "data": {
@@ -1287,7 +1413,7 @@ async def update_leave_request_status(
     leave_request_id: str,
     status_data: dict,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Approve or reject a leave request (HR only)
@@ -1314,7 +1440,9 @@ async def update_leave_request_status(
             detail="Invalid leave request ID format"
         )
     
-    leave_request = db.query(LeaveRequest).filter(LeaveRequest.id == lr_uuid).first()
+    leave_request = await db.scalar(
+        select(LeaveRequest).options(joinedload(LeaveRequest.employee)).where(LeaveRequest.id == lr_uuid)
+    )
     
     if not leave_request:
         raise HTTPException(
@@ -1336,8 +1464,7 @@ async def update_leave_request_status(
     leave_request.reviewed_at = datetime.utcnow()
     leave_request.notes = status_data.get("notes")
     
-    db.commit()
-    db.refresh(leave_request)
+    await db.commit()
     
     # Send notification to employee
     notification = Notification(
@@ -1348,7 +1475,7 @@ async def update_leave_request_status(
         type=NotificationType.SUCCESS if new_status == "approved" else NotificationType.WARNING
     )
     db.add(notification)
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -1360,3 +1487,36 @@ async def update_leave_request_status(
         },
         "message": f"Leave request {new_status} successfully"
     }
+
+
+# ============================================================================
+# Request Profiles
+# ============================================================================
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: str = Query("prof", pattern=r'^(prof|text)$'),
+    current_user: User = Depends(require_role(UserRole.HR_ADMINISTRATOR)),
+):
+    """
+    Download a request profile taken with `X-Profile: 1` or `?profile=1`
+    
+    The profile id is returned in the profiled response's `X-Profile-Id`
+    header. Only available when PROFILING_ENABLED is set.
+    
+    Query Parameters:
+    - format: prof (default, for pstats/snakeviz) or text (top functions
+      by cumulative time)
+    """
+    path = profiling.profile_path(profile_id) if settings.PROFILING_ENABLED else None
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    if format == "text":
+        return PlainTextResponse(await run_in_threadpool(profiling.profile_text, path))
+    
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
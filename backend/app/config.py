@@ -21,6 +21,60 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing pool ("thread" or "process") and the number of hashes
+    # allowed in flight before requests are rejected with 503
+    PASSWORD_HASH_POOL: str = os.getenv("PASSWORD_HASH_POOL", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    
+    # Authenticated users cached per process by get_current_user
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))  # seconds, 0 disables
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    
+    # ETags of polled endpoints change at least this often, which bounds how
+    # long writes made by other worker processes can go unnoticed (0 disables)
+    ETAG_TTL: int = int(os.getenv("ETAG_TTL", "30"))  # seconds
+    
+    # Dashboard stats, analytics and announcements cached until a commit
+    # touches their data, or for at most RESPONSE_CACHE_TTL (0 disables).
+    # RESPONSE_CACHE_URL (redis://...) shares the cache between workers
+    # (needs the redis package); otherwise it is per process
+    RESPONSE_CACHE_TTL: int = int(os.getenv("RESPONSE_CACHE_TTL", "300"))  # seconds
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    RESPONSE_CACHE_URL: str = os.getenv("RESPONSE_CACHE_URL", "")
+    
+    # Concurrent identical analytics, dashboard and export requests share
+    # one computation; waiters give up with 503 after COALESCE_TIMEOUT.
+    # Shared exports replay up to COALESCE_STREAM_BUFFER_KB to late joiners
+    COALESCE_TIMEOUT: float = float(os.getenv("COALESCE_TIMEOUT", "30"))  # seconds
+    COALESCE_STREAM_BUFFER_KB: int = int(os.getenv("COALESCE_STREAM_BUFFER_KB", "4096"))
+    
+    # CPU-heavy reports (HR analytics) run in this many worker processes
+    # ("process"), or in the threadpool ("thread") where processes are
+    # unavailable or memory is tight
+    REPORT_POOL: str = os.getenv("REPORT_POOL", "process")
+    REPORT_WORKERS: int = int(os.getenv("REPORT_WORKERS", "2"))
+    
+    # Connections one request may use at once for its concurrent reads
+    FANOUT_MAX_CONNECTIONS: int = int(os.getenv("FANOUT_MAX_CONNECTIONS", "4"))
+    
+    # SQLite tuning (ignored for other databases): WAL journal,
+    # synchronous=NORMAL, a busy timeout instead of immediate "database is
+    # locked" errors, a larger page cache and memory-mapped reads
+    SQLITE_TUNING: bool = os.getenv("SQLITE_TUNING", "True").lower() == "true"
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_MB: int = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+    SQLITE_MMAP_SIZE_MB: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    # Async connections; with WAL readers run alongside the single writer
+    SQLITE_POOL_SIZE: int = int(os.getenv("SQLITE_POOL_SIZE", "4"))
+    
+    # gzip (or brotli, if installed) for textual responses of at least
+    # COMPRESSION_MIN_SIZE bytes, when the client's Accept-Encoding allows
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True").lower() == "true"
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    
     # CORS
     CORS_ORIGINS: str = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000,http://localhost:8080")
     
@@ -29,6 +83,25 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     
+    # Report the number of SQL statements per request in X-Query-Count
+    QUERY_COUNT_HEADER: bool = os.getenv("QUERY_COUNT_HEADER", "False").lower() == "true"
+    # Report DB, auth and serialization time per request in Server-Timing
+    SERVER_TIMING_HEADER: bool = os.getenv("SERVER_TIMING_HEADER", "False").lower() == "true"
+    # Log statements slower than this (normalized SQL and route); 0 disables
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+    
+    # Prometheus metrics at /api/metrics; scrapers send METRICS_TOKEN as
+    # "Authorization: Bearer <token>". Without a token the endpoint is only
+    # served with DEBUG on, so production deployments never expose it openly
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN", "")
+    
+    # On-demand cProfile of single requests (X-Profile: 1 or ?profile=1) for
+    # HR administrators; the newest PROFILE_KEEP profiles are kept
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "False").lower() == "true"
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "./profiles")
+    PROFILE_KEEP: int = int(os.getenv("PROFILE_KEEP", "20"))
+    
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
@@ -42,6 +115,11 @@ class Settings(BaseSettings):
         """Convert CORS_ORIGINS string to list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
+    @property
+    def sql_instrumentation(self) -> bool:
+        """Whether per-request SQL tracking is needed by any diagnostic"""
+        return self.QUERY_COUNT_HEADER or self.SERVER_TIMING_HEADER or self.SLOW_QUERY_MS > 0
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
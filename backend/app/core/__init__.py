@@ -6,6 +6,8 @@ Security, authentication, and shared utilities
 from .security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     verify_token,
@@ -15,6 +17,8 @@ from .dependencies import get_current_user, get_current_active_user, require_rol
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "create_refresh_token",
     "verify_token",
@@ -0,0 +1,239 @@
+"""
+Request Coalescing
+Single-flight computations: concurrent identical requests in a worker share one result
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from .profiling import profile_call
+
+_END = object()
+
+
+def flight_key(request: Request, role: Any, **params) -> Tuple:
+    """
+    Key identifying identical requests: route, normalized parameters and role
+    
+    Pass parameters after defaults are applied (so `?end_date=<today>` and
+    no end_date coalesce); None values are dropped.
+    """
+    route = request.scope.get("route")
+    path = route.path if route is not None else request.url.path
+    normalized = tuple(sorted((name, str(value)) for name, value in params.items() if value is not None))
+    return (request.method, path, getattr(role, "value", role), normalized)
+
+
+class SharedStream:
+    """
+    A sync chunk iterator read once in the threadpool and replayed to every reader
+    
+    Readers joining while the stream is still joinable get it from the
+    first chunk. Chunks are kept for late joiners until more than
+    `max_buffer` bytes are buffered; after that no one joins, chunks every
+    reader has passed are dropped and the pump waits for the slowest
+    reader, so memory stays bounded. A reader that stays too far behind
+    for `timeout` seconds is dropped with an error, rather than holding
+    the database cursor open for the others.
+    """
+    
+    def __init__(self, iterator: Iterator[bytes], max_buffer: int, timeout: float, on_close: Callable[[], None]):
+        self.joinable = True
+        self._iterator = iterator
+        self._max_buffer = max_buffer
+        self._timeout = timeout
+        self._on_close = on_close
+        self._chunks: List[bytes] = []
+        self._start = 0      # stream index of self._chunks[0]
+        self._buffered = 0   # bytes in self._chunks
+        self._finished = False
+        self._error: Optional[BaseException] = None
+        self._readers: Dict[object, int] = {}  # reader -> index of its next chunk
+        self._dropped = set()
+        self._changed = asyncio.Event()
+        self._pump: Optional[asyncio.Task] = None
+    
+    def _notify(self) -> None:
+        # Everyone waiting on the old event wakes up; later waits use a new one
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    def _stop_joining(self) -> None:
+        if self.joinable:
+            self.joinable = False
+            self._on_close()
+    
+    def _trim(self) -> None:
+        if self.joinable:
+            return
+        lowest = min(self._readers.values(), default=self._start + len(self._chunks))
+        while self._start < lowest and self._chunks:
+            self._buffered -= len(self._chunks.pop(0))
+            self._start += 1
+    
+    async def _run_pump(self) -> None:
+        try:
+            while self._readers:
+                if self._buffered > self._max_buffer:
+                    # Wait for the slowest reader to free buffer space
+                    changed = self._changed
+                    try:
+                        await asyncio.wait_for(changed.wait(), self._timeout)
+                    except asyncio.TimeoutError:
+                        lowest = min(self._readers.values())
+                        for reader, index in list(self._readers.items()):
+                            if index == lowest:
+                                self._dropped.add(reader)
+                                del self._readers[reader]
+                        self._trim()
+                        self._notify()
+                    continue
+                
+                chunk = await run_in_threadpool(profile_call, next, self._iterator, _END)
+                if chunk is _END:
+                    break
+                self._chunks.append(chunk)
+                self._buffered += len(chunk)
+                if self._buffered > self._max_buffer:
+                    self._stop_joining()
+                    self._trim()
+                self._notify()
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._finished = True
+            self._stop_joining()
+            self._notify()
+            close = getattr(self._iterator, "close", None)
+            if close is not None:
+                await run_in_threadpool(close)
+    
+    def read(self) -> AsyncIterator[bytes]:
+        """
+        Join the stream (only while joinable) and iterate it from its first chunk
+        
+        The reader is registered at once, not on first iteration, so the
+        chunks it needs are kept until it starts.
+        """
+        reader = object()
+        self._readers[reader] = self._start
+        if self._pump is None:
+            self._pump = asyncio.ensure_future(self._run_pump())
+        return self._iterate(reader)
+    
+    async def _iterate(self, reader: object) -> AsyncIterator[bytes]:
+        index = self._readers[reader]
+        try:
+            while True:
+                if reader in self._dropped:
+                    raise asyncio.TimeoutError("Fell too far behind the shared stream")
+                if index < self._start + len(self._chunks):
+                    chunk = self._chunks[index - self._start]
+                    index += 1
+                    self._readers[reader] = index
+                    self._trim()
+                    self._notify()
+                    yield chunk
+                elif self._finished:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                else:
+                    await self._changed.wait()
+        finally:
+            self._readers.pop(reader, None)
+            self._dropped.discard(reader)
+            self._trim()
+            self._notify()
+
+
+class SingleFlight:
+    """
+    Shares in-flight computations between concurrent callers with the same key
+    
+    The first caller starts the computation as a task of its own; callers
+    arriving before it finishes wait for the same task. Its result, or its
+    exception, goes to every caller. Nothing is kept once it completes:
+    pair it with the response cache to reuse results. Computations must
+    not use a request's session, since the request that started one may be
+    gone before it finishes. They open their own sync sessions
+    (run_in_sync_session): the waiting requests may hold every connection
+    of the async pool, so taking another one from it could deadlock.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._streams: Dict[Hashable, SharedStream] = {}
+    
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        if not call.cancelled():
+            call.exception()  # retrieved, even if every caller timed out
+    
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Await `compute()`, or the identical computation already in flight
+        
+        Args:
+            key: flight_key() of the request
+            compute: Coroutine function producing the result
+            timeout: Seconds to wait (default COALESCE_TIMEOUT); the
+                computation itself keeps running for the other callers
+        
+        Returns:
+            The computation's result
+        
+        Raises:
+            HTTPException: 503 with Retry-After when the wait times out
+            Exception: Whatever the computation raised
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(compute())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._forget(key, done))
+        
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), timeout or settings.COALESCE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Report is still being prepared, please retry shortly",
+                headers={"Retry-After": "5"},
+            )
+    
+    def stream(self, key: Hashable, make_iterator: Callable[[], Iterator[bytes]]) -> AsyncIterator[bytes]:
+        """
+        Read the identical stream already in flight, or start `make_iterator()`
+        
+        Args:
+            key: flight_key() of the request
+            make_iterator: Returns the sync chunk iterator (called only
+                when no joinable stream exists)
+        
+        Returns:
+            Async iterator of the stream's chunks
+        """
+        shared = self._streams.get(key)
+        if shared is None or not shared.joinable:
+            def close():
+                if self._streams.get(key) is shared:
+                    del self._streams[key]
+            
+            shared = SharedStream(
+                make_iterator(),
+                max_buffer=settings.COALESCE_STREAM_BUFFER_KB * 1024,
+                timeout=settings.COALESCE_TIMEOUT,
+                on_close=close,
+            )
+            self._streams[key] = shared
+        return shared.read()
+
+
+# Expensive HR reports (analytics, dashboard stats, exports)
+report_flights = SingleFlight()
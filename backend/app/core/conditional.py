@@ -0,0 +1,162 @@
+"""
+Conditional GET
+ETags from per-table version counters, so unchanged polls get 304 without a query
+"""
+
+import hashlib
+import time
+from itertools import chain, count
+from typing import Dict, Iterable, Optional, Set
+
+from fastapi import Request, Response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..config import settings
+
+
+class TableVersions:
+    """
+    Process-local version per table, bumped when a session commits changes to it
+    
+    Every bump takes the next value of one global sequence, so versions
+    never repeat even when threadpool sessions commit concurrently. Like
+    the principal cache, this only sees commits made in this process:
+    ETags also change every ETAG_TTL seconds, which bounds how long a
+    write made by another worker (or a script) can go unnoticed.
+    """
+    
+    def __init__(self):
+        self._sequence = count(1)
+        self._versions: Dict[str, int] = {}
+    
+    def bump(self, tables: Iterable[str]) -> None:
+        for table in tables:
+            self._versions[table] = next(self._sequence)
+    
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+
+table_versions = TableVersions()
+
+# Columns no response depends on (last_login is set on every login); an
+# update touching only these is not a change for ETags or the response cache
+IGNORED_COLUMNS = {"last_login", "updated_at"}
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def _changed_tables(session: Session) -> set:
+    return session.info.setdefault("changed_tables", set())
+
+
+def changed_attributes(state) -> Set[str]:
+    """Keys of the attributes with pending changes on an instance's state"""
+    return {attr.key for attr in state.attrs if attr.history.has_changes()}
+
+
+def is_ignored_update(session: Session, obj) -> bool:
+    """Whether a dirty object only changed IGNORED_COLUMNS"""
+    return obj in session.dirty and not changed_attributes(inspect(obj)) - IGNORED_COLUMNS
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    tables = _changed_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if is_ignored_update(session, obj):
+            continue
+        tables.update(table.name for table in inspect(obj).mapper.tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tables(orm_execute_state):
+    # Core and bulk INSERT/UPDATE/DELETE run through session.execute()
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            _changed_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session):
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        table_versions.bump(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    session.info.pop("changed_tables", None)
+
+
+# ============================================================================
+# ETags
+# ============================================================================
+
+def compute_etag(tables: Iterable[str], *parts) -> str:
+    """
+    Weak ETag for a response built from `tables`, varying with `parts`
+    
+    Args:
+        tables: Tables the response is read from
+        parts: Anything else the body depends on (user id, query
+            parameters, today's date)
+    
+    Returns:
+        ETag header value
+    """
+    key = [f"{table}={table_versions.get(table)}" for table in sorted(tables)]
+    key.append(str(int(time.time() // settings.ETAG_TTL)))
+    key.extend(str(part) for part in parts)
+    digest = hashlib.blake2b("|".join(key).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_get(request: Request, response: Response, tables: Iterable[str], *parts) -> Optional[Response]:
+    """
+    ETag a GET endpoint's response, or answer 304 if the client's copy is current
+    
+    Call before running any query, so a write committed meanwhile
+    changes the next ETag. Sets ETag and `Cache-Control: private,
+    no-cache` (browsers revalidate every poll) on the endpoint's response.
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        response: Response injected into the endpoint
+        tables: Tables the body is read from
+        parts: Anything else the body depends on
+    
+    Returns:
+        A 304 response to return as is, or None to build the body
+    """
+    if settings.ETAG_TTL <= 0:
+        return None
+    
+    etag = compute_etag(tables, *parts)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    response.headers.update(headers)
+    return None
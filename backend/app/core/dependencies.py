@@ -4,31 +4,40 @@ FastAPI dependencies for authentication and authorization
 """
 
 from typing import Optional
+from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
+from ..models.employee import Employee
 from ..models.user import User, UserRole
+from .instrumentation import times_auth
+from .principal_cache import CachedPrincipal, principal_cache
 from .security import verify_token
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
 
-async def get_current_user(
+@times_auth
+async def get_current_principal(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> CachedPrincipal:
     """
-    Get current authenticated user from JWT token
+    Resolve the JWT to the cached user and employee id
+    
+    Served from the principal cache when possible; on a miss the user and
+    their employee id are loaded in one query and cached.
     
     Args:
         credentials: HTTP Bearer credentials
         db: Database session
         
     Returns:
-        Current user object
+        Cached principal for the token's user
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -59,17 +68,66 @@ async def get_current_user(
     
     # Convert string UUID to UUID object
     try:
-        from uuid import UUID
         user_uuid = UUID(user_id)
     except (ValueError, AttributeError):
         raise credentials_exception
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_uuid).first()
-    if user is None:
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+    
+    # Get user and employee id from database
+    row = (await db.execute(
+        select(User, Employee.id)
+        .outerjoin(Employee, Employee.user_id == User.id)
+        .where(User.id == user_uuid)
+    )).first()
+    if row is None:
         raise credentials_exception
     
-    return user
+    return principal_cache.put(row[0], row[1])
+
+
+async def get_current_user(
+    principal: CachedPrincipal = Depends(get_current_principal)
+) -> User:
+    """
+    Get current authenticated user from JWT token
+    
+    The returned User is not attached to the request's session; load the
+    row explicitly before modifying it.
+    
+    Args:
+        principal: Principal from get_current_principal
+        
+    Returns:
+        Current user object
+    """
+    return principal.to_user()
+
+
+async def get_current_employee_id(
+    principal: CachedPrincipal = Depends(get_current_principal)
+) -> UUID:
+    """
+    Get the id of the current user's employee record
+    
+    Args:
+        principal: Principal from get_current_principal
+        
+    Returns:
+        Employee primary key
+        
+    Raises:
+        HTTPException: If the user has no employee record
+    """
+    if principal.employee_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Employee record not found"
+        )
+    
+    return principal.employee_id
 
 
 async def get_current_active_user(
@@ -0,0 +1,288 @@
+"""
+SQL Instrumentation
+Per-request SQL statement counts and timings, Server-Timing and the slow-query log
+"""
+
+import asyncio
+import logging
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Iterator, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .middleware import add_response_headers
+
+logger = logging.getLogger("staffsync.sql")
+
+
+class QueryStats:
+    """SQL statements executed while a request was being handled, with timings (seconds)"""
+    
+    __slots__ = (
+        "statements", "db_time", "slowest_time", "slowest_statement",
+        "auth_time", "endpoint_done", "serialize_time", "scope",
+    )
+    
+    def __init__(self, scope: Optional[dict] = None):
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.auth_time = 0.0
+        self.endpoint_done = 0.0
+        self.serialize_time = 0.0
+        self.scope = scope
+    
+    def route(self) -> str:
+        """Method and route template of the request, e.g. "GET /api/hr/employees/{employee_id}" """
+        if self.scope is None:
+            return "no request"
+        route = self.scope.get("route")
+        path = route.path if route is not None else self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}".strip()
+    
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        return ", ".join((
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries"',
+            f"db-slowest;dur={self.slowest_time * 1000:.2f}",
+            f"auth;dur={self.auth_time * 1000:.2f}",
+            f"serialize;dur={self.serialize_time * 1000:.2f}",
+        ))
+
+
+# Stats for the request running in the current context (None outside a request)
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Statements slower than this are logged (0 disables the log)
+_slow_query_seconds = 0.0
+
+
+# ============================================================================
+# SQL normalization
+# ============================================================================
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$.])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str, limit: int = 2000) -> str:
+    """
+    Reduce a statement to its shape for logging and grouping
+    
+    Collapses whitespace, replaces inline literals with `?` and expanded
+    placeholder lists (IN lists, multi-row VALUES) with `(...)`, so that
+    the same query logs the same way whatever its parameters.
+    
+    Args:
+        statement: SQL as sent to the driver
+        limit: Maximum length of the result
+    
+    Returns:
+        Normalized SQL
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _REPEATED_LIST.sub("(...), ...", sql)
+    return sql if len(sql) <= limit else sql[:limit] + " ..."
+
+
+# ============================================================================
+# Engine hooks
+# ============================================================================
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info.pop("query_started", perf_counter())
+    stats = _current_stats.get()
+    if stats is not None:
+        # Threadpool workers share the stats object; the GIL keeps these
+        # updates close enough for diagnostics
+        stats.statements += 1
+        stats.db_time += elapsed
+        if elapsed > stats.slowest_time:
+            stats.slowest_time = elapsed
+            stats.slowest_statement = statement
+    if _slow_query_seconds and elapsed >= _slow_query_seconds:
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            elapsed * 1000,
+            stats.route() if stats is not None else "no request",
+            normalize_sql(statement),
+        )
+
+
+def install_sql_instrumentation(engine: Engine, slow_query_ms: float = 0) -> None:
+    """
+    Attach the statement timing hooks to an engine (idempotent)
+    
+    Args:
+        engine: Sync engine (use `async_engine.sync_engine` for the async one)
+        slow_query_ms: Log statements taking at least this long; 0 disables
+    """
+    global _slow_query_seconds
+    _slow_query_seconds = slow_query_ms / 1000
+    
+    for name, hook in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+    ):
+        if not event.contains(engine, name, hook):
+            event.listen(engine, name, hook)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats for the current request, if one is being tracked"""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries(scope: Optional[dict] = None) -> Iterator[QueryStats]:
+    """
+    Count and time statements executed in this context
+    
+    The stats object is shared (not copied) with tasks and threadpool
+    workers started inside the block, so sync dependencies and
+    `run_in_threadpool` calls are counted too.
+    
+    Args:
+        scope: ASGI scope of the request, used to name its route in the slow-query log
+    """
+    stats = QueryStats(scope)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ============================================================================
+# Auth and serialization timing (Server-Timing only)
+# ============================================================================
+
+def times_auth(dependency):
+    """
+    Add an async dependency's run time to the request's auth time
+    
+    Returns the dependency unchanged when SERVER_TIMING_HEADER is off.
+    """
+    if not settings.SERVER_TIMING_HEADER:
+        return dependency
+    
+    @wraps(dependency)
+    async def timed(*args, **kwargs):
+        started = perf_counter()
+        try:
+            return await dependency(*args, **kwargs)
+        finally:
+            stats = _current_stats.get()
+            if stats is not None:
+                stats.auth_time += perf_counter() - started
+    
+    return timed
+
+
+def _mark_endpoint_done(call):
+    """Wrap an endpoint so it records when it returned, keeping it sync or async"""
+    def done():
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.endpoint_done = perf_counter()
+    
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def timed(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                done()
+    else:
+        @wraps(call)
+        def timed(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                done()
+    
+    return timed
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that measures response serialization for Server-Timing
+    
+    Serialization is the time from the endpoint returning to the response
+    object being ready (response_model validation, JSON encoding). Behaves
+    exactly like APIRoute when SERVER_TIMING_HEADER is off.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if settings.SERVER_TIMING_HEADER:
+            # The request handler looks the call up on every request and
+            # decides sync vs async from the original, which the wrapper keeps
+            self.dependant.call = _mark_endpoint_done(self.dependant.call)
+    
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not settings.SERVER_TIMING_HEADER:
+            return handler
+        
+        async def timed_handler(request):
+            response = await handler(request)
+            stats = _current_stats.get()
+            if stats is not None and stats.endpoint_done:
+                stats.serialize_time += perf_counter() - stats.endpoint_done
+            return response
+        
+        return timed_handler
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+class SqlTimingMiddleware:
+    """
+    ASGI middleware tracking SQL per request
+    
+    Adds `X-Query-Count` and `Server-Timing` when QUERY_COUNT_HEADER and
+    SERVER_TIMING_HEADER are set, and names the route in the slow-query
+    log. Headers are written when the response starts, so a streamed
+    response reports the statements run before its first chunk.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with track_queries(scope) as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = []
+                    if settings.QUERY_COUNT_HEADER:
+                        headers.append(("x-query-count", str(stats.statements)))
+                    if settings.SERVER_TIMING_HEADER:
+                        headers.append(("server-timing", stats.server_timing()))
+                    message = add_response_headers(message, headers)
+                await send(message)
+            
+            await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,280 @@
+"""
+Metrics
+Prometheus-format request, database pool, event loop and cache metrics
+"""
+
+import asyncio
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# How often the event loop lag is sampled (seconds)
+LOOP_LAG_INTERVAL = 0.5
+
+# Route label for requests that matched no route (keeps label values bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram
+    
+    Per-bucket counts are kept and made cumulative only when rendered, so
+    an observation is one bisect and three additions. Requests are
+    observed on the event loop thread only; pool waits may also come from
+    threadpool workers, where a rare lost update is acceptable for
+    monitoring and cheaper than a lock on every checkout.
+    """
+    
+    __slots__ = ("buckets", "counts", "sum", "count")
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+# (method, route, status) -> requests
+_request_counts: Dict[Tuple[str, str, int], int] = {}
+# (method, route) -> latency histogram
+_request_latency: Dict[Tuple[str, str], Histogram] = {}
+# Pool name -> engine, and pool name -> checkout wait histogram
+_engines: Dict[str, Engine] = {}
+_pool_wait: Dict[str, Histogram] = {}
+# Cache name -> object with `hits`, `misses` and `__len__`
+_caches: Dict[str, Any] = {}
+
+_loop_lag = Histogram()
+_loop_lag_last = 0.0
+_loop_monitor: Optional[asyncio.Task] = None
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    """Count a finished request and record its latency"""
+    key = (method, route, status)
+    _request_counts[key] = _request_counts.get(key, 0) + 1
+    histogram = _request_latency.get((method, route))
+    if histogram is None:
+        histogram = _request_latency[(method, route)] = Histogram()
+    histogram.observe(seconds)
+
+
+def register_cache(name: str, cache: Any) -> None:
+    """
+    Report a cache's hit/miss counters and size
+    
+    Args:
+        name: Value of the `cache` label
+        cache: Object with `hits` and `misses` counters and `__len__`
+    """
+    _caches[name] = cache
+
+
+def register_engine(name: str, engine: Engine) -> None:
+    """
+    Report an engine's pool state and connection checkout wait
+    
+    Args:
+        name: Value of the `pool` label
+        engine: Sync engine (use `async_engine.sync_engine` for the async one)
+    """
+    _engines[name] = engine
+    _pool_wait.setdefault(name, Histogram())
+    _instrument_pool(name, engine.pool)
+
+
+def _instrument_pool(name: str, pool) -> None:
+    """Time checkouts of a pool instance (engine.dispose() replaces the pool)"""
+    if getattr(pool, "_staffsync_metrics", False):
+        return
+    do_get = pool._do_get
+    histogram = _pool_wait[name]
+    
+    def timed_do_get():
+        started = perf_counter()
+        try:
+            return do_get()
+        finally:
+            histogram.observe(perf_counter() - started)
+    
+    pool._do_get = timed_do_get
+    pool._staffsync_metrics = True
+
+
+# ============================================================================
+# Event loop lag
+# ============================================================================
+
+async def _monitor_event_loop() -> None:
+    global _loop_lag_last
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + LOOP_LAG_INTERVAL
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        _loop_lag_last = max(0.0, loop.time() - expected)
+        _loop_lag.observe(_loop_lag_last)
+
+
+def start_event_loop_monitor() -> None:
+    """Start sampling event loop lag (call from the running loop, e.g. on startup)"""
+    global _loop_monitor
+    if _loop_monitor is None or _loop_monitor.done():
+        _loop_monitor = asyncio.get_running_loop().create_task(_monitor_event_loop())
+
+
+def stop_event_loop_monitor() -> None:
+    """Stop the lag sampler started by start_event_loop_monitor()"""
+    global _loop_monitor
+    if _loop_monitor is not None:
+        _loop_monitor.cancel()
+        _loop_monitor = None
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts by status and latency per route
+    
+    Routes are labelled with their template (`/api/hr/employees/{employee_id}`),
+    so label values stay bounded. Latency runs until the last body chunk
+    is sent, which for streamed exports includes the whole download.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = perf_counter()
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            observe_request(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                perf_counter() - started,
+            )
+
+
+# ============================================================================
+# Exposition
+# ============================================================================
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, histogram: Histogram, **labels) -> List[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {cumulative}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    suffix = _labels(**labels) if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram.sum}")
+    lines.append(f"{name}_count{suffix} {histogram.count}")
+    return lines
+
+
+def _metric(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def render() -> str:
+    """
+    All metrics in the Prometheus text exposition format (version 0.0.4)
+    
+    Values are per worker process; Prometheus tells workers apart by
+    scrape target, or sum them in queries.
+    """
+    from .security import hash_pool_stats
+    
+    lines: List[str] = []
+    
+    _metric(lines, "staffsync_http_requests_total", "counter", "HTTP requests by route and status")
+    for (method, route, status), count in list(_request_counts.items()):
+        lines.append(f"staffsync_http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+    
+    _metric(lines, "staffsync_http_request_duration_seconds", "histogram", "HTTP request latency by route")
+    for (method, route), histogram in list(_request_latency.items()):
+        lines.extend(_histogram_lines(
+            "staffsync_http_request_duration_seconds", histogram, method=method, route=route
+        ))
+    
+    gauges = {
+        "staffsync_db_pool_size": ("Connections the pool keeps open", "size"),
+        "staffsync_db_pool_checked_out": ("Connections in use", "checkedout"),
+        "staffsync_db_pool_overflow": ("Connections open beyond the pool size", "overflow"),
+    }
+    for metric, (help_text, method_name) in gauges.items():
+        _metric(lines, metric, "gauge", help_text)
+        for name, engine in _engines.items():
+            measure = getattr(engine.pool, method_name, None)
+            if measure is not None:
+                lines.append(f"{metric}{_labels(pool=name)} {max(0, measure())}")
+    
+    _metric(lines, "staffsync_db_pool_wait_seconds", "histogram", "Time to check a connection out of the pool")
+    for name, engine in _engines.items():
+        _instrument_pool(name, engine.pool)
+        lines.extend(_histogram_lines("staffsync_db_pool_wait_seconds", _pool_wait[name], pool=name))
+    
+    _metric(lines, "staffsync_event_loop_lag_seconds", "gauge", "Latest event loop scheduling delay")
+    lines.append(f"staffsync_event_loop_lag_seconds {_loop_lag_last}")
+    _metric(lines, "staffsync_event_loop_lag_samples_seconds", "histogram", "Event loop scheduling delay samples")
+    lines.extend(_histogram_lines("staffsync_event_loop_lag_samples_seconds", _loop_lag))
+    
+    for metric, kind, help_text, attribute in (
+        ("staffsync_cache_hits_total", "counter", "Cache lookups answered from the cache", "hits"),
+        ("staffsync_cache_misses_total", "counter", "Cache lookups that missed", "misses"),
+    ):
+        _metric(lines, metric, kind, help_text)
+        for name, cache in _caches.items():
+            lines.append(f"{metric}{_labels(cache=name)} {getattr(cache, attribute)}")
+    _metric(lines, "staffsync_cache_entries", "gauge", "Entries currently cached")
+    for name, cache in _caches.items():
+        lines.append(f"staffsync_cache_entries{_labels(cache=name)} {len(cache)}")
+    
+    hashing = hash_pool_stats()
+    _metric(lines, "staffsync_password_hash_in_flight", "gauge", "Password hashes running or queued")
+    lines.append(f"staffsync_password_hash_in_flight {hashing['in_flight']}")
+    _metric(lines, "staffsync_password_hash_rejected_total", "counter", "Password hashes rejected with 503")
+    lines.append(f"staffsync_password_hash_rejected_total {hashing['rejected']}")
+    
+    return "\n".join(lines) + "\n"
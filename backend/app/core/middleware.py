@@ -0,0 +1,47 @@
+"""
+ASGI Middleware
+Plain ASGI middleware helpers and the response timing header
+"""
+
+from time import perf_counter
+from typing import Iterable, Tuple
+
+
+def add_response_headers(message: dict, headers: Iterable[Tuple[str, str]]) -> dict:
+    """
+    Return an `http.response.start` message with extra headers appended
+    
+    The original message is left untouched, since inner middleware may
+    still hold a reference to it.
+    """
+    raw = list(message.get("headers", []))
+    raw.extend((name.encode("latin-1"), value.encode("latin-1")) for name, value in headers)
+    return {**message, "headers": raw}
+
+
+class ProcessTimeMiddleware:
+    """
+    Add `X-Process-Time` (seconds until the response starts) to responses
+    
+    A plain ASGI middleware rather than `@app.middleware("http")`: Starlette's
+    BaseHTTPMiddleware runs the app in a separate task and relays the body
+    through a memory stream, which costs time on every request and holds
+    back streamed responses.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        started = perf_counter()
+        
+        async def send_with_process_time(message):
+            if message["type"] == "http.response.start":
+                message = add_response_headers(message, [("x-process-time", str(perf_counter() - started))])
+            await send(message)
+        
+        await self.app(scope, receive, send_with_process_time)
@@ -0,0 +1,163 @@
+"""
+Pagination Utilities
+Opaque keyset (cursor) pagination for list endpoints
+
+A cursor encodes the active sort key name and the sort-column values of
+the last row on the page (the row id is always the final tie-breaker).
+The next page is the rows strictly after those values in sort order, so
+every page costs the same regardless of depth and no OFFSET is used.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Select, String, and_, desc, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def _encode_value(value: Any) -> List[Any]:
+    if value is None:
+        return ["n", None]
+    if isinstance(value, UUID):
+        return ["u", str(value)]
+    if isinstance(value, datetime):
+        return ["t", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, int) and not isinstance(value, bool):
+        return ["i", value]
+    if isinstance(value, float):
+        return ["f", value]
+    return ["s", str(value)]
+
+
+def _decode_value(tagged: List[Any]) -> Any:
+    tag, raw = tagged
+    if tag == "n":
+        return None
+    if tag == "u":
+        return UUID(raw)
+    if tag == "t":
+        return datetime.fromisoformat(raw)
+    if tag == "d":
+        return date.fromisoformat(raw)
+    if tag == "i":
+        return int(raw)
+    if tag == "f":
+        return float(raw)
+    if tag == "s":
+        return str(raw)
+    raise ValueError(f"Unknown cursor tag {tag}")
+
+
+def encode_cursor(key: str, values: Sequence[Any]) -> str:
+    """
+    Encode sort-column values into an opaque cursor
+
+    Args:
+        key: Name of the active sort (cursors are rejected under another sort)
+        values: Sort-column values of the last row, id last
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"k": key, "v": [_encode_value(v) for v in values]}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, key: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor()
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or belongs to another sort
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["k"] != key or len(payload["v"]) != size:
+            raise ValueError("Cursor does not match the requested sort")
+        return [_decode_value(tagged) for tagged in payload["v"]]
+    except (ValueError, KeyError, TypeError, json.JSONDecodeError):
+        raise _invalid_cursor()
+
+
+async def count_rows(db: AsyncSession, stmt: Select) -> int:
+    """Count the rows a SELECT would return, ignoring its ordering"""
+    return await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+
+class Keyset:
+    """
+    Keyset pagination over an ordered set of columns
+
+    Usage:
+        keyset = Keyset(db, "created_at", [User.created_at, Employee.id], descending=True)
+        rows = (await db.execute(keyset.apply(stmt, cursor, page_size))).all()
+        items, next_cursor, has_more = keyset.split(rows, page_size)
+    """
+
+    def __init__(self, db: AsyncSession, key: str, columns: Sequence[Any], descending: bool = True):
+        self.key = key
+        self.descending = descending
+        self.columns = [self._comparable(db, column) for column in columns]
+
+    @staticmethod
+    def _comparable(db: AsyncSession, column):
+        # SQLite stores DateTime as text and server defaults omit the
+        # microseconds SQLAlchemy adds to bound values, so typed comparisons
+        # miss ties. Compare (and encode) the stored text instead; it sorts
+        # exactly like ORDER BY on the column.
+        if db.get_bind().dialect.name == "sqlite" and isinstance(column.type, DateTime):
+            return type_coerce(column, String)
+        return column
+
+    def order_by(self) -> List[Any]:
+        """ORDER BY clauses matching the keyset direction"""
+        return [desc(column) if self.descending else column for column in self.columns]
+
+    def _after(self, values: Sequence[Any]):
+        clauses = []
+        for i, column in enumerate(self.columns):
+            equal = [self.columns[j] == values[j] for j in range(i)]
+            beyond = column < values[i] if self.descending else column > values[i]
+            clauses.append(and_(*equal, beyond))
+        return or_(*clauses)
+
+    def apply(self, stmt: Select, cursor: Optional[str], page_size: int) -> Select:
+        """
+        Restrict, order and limit a statement for one cursor page
+
+        The statement's rows become (entity, *sort values); pass them to split().
+        One extra row is fetched to detect whether another page exists.
+        """
+        if cursor:
+            values = decode_cursor(cursor, self.key, len(self.columns))
+            stmt = stmt.filter(self._after(values))
+
+        labelled = [column.label(f"cursor_{i}") for i, column in enumerate(self.columns)]
+        return stmt.add_columns(*labelled).order_by(None).order_by(*self.order_by()).limit(page_size + 1)
+
+    def split(self, rows: Sequence[Any], page_size: int) -> Tuple[List[Any], Optional[str], bool]:
+        """
+        Split fetched rows into page items and the next cursor
+
+        Returns:
+            (entities, next_cursor, has_more)
+        """
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        items = [row[0] for row in rows]
+        next_cursor = encode_cursor(self.key, list(rows[-1][1:])) if has_more and rows else None
+        return items, next_cursor, has_more
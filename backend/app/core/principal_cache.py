@@ -0,0 +1,86 @@
+"""
+Principal Cache
+Process-local cache of authenticated users for get_current_user
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from ..config import settings
+from ..models.user import User
+
+
+class CachedPrincipal:
+    """Column values of a user plus the id of their employee record"""
+    
+    __slots__ = ("user_fields", "employee_id", "expires_at")
+    
+    def __init__(self, user_fields: Dict[str, Any], employee_id: Optional[UUID], expires_at: float):
+        self.user_fields = user_fields
+        self.employee_id = employee_id
+        self.expires_at = expires_at
+    
+    def to_user(self) -> User:
+        """Build a fresh, session-less User so requests never share an instance"""
+        return User(**self.user_fields)
+
+
+class PrincipalCache:
+    """
+    LRU cache of principals keyed by user id, with a TTL
+    
+    The TTL bounds how stale an entry can get in other worker processes;
+    writes in this process call invalidate() so they take effect at once.
+    Only the event loop thread touches the cache, so it needs no lock.
+    """
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[UUID, CachedPrincipal]" = OrderedDict()
+    
+    def get(self, user_id: UUID) -> Optional[CachedPrincipal]:
+        """Return the cached principal, or None if missing or expired"""
+        principal = self._entries.get(user_id)
+        if principal is None or principal.expires_at <= time.monotonic():
+            if principal is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return principal
+    
+    def put(self, user: User, employee_id: Optional[UUID]) -> CachedPrincipal:
+        """Cache a freshly loaded user and return its principal"""
+        fields = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        principal = CachedPrincipal(fields, employee_id, time.monotonic() + self.ttl)
+        if self.max_size > 0 and self.ttl > 0:
+            self._entries[user.id] = principal
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+    
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop a user's entry after their user or employee row changed"""
+        self._entries.pop(user_id, None)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global principal cache instance
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
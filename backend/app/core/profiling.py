@@ -0,0 +1,275 @@
+"""
+Request Profiling
+On-demand cProfile of a single request, for HR administrators
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from uuid import UUID
+
+from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+from ..config import settings
+from ..database import SessionLocal
+from ..models.user import User, UserRole
+from .middleware import add_response_headers
+from .principal_cache import principal_cache
+from .security import verify_token
+
+# Request header and query parameter that ask for a profile
+PROFILE_HEADER = b"x-profile"
+PROFILE_PARAM = "profile"
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Only one request per process is profiled at a time: the profiler hooks
+# the event loop thread, and a second one would replace the first
+_busy = False
+
+
+class RequestProfile:
+    """
+    Profiles of the work a profiled request hands to threads and processes
+    
+    Shared (not copied) with the tasks and threadpool workers started
+    while the request runs, like the SQL statement counter: each worker
+    call is profiled on its own and added here, then merged with the
+    event loop thread's profile when the request ends.
+    """
+    
+    def __init__(self):
+        self._parts: List[Dict] = []
+        self._lock = threading.Lock()
+    
+    def add(self, stats: Dict) -> None:
+        """Add pstats data (cProfile.Profile.stats after create_stats())"""
+        if stats:
+            with self._lock:
+                self._parts.append(stats)
+    
+    def merged(self, profiler: cProfile.Profile) -> pstats.Stats:
+        """The event loop thread's profile plus every worker part"""
+        stats = pstats.Stats(profiler)
+        with self._lock:
+            parts, self._parts = self._parts, []
+        for part in parts:
+            stats.add(_ProfileData(part))
+        return stats
+
+
+class _ProfileData:
+    """pstats data in the shape Stats.add() loads (a profiler after create_stats)"""
+    
+    def __init__(self, stats: Dict):
+        self.stats = stats
+    
+    def create_stats(self) -> None:
+        pass
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """The profile of the current request, if it is being profiled"""
+    return _current_profile.get()
+
+
+def run_profiled(fn, *args, **kwargs) -> Tuple[Any, Dict]:
+    """Call `fn` under a profiler of its own; returns (result, pstats data)"""
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(fn, *args, **kwargs)
+    finally:
+        profiler.create_stats()
+    return result, profiler.stats
+
+
+def profile_call(fn, *args, **kwargs):
+    """
+    Call `fn` in a worker thread, adding its profile to the current request's
+    
+    Threadpool workers run in a copy of the caller's context, so this
+    sees the profiled request that handed the work over. Other calls
+    cost one context variable lookup.
+    """
+    request_profile = _current_profile.get()
+    if request_profile is None:
+        return fn(*args, **kwargs)
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        profiler.create_stats()
+        request_profile.add(profiler.stats)
+
+
+def _requested(scope) -> bool:
+    """Whether the request carries the profile header or query flag"""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.lower() in (b"1", b"true")
+    query = scope.get("query_string", b"")
+    if b"profile" not in query:
+        return False
+    values = parse_qs(query.decode("latin-1")).get(PROFILE_PARAM, [])
+    return any(value.lower() in ("1", "true") for value in values)
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else None
+    return None
+
+
+def _load_role(user_id: UUID):
+    with SessionLocal() as db:
+        return db.execute(select(User.role, User.is_active).where(User.id == user_id)).first()
+
+
+async def _is_hr_administrator(scope) -> bool:
+    """Check the request's access token belongs to an active HR administrator"""
+    token = _bearer_token(scope)
+    payload = verify_token(token, token_type="access") if token else None
+    if payload is None or payload.get("sub") is None:
+        return False
+    try:
+        user_id = UUID(payload["sub"])
+    except (ValueError, AttributeError):
+        return False
+    
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        role, is_active = principal.user_fields["role"], principal.user_fields["is_active"]
+    else:
+        row = await run_in_threadpool(_load_role, user_id)
+        if row is None:
+            return False
+        role, is_active = row
+    return is_active and role == UserRole.HR_ADMINISTRATOR
+
+
+def _error(status_code: int, code: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": {"success": False, "error": {"code": code, "message": message}}},
+    )
+
+
+# ============================================================================
+# Stored profiles
+# ============================================================================
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """Path of a stored profile, or None if the id is malformed or unknown"""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
+
+
+def profile_text(path: str, limit: int = 60) -> str:
+    """The top functions of a stored profile by cumulative time, as pstats prints them"""
+    stream = io.StringIO()
+    pstats.Stats(path, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def _save(stats: pstats.Stats, profile_id: str) -> None:
+    """Write the profile and drop the oldest ones beyond PROFILE_KEEP"""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    stats.dump_stats(os.path.join(settings.PROFILE_DIR, f"{profile_id}.prof"))
+    
+    stored = sorted(
+        (entry for entry in os.scandir(settings.PROFILE_DIR) if entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in stored[:max(0, len(stored) - settings.PROFILE_KEEP)]:
+        os.remove(entry.path)
+
+
+# ============================================================================
+# Middleware
+# ============================================================================
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling requests sent with `X-Profile: 1` or `?profile=1`
+    
+    Only honoured for HR administrators; anyone else gets 403. The profile
+    covers the request's work on the event loop thread (dependencies,
+    endpoint, serialization) and the work it hands to worker threads and
+    report processes (run_in_sync_session, gather_reads,
+    run_in_report_process, shared export streams), merged into one file
+    under PROFILE_DIR; its id comes back in `X-Profile-Id` for download
+    from `/api/hr/profiles/{id}`. Other requests running on the same
+    worker meanwhile show up in the event loop part, so profile on a
+    quiet worker where possible. A request answered from the response
+    cache, or joining a computation another request started, only shows
+    the lookup or the wait. Requests without the flag only pay for the
+    header scan.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        global _busy
+        
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+        
+        if not await _is_hr_administrator(scope):
+            response = _error(403, "INSUFFICIENT_PERMISSIONS", "Profiling is limited to HR administrators")
+            await response(scope, receive, send)
+            return
+        if _busy:
+            response = _error(409, "PROFILER_BUSY", "Another request is being profiled; retry shortly")
+            await response(scope, receive, send)
+            return
+        
+        profile_id = uuid.uuid4().hex
+        profiler = cProfile.Profile()
+        request_profile = RequestProfile()
+        stopped = False
+        
+        async def finish():
+            # Saved before the last body chunk goes out, so the profile
+            # exists by the time the client sees the complete response
+            global _busy
+            nonlocal stopped
+            if not stopped:
+                stopped = True
+                profiler.disable()
+                _busy = False
+                await run_in_threadpool(_save, request_profile.merged(profiler), profile_id)
+        
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message = add_response_headers(message, [("x-profile-id", profile_id)])
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                await finish()
+            await send(message)
+        
+        _busy = True
+        token = _current_profile.set(request_profile)
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await finish()
+            _current_profile.reset(token)
@@ -0,0 +1,389 @@
+"""
+Response Cache
+Tag-invalidated cache of computed response data, in process or in Redis
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from itertools import chain
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from .conditional import is_ignored_update
+
+try:
+    import redis
+except ImportError:  # optional: pip install redis
+    redis = None
+
+logger = logging.getLogger("staffsync.cache")
+
+# Tag dropped by writes to each table. A tag "name:detail" narrows "name"
+# to one part of the data: an entry tagged "attendance:2024-06-01" only
+# depends on that day, one tagged "attendance" on every day. Invalidating
+# "attendance:2024-06-01" drops both; invalidating "attendance" drops all
+# attendance entries.
+TABLE_TAGS = {
+    "attendance": "attendance",
+    "attendance_rollup": "attendance",
+    "employees": "employees",
+    "users": "employees",
+    "leave_requests": "leave",
+    "announcements": "announcements",
+}
+
+# Date ranges longer than this are tagged "attendance" rather than per day
+MAX_DAY_TAGS = 92
+
+
+def attendance_tags(start_date: date, end_date: date) -> List[str]:
+    """Tags for data read from attendance between two dates (inclusive)"""
+    days = (end_date - start_date).days + 1
+    if days > MAX_DAY_TAGS or days < 1:
+        return ["attendance"]
+    return [f"attendance:{start_date + timedelta(days=offset)}" for offset in range(days)]
+
+
+def _index_tags(tags: Iterable[str]) -> Set[str]:
+    """Tags an entry is filed under: its own, plus "name:*" for each narrowed one"""
+    indexed = set()
+    for tag in tags:
+        indexed.add(tag)
+        name, narrowed, _ = tag.partition(":")
+        if narrowed:
+            indexed.add(f"{name}:*")
+    return indexed
+
+
+def _invalidated_tags(tags: Iterable[str]) -> Set[str]:
+    """Index tags dropped by invalidating `tags` (see TABLE_TAGS)"""
+    dropped = set()
+    for tag in tags:
+        dropped.add(tag)
+        name, narrowed, _ = tag.partition(":")
+        dropped.add(name if narrowed else f"{name}:*")
+    return dropped
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class MemoryBackend:
+    """
+    Process-local LRU with per-entry expiry and a tag -> keys index
+    
+    Locked, since commits (and so invalidations) also happen on
+    threadpool workers. Values are shared by every request that reads
+    them and must be treated as read-only.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float, Set[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+    
+    def set(self, key: str, value: Any, tags: Set[str], ttl: float) -> None:
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate(self, tags: Set[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.pop(tag, ())):
+                    self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Entries stored in Redis as JSON and shared by every worker process
+    
+    Each tag is a Redis set of the keys filed under it, so a commit in one
+    worker drops the entries for all of them. Any server speaking the
+    Redis protocol will do, e.g. a local `redis-server` or Valkey in
+    development. Redis errors are logged and treated as misses; a failed
+    invalidation leaves entries to expire after RESPONSE_CACHE_TTL.
+    """
+    
+    def __init__(self, client, prefix: str = "staffsync:cache:"):
+        self._client = client
+        self._prefix = prefix
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._prefix}tag:{tag}"
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._prefix + key)
+        except redis.RedisError as exc:
+            logger.warning("Response cache read failed: %s", exc)
+            return None
+        return None if raw is None else json.loads(raw)
+    
+    def set(self, key: str, value: Any, tags: Set[str], ttl: float) -> None:
+        ttl = max(1, int(ttl))
+        pipe = self._client.pipeline(transaction=False)
+        pipe.set(self._prefix + key, json.dumps(value), ex=ttl)
+        for tag in tags:
+            # Tag sets live as long as the newest entry filed under them
+            pipe.sadd(self._tag_key(tag), self._prefix + key)
+            pipe.expire(self._tag_key(tag), ttl)
+        try:
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Response cache write failed: %s", exc)
+    
+    def invalidate(self, tags: Set[str]) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        try:
+            # Read and drop the tag sets atomically, then the entries in them
+            pipe = self._client.pipeline(transaction=True)
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            pipe.delete(*tag_keys)
+            members = pipe.execute()[:-1]
+            keys = set().union(*members)
+            if keys:
+                self._client.delete(*keys)
+        except redis.RedisError as exc:
+            logger.warning("Response cache invalidation failed: %s", exc)
+    
+    def clear(self) -> None:
+        try:
+            keys = list(self._client.scan_iter(match=f"{self._prefix}*"))
+            if keys:
+                self._client.delete(*keys)
+        except redis.RedisError as exc:
+            logger.warning("Response cache clear failed: %s", exc)
+    
+    def __len__(self) -> int:
+        # Keys of the whole Redis database, tag sets included: use a
+        # dedicated database index for a meaningful gauge
+        try:
+            return self._client.dbsize()
+        except redis.RedisError:
+            return 0
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ResponseCache:
+    """
+    Cache of endpoint data keyed by name and parameters, dropped by tag
+    
+    Values are stored JSON-encoded (as FastAPI would send them), so both
+    backends return the same thing. Session hooks below invalidate the
+    tags of every committed write. A value computed while one of its tags
+    was invalidated is returned but not stored, so a slow computation
+    that read pre-commit data cannot outlive the commit. Hit and miss
+    counters are approximate when several threads use the cache at once.
+    """
+    
+    def __init__(self, backend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None"""
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot of the invalidation counters of `tags`, taken before computing"""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in sorted(_index_tags(tags)))
+    
+    def set(self, key: str, value: Any, tags: Iterable[str], generation: Optional[Tuple[int, ...]] = None) -> Any:
+        """
+        Store a value and return it JSON-encoded
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+            tags: Tags whose invalidation drops the entry
+            generation: generation() taken before computing the value; the
+                value is not stored if any tag was invalidated since
+        """
+        value = jsonable_encoder(value)
+        if not self.enabled:
+            return value
+        if generation is not None and generation != self.generation(tags):
+            return value
+        self.backend.set(key, value, _index_tags(tags), self.ttl)
+        return value
+    
+    async def get_or_compute(self, key: str, tags: Iterable[str], compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for `key`, or await `compute()` and cache it
+        
+        Args:
+            key: Cache key (name plus every parameter the value depends on)
+            tags: Tags whose invalidation drops the entry
+            compute: Coroutine function building the value
+        
+        Returns:
+            The value, JSON-encoded
+        """
+        if not self.enabled:
+            return await compute()
+        
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation(tags)
+        return self.set(key, await compute(), tags, generation)
+    
+    def get_or_compute_sync(self, key: str, tags: Iterable[str], compute: Callable[[], Any]) -> Any:
+        """get_or_compute() for sync code, e.g. services running in the threadpool"""
+        if not self.enabled:
+            return compute()
+        
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation(tags)
+        return self.set(key, compute(), tags, generation)
+    
+    def invalidate(self, tags: Iterable[str]) -> None:
+        """Drop every entry depending on `tags`"""
+        dropped = _invalidated_tags(tags)
+        with self._lock:
+            for tag in dropped:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+        self.backend.invalidate(dropped)
+    
+    def clear(self) -> None:
+        """Drop all entries"""
+        self.backend.clear()
+    
+    def __len__(self) -> int:
+        return len(self.backend)
+
+
+def _create_backend():
+    if settings.RESPONSE_CACHE_URL:
+        if redis is not None:
+            client = redis.Redis.from_url(settings.RESPONSE_CACHE_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+            return RedisBackend(client)
+        logger.warning("RESPONSE_CACHE_URL is set but the redis package is not installed; caching in process")
+    return MemoryBackend(settings.RESPONSE_CACHE_SIZE)
+
+
+# Global response cache instance
+response_cache = ResponseCache(_create_backend(), ttl=settings.RESPONSE_CACHE_TTL)
+
+
+# ============================================================================
+# Session hooks
+# ============================================================================
+
+def tag_changes(session: Session, tags: Iterable[str]) -> None:
+    """
+    Invalidate `tags` when `session` commits
+    
+    For writes the hooks cannot see in detail, e.g. the days touched by
+    a Core upsert.
+    """
+    session.info.setdefault("cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_tags(session, flush_context):
+    tags = session.info.setdefault("cache_tags", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if is_ignored_update(session, obj):
+            continue
+        state = inspect(obj)
+        for table in state.mapper.tables:
+            if table.name == "attendance":
+                # The old day too, if the record was moved to another date
+                days = chain([obj.date], state.attrs.date.history.deleted)
+                tags.update(f"attendance:{day}" for day in days if day is not None)
+            elif table.name in TABLE_TAGS:
+                tags.add(TABLE_TAGS[table.name])
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement_tags(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        tag = TABLE_TAGS.get(getattr(table, "name", None))
+        if tag is not None:
+            orm_execute_state.session.info.setdefault("cache_statement_tags", set()).add(tag)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("cache_tags", set())
+    # A statement counts as a change to all of its tag unless the same
+    # transaction narrowed it (every attendance write tags its days
+    # through the rollup delta)
+    for tag in session.info.pop("cache_statement_tags", ()):
+        if not any(narrowed.startswith(f"{tag}:") for narrowed in tags):
+            tags.add(tag)
+    if tags and response_cache.enabled:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_tags(session):
+    session.info.pop("cache_tags", None)
+    session.info.pop("cache_statement_tags", None)
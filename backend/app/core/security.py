@@ -3,8 +3,11 @@ Security Utilities
 Password hashing and JWT token management
 """
 
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 import bcrypt
 
@@ -40,6 +43,118 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+# ============================================================================
+# Off-loop Password Hashing
+# ============================================================================
+
+# bcrypt costs tens of milliseconds of CPU per call; run it in a dedicated
+# pool so the event loop keeps serving other requests. Only the event loop
+# thread touches these counters, so they need no lock.
+_hash_executor: Optional[Executor] = None
+_hash_in_flight = 0
+_hash_rejected = 0
+
+
+def _get_hash_executor() -> Executor:
+    """Create the hashing pool on first use"""
+    global _hash_executor
+    if _hash_executor is None:
+        if settings.PASSWORD_HASH_POOL == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash",
+            )
+    return _hash_executor
+
+
+async def _run_in_hash_pool(fn, *args):
+    """
+    Run a hashing function in the pool, shedding load when it is saturated
+    
+    A cancelled caller still counts until its job leaves the pool (a
+    queued job is cancelled with it, a running one finishes).
+    
+    Raises:
+        HTTPException: 503 with Retry-After when PASSWORD_HASH_MAX_PENDING
+            calls are already running or queued
+    """
+    global _hash_in_flight, _hash_rejected
+    if _hash_in_flight >= settings.PASSWORD_HASH_MAX_PENDING:
+        _hash_rejected += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    
+    loop = asyncio.get_running_loop()
+    job = _get_hash_executor().submit(fn, *args)
+    _hash_in_flight += 1
+    # Released when the job ends, not when this caller stops waiting: a
+    # disconnected client's hash keeps its worker busy until it finishes
+    job.add_done_callback(lambda _: _release_hash_slot(loop))
+    return await asyncio.wrap_future(job)
+
+
+def _release_hash_slot(loop: asyncio.AbstractEventLoop) -> None:
+    """Decrement the in-flight count on the event loop thread"""
+    def release():
+        global _hash_in_flight
+        _hash_in_flight -= 1
+    
+    try:
+        loop.call_soon_threadsafe(release)
+    except RuntimeError:
+        pass  # loop already closed (shutdown)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password in the hashing pool (see verify_password)
+    
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
+    """
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password in the hashing pool (see get_password_hash)
+    
+    Raises:
+        HTTPException: 503 if the hashing pool is saturated
+    """
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
+def hash_pool_stats() -> Dict[str, int]:
+    """
+    Current state of the password hashing pool
+    
+    Returns:
+        Worker count, calls in flight, calls queued behind busy workers
+        and calls rejected since startup
+    """
+    workers = settings.PASSWORD_HASH_WORKERS
+    return {
+        "workers": workers,
+        "in_flight": _hash_in_flight,
+        "queue_depth": max(0, _hash_in_flight - workers),
+        "rejected": _hash_rejected,
+    }
+
+
+def shutdown_hash_pool():
+    """Stop the hashing pool's workers"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
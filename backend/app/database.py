@@ -3,23 +3,130 @@ Database Configuration
 SQLAlchemy setup for database connection and session management
 """
 
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from starlette.concurrency import run_in_threadpool
 from .config import settings
 
+logger = logging.getLogger("staffsync.database")
+
+_url = make_url(settings.DATABASE_URL)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
+_SQLITE_IN_MEMORY = IS_SQLITE and _url.database in (None, "", ":memory:")
+
+
+def sqlite_pragmas() -> list:
+    """PRAGMAs run on every new SQLite connection when SQLITE_TUNING is on"""
+    return [
+        # Readers no longer block the writer (or vice versa); persistent in the file
+        "PRAGMA journal_mode=WAL",
+        # Durable across application crashes; only an OS crash can lose the last commits
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_MB * 1024}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_MB * 1024 * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in sqlite_pragmas():
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def apply_sqlite_tuning(sqlite_engine):
+    """Run sqlite_pragmas() on every connection the engine (sync or async) opens"""
+    target = getattr(sqlite_engine, "sync_engine", sqlite_engine)
+    event.listen(target, "connect", _apply_sqlite_pragmas)
+
+
+def _engine_options() -> dict:
+    """
+    Pool settings for the sync engine
+    
+    SQLite connections are local file handles: there is no server to
+    drop them, so no pre-ping, and the default QueuePool size is plenty
+    (the single writer is the limit, not connections). An in-memory
+    database must share one connection across threads.
+    """
+    if not IS_SQLITE:
+        return {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+    if _SQLITE_IN_MEMORY:
+        return {"connect_args": {"check_same_thread": False}, "poolclass": StaticPool}
+    return {"connect_args": {"check_same_thread": False}, "poolclass": QueuePool}
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options())
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """
+    Translate a sync DATABASE_URL to its async driver equivalent
+    
+    sqlite -> sqlite+aiosqlite, postgres(ql) -> postgresql+asyncpg.
+    asyncpg has no `sslmode` parameter, so it is passed on as `ssl`.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend in ("postgres", "postgresql"):
+        query = dict(parsed.query)
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+    return url
+
+
+# Async engine used by the API routes; the sync engine above remains for
+# startup, seed_data.py and the maintenance scripts.
+# aiosqlite would otherwise default to NullPool (a thread per session). In
+# rollback-journal mode SQLite readers and the writer lock each other out,
+# so one connection is best; with WAL, readers proceed alongside the writer.
+if IS_SQLITE:
+    _async_pool_options = {
+        "pool_size": settings.SQLITE_POOL_SIZE if settings.SQLITE_TUNING else 1,
+        "max_overflow": 0,
+    }
+else:
+    _async_pool_options = {"pool_pre_ping": True, "pool_size": 10, "max_overflow": 20}
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    poolclass=AsyncAdaptedQueuePool,
+    **_async_pool_options,
+)
+
+if IS_SQLITE and settings.SQLITE_TUNING:
+    apply_sqlite_tuning(engine)
+    apply_sqlite_tuning(async_engine)
+
+# Objects stay usable after commit; async sessions cannot lazy-refresh them
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -36,6 +143,247 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependency function to get an async database session
+    Yields an AsyncSession and ensures it's closed after use
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def run_in_sync_session(fn, *args, **kwargs):
+    """
+    Run a CPU-heavy sync service function in a worker thread
+    
+    AsyncSession.run_sync() keeps the caller's event loop busy for the
+    Python-side work; this gives `fn` its own sync Session in the
+    threadpool instead, so other requests keep being served meanwhile.
+    
+    Args:
+        fn: Callable taking a Session as its first argument
+    
+    Returns:
+        Whatever `fn` returns
+    """
+    from .core.profiling import profile_call
+    
+    def call():
+        with SessionLocal() as db:
+            return profile_call(fn, db, *args, **kwargs)
+    
+    return await run_in_threadpool(call)
+
+
+# CPU-heavy reports run in worker processes so their Python work does not
+# hold this process's GIL (see run_in_report_process)
+_report_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _report_pool_available() -> bool:
+    # Worker processes cannot see an in-memory database
+    return settings.REPORT_POOL == "process" and not _SQLITE_IN_MEMORY
+
+
+def _get_report_executor() -> ProcessPoolExecutor:
+    """Create the report pool on first use"""
+    global _report_executor
+    if _report_executor is None:
+        # spawn, not fork: the parent has running threads and open connections
+        _report_executor = ProcessPoolExecutor(
+            max_workers=settings.REPORT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _report_executor
+
+
+def _call_with_session(fn, args, kwargs, profile: bool = False):
+    """Worker process side of run_in_report_process; with `profile`, returns (result, pstats data)"""
+    with SessionLocal() as db:
+        if profile:
+            from .core.profiling import run_profiled
+            return run_profiled(fn, db, *args, **kwargs)
+        return fn(db, *args, **kwargs)
+
+
+async def run_in_report_process(fn, *args, **kwargs):
+    """
+    Run a CPU-heavy, read-only sync service function in the report pool
+    
+    A thread (run_in_sync_session) keeps the event loop free during I/O,
+    but pure-Python work still holds the GIL and stalls every request of
+    the worker. Here `fn` runs in a separate process with its own engine
+    and Session; arguments and result are pickled, so both must be plain
+    data. Falls back to run_in_sync_session with REPORT_POOL=thread or an
+    in-memory SQLite database, and if a worker process dies (the pool is
+    then replaced on the next call). Workers are spawned, so they import
+    the parent's __main__: scripts that start the app in-process need an
+    `if __name__ == "__main__":` guard, as run.py has.
+    
+    Args:
+        fn: Module-level callable taking a Session as its first argument
+    
+    Returns:
+        Whatever `fn` returns
+    """
+    if not _report_pool_available():
+        return await run_in_sync_session(fn, *args, **kwargs)
+    
+    from .core.profiling import current_profile
+    
+    # A profiled request gets the worker's profile back with the result
+    request_profile = current_profile()
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            _get_report_executor(),
+            partial(_call_with_session, fn, args, kwargs, request_profile is not None),
+        )
+    except BrokenProcessPool as exc:
+        logger.warning("Report worker died (%s); running %s in a thread", exc, fn.__name__)
+        shutdown_report_pool()
+        return await run_in_sync_session(fn, *args, **kwargs)
+    
+    if request_profile is None:
+        return result
+    result, stats = result
+    request_profile.add(stats)
+    return result
+
+
+def start_report_pool():
+    """Start the report workers now, so the first report does not pay for their imports"""
+    if _report_pool_available():
+        executor = _get_report_executor()
+        for _ in range(settings.REPORT_WORKERS):
+            executor.submit(int)
+
+
+def shutdown_report_pool():
+    """Stop the report workers"""
+    global _report_executor
+    if _report_executor is not None:
+        _report_executor.shutdown(wait=False, cancel_futures=True)
+        _report_executor = None
+
+
+async def gather_reads(*reads, limit: int = None) -> list:
+    """
+    Run independent read-only queries concurrently, each on its own connection
+    
+    Every read gets its own sync Session in the threadpool (as in
+    run_in_sync_session), so the endpoint waits about as long as the
+    slowest one instead of their sum. Sessions come from the sync engine's
+    pool, never the async one the waiting request may be holding a
+    connection of, and at most `limit` are open at once so one request
+    cannot drain the pool. An in-memory SQLite database has a single
+    shared connection, so its reads run one at a time.
+    
+    Args:
+        reads: Callables taking a Session, e.g. `lambda db: db.scalar(stmt)`
+        limit: Most connections used at once (default FANOUT_MAX_CONNECTIONS)
+    
+    Returns:
+        The reads' results, in order
+    """
+    limit = 1 if _SQLITE_IN_MEMORY else (limit or settings.FANOUT_MAX_CONNECTIONS)
+    semaphore = asyncio.Semaphore(max(1, limit))
+    
+    async def run(read):
+        async with semaphore:
+            return await run_in_sync_session(read)
+    
+    return list(await asyncio.gather(*(run(read) for read in reads)))
+
+
+def dialect_insert(db, table):
+    """
+    Build an INSERT that supports ON CONFLICT for the session's dialect
+    
+    Args:
+        db: Session or connection the statement will run on
+        table: Table or mapped class to insert into
+    
+    Returns:
+        Dialect-specific insert construct with `on_conflict_do_update`
+    """
+    bind = db.get_bind() if hasattr(db, "get_bind") else db
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(table)
+
+
+# Alembic project (alembic.ini and alembic/) in the backend directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Revision describing the schema create_all() built before migrations existed
+BASELINE_REVISION = "0001"
+
+# pg_advisory_xact_lock key so concurrently starting workers migrate one at a time
+MIGRATION_LOCK_KEY = 7_143_525_001
+
+
+def schema_diff(conn) -> list:
+    """
+    Differences between the database schema and the models
+    
+    Column types are not compared (SQLite reflects UUID as NUMERIC) and
+    the employee search tables, which are not models, are ignored.
+    
+    Returns:
+        Alembic autogenerate diff entries; empty if the schema matches
+    """
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    
+    context = MigrationContext.configure(conn, opts={"compare_type": False})
+    return [
+        diff for diff in compare_metadata(context, Base.metadata)
+        if not (diff[0] == "remove_table" and diff[1].name.startswith("employee_search"))
+    ]
+
+
+def run_migrations(bind=None):
+    """
+    Upgrade the database to the latest Alembic revision
+    
+    Databases created before migrations existed have no alembic_version
+    table. They are stamped first: at head if their schema already
+    matches the models (e.g. built by create_all() in the benchmarks),
+    otherwise at BASELINE_REVISION so the rollup and index migrations run.
+    
+    Args:
+        bind: Engine to migrate (default: the application engine)
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.attributes["configure_logger"] = False
+    
+    with (bind or engine).begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        elif conn.dialect.name == "sqlite":
+            # Take the write lock up front so a second worker waits here
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+        
+        config.attributes["connection"] = conn
+        tables = inspect(conn).get_table_names()
+        if "users" in tables and "alembic_version" not in tables:
+            command.stamp(config, BASELINE_REVISION if schema_diff(conn) else "head")
+        command.upgrade(config, "head")
+
+
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """Migrate the database to the latest schema and create the employee search index"""
+    run_migrations()
+    
+    from .services.search import ensure_search_index
+    ensure_search_index(engine)
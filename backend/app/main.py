@@ -3,15 +3,18 @@ Main FastAPI Application
 Entry point for the StaffSync backend API
 """
 
-from fastapi import FastAPI, Request, status
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
-import time
+import secrets
 
 from .config import settings
-from .database import init_db
+from .core.middleware import ProcessTimeMiddleware
+from .database import async_engine, engine, init_db, shutdown_report_pool, start_report_pool
 
 # Create FastAPI application
 app = FastAPI(
@@ -32,15 +35,47 @@ app.add_middleware(
 )
 
 
+# Response compression (inside the timing middleware, so X-Process-Time includes it)
+if settings.COMPRESSION_ENABLED:
+    from .core.compression import CompressionMiddleware
+    
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+
 # Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time to response headers"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
+app.add_middleware(ProcessTimeMiddleware)
+
+
+if settings.sql_instrumentation:
+    from .core.instrumentation import SqlTimingMiddleware, install_sql_instrumentation
+    
+    install_sql_instrumentation(engine, settings.SLOW_QUERY_MS)
+    install_sql_instrumentation(async_engine.sync_engine, settings.SLOW_QUERY_MS)
+    app.add_middleware(SqlTimingMiddleware)
+
+
+if settings.PROFILING_ENABLED:
+    from .core.profiling import ProfilingMiddleware
+    
+    app.add_middleware(ProfilingMiddleware)
+
+
+if settings.METRICS_ENABLED:
+    from .core import metrics
+    from .core.principal_cache import principal_cache
+    from .core.response_cache import response_cache
+    
+    metrics.register_engine("sync", engine)
+    metrics.register_engine("async", async_engine.sync_engine)
+    metrics.register_cache("principal", principal_cache)
+    metrics.register_cache("response", response_cache)
+    # Added last, so it wraps (and times) the other middleware
+    app.add_middleware(metrics.MetricsMiddleware)
 
 
 # Global exception handlers
@@ -129,30 +164,77 @@ async def startup_event():
                 print("⚠️ Seed script not found. Please seed manually.")
         else:
             print(f"✅ Database already has {user_count} users")
+        
+        # Backfill the attendance rollup for databases created before it existed
+        from .services.rollup import ensure_rollup
+        if ensure_rollup(db):
+            print("✅ Attendance rollup rebuilt")
     except Exception as e:
         print(f"⚠️ Error checking/seeding database: {e}")
     finally:
         db.close()
     
+    if settings.METRICS_ENABLED:
+        from .core.metrics import start_event_loop_monitor
+        start_event_loop_monitor()
+    
+    start_report_pool()
+    
     print(f"🚀 {settings.APP_NAME} v{settings.APP_VERSION} started")
     print(f"📚 API Documentation: http://{settings.HOST}:{settings.PORT}/docs")
 
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled database connections, the password hashing and report pools"""
+    from .core.metrics import stop_event_loop_monitor
+    from .core.security import shutdown_hash_pool
+    
+    stop_event_loop_monitor()
+    await async_engine.dispose()
+    shutdown_hash_pool()
+    shutdown_report_pool()
+
+
 # Health check endpoint
 @app.get("/api/health", tags=["Health"])
 async def health_check():
     """
     Health check endpoint
-    Returns the API status and version
+    Returns the API status, version and password hashing pool load
     """
+    from .core.security import hash_pool_stats
+    
     return {
         "status": "healthy",
         "app_name": settings.APP_NAME,
         "version": settings.APP_VERSION,
         "database": "connected",
+        "password_hashing": hash_pool_stats(),
     }
 
 
+# Metrics endpoint
+@app.get("/api/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics_endpoint(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus metrics for this worker process
+    Request counts and latency per route, database pool state, event loop lag and cache hit rates
+    Requires METRICS_TOKEN unless DEBUG is on (404 otherwise)
+    """
+    from .core.metrics import render
+    
+    if not settings.METRICS_ENABLED or not (settings.METRICS_TOKEN or settings.DEBUG):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
@@ -6,6 +6,7 @@ SQLAlchemy ORM models for all database tables
 from .user import User
 from .employee import Employee
 from .attendance import Attendance
+from .attendance_rollup import AttendanceRollup
 from .task import Task
 from .document import Document
 from .announcement import Announcement
@@ -16,6 +17,7 @@ __all__ = [
     "User",
     "Employee",
     "Attendance",
+    "AttendanceRollup",
     "Task",
     "Document",
     "Announcement",
@@ -3,7 +3,7 @@ Attendance Model
 Daily attendance records for all employees
 """
 
-from sqlalchemy import Column, Date, Time, Numeric, Text, ForeignKey, Enum, DateTime, UniqueConstraint, CheckConstraint
+from sqlalchemy import Column, Date, Time, Numeric, Text, ForeignKey, Enum, DateTime, UniqueConstraint, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -27,14 +27,14 @@ class Attendance(Base):
     __tablename__ = "attendance"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign Keys
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False, index=True)
+    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     marked_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Attendance Data
-    date = Column(Date, nullable=False, index=True)
+    date = Column(Date, nullable=False)
     check_in = Column(Time, nullable=True)
     check_out = Column(Time, nullable=True)
     hours_worked = Column(Numeric(4, 2), nullable=True)
@@ -44,9 +44,13 @@ class Attendance(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
-    # Constraints
+    # Constraints and indexes
+    # uq_employee_date also serves per-employee history (employee_id = ?
+    # ORDER BY date DESC is a backward scan), so employee_id and date need
+    # no indexes of their own
     __table_args__ = (
         UniqueConstraint('employee_id', 'date', name='uq_employee_date'),
+        Index('ix_attendance_date_status', 'date', 'status'),
     )
     
     # Relationships
@@ -0,0 +1,32 @@
+"""
+Attendance Rollup Model
+Pre-aggregated attendance counts per date, department and status
+"""
+
+from sqlalchemy import Column, String, Date, Integer, Numeric, Enum
+
+from ..database import Base
+from .attendance import AttendanceStatus
+
+
+class AttendanceRollup(Base):
+    """
+    Daily attendance totals keyed by (date, department, status)
+
+    Maintained in the same transaction as every attendance write so trend
+    and summary reads scale with the number of days instead of rows.
+    """
+    
+    __tablename__ = "attendance_rollup"
+    
+    # Composite Primary Key
+    date = Column(Date, primary_key=True)
+    department = Column(String(100), primary_key=True)
+    status = Column(Enum(AttendanceStatus), primary_key=True)
+    
+    # Aggregates
+    record_count = Column(Integer, default=0, nullable=False)
+    hours_worked = Column(Numeric(12, 2), default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<AttendanceRollup(date={self.date}, department={self.department}, status={self.status}, count={self.record_count})>"
@@ -3,7 +3,7 @@ Leave Request Model
 Employee leave requests and approvals
 """
 
-from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey, Enum, DateTime, CheckConstraint
+from sqlalchemy import Column, String, Text, Date, Integer, ForeignKey, Enum, DateTime, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -34,7 +34,7 @@ class LeaveRequest(Base):
     __tablename__ = "leave_requests"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign Keys
     employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -45,7 +45,7 @@ class LeaveRequest(Base):
     end_date = Column(Date, nullable=False, index=True)
     type = Column(Enum(LeaveType), nullable=False)
     reason = Column(Text, nullable=False)
-    status = Column(Enum(LeaveStatus), default=LeaveStatus.PENDING, nullable=False, index=True)
+    status = Column(Enum(LeaveStatus), default=LeaveStatus.PENDING, nullable=False)
     days = Column(Integer, nullable=False)
     notes = Column(Text, nullable=True)
     
@@ -53,10 +53,11 @@ class LeaveRequest(Base):
     submitted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Constraints
+    # Constraints and indexes
     __table_args__ = (
         CheckConstraint('end_date >= start_date', name='check_date_range'),
         CheckConstraint('days > 0', name='check_positive_days'),
+        Index('ix_leave_requests_status_dates', 'status', 'start_date', 'end_date'),
     )
     
     # Relationships
@@ -3,7 +3,7 @@ Notification Model
 Stores notifications sent from HR to employees
 """
 
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -46,6 +46,11 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     read_at = Column(DateTime, nullable=True)
     
+    # Indexes
+    __table_args__ = (
+        Index('ix_notifications_recipient_unread', 'recipient_id', 'is_read', 'created_at'),
+    )
+    
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], backref="sent_notifications")
     recipient = relationship("User", foreign_keys=[recipient_id], backref="received_notifications")
@@ -3,7 +3,7 @@ Task Model
 Task management for employees
 """
 
-from sqlalchemy import Column, String, Text, Date, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, Text, Date, ForeignKey, Enum, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -34,10 +34,10 @@ class Task(Base):
     __tablename__ = "tasks"
     
     # Primary Key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Foreign Keys
-    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False, index=True)
+    employee_id = Column(UUID(as_uuid=True), ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     assigned_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     
     # Task Data
@@ -51,6 +51,11 @@ class Task(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
+    # Indexes
+    __table_args__ = (
+        Index('ix_tasks_employee_status_due', 'employee_id', 'status', 'due_date'),
+    )
+    
     # Relationships
     employee = relationship("Employee", back_populates="tasks")
     assigner = relationship("User", foreign_keys=[assigned_by])
@@ -11,7 +11,12 @@ from .user import (
     TokenResponse,
     TokenRefresh,
 )
-from .response import SuccessResponse, ErrorResponse, PaginatedResponse
+from .response import (
+    SuccessResponse,
+    ErrorResponse,
+    PaginatedResponse,
+    CursorPaginatedResponse,
+)
 from .employee import (
     EmployeeBase,
     EmployeeCreate,
@@ -51,6 +56,7 @@ __all__ = [
     "SuccessResponse",
     "ErrorResponse",
     "PaginatedResponse",
+    "CursorPaginatedResponse",
     "EmployeeBase",
     "EmployeeCreate",
     "EmployeeUpdate",
@@ -4,7 +4,7 @@ Pydantic models for attendance-related requests and responses
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import date, time, datetime
 from decimal import Decimal
 
@@ -40,6 +40,17 @@ class AttendanceMarkManual(AttendanceBase):
         return v
 
 
+class AttendanceBulkMark(BaseModel):
+    """
+    Schema for bulk attendance marking (HR)
+    
+    Entries have the AttendanceMarkManual fields and are validated one by
+    one, so a bad entry is reported in the results instead of failing the
+    whole request.
+    """
+    entries: List[Dict[str, Any]] = Field(..., min_length=1, max_length=5000)
+
+
 class AttendanceResponse(BaseModel):
     """Schema for attendance response"""
     id: str
@@ -50,3 +50,18 @@ class PaginatedResponse(BaseModel, Generic[DataT]):
     """Standard paginated response"""
     success: bool = True
     data: PaginatedData[DataT]
+
+
+class CursorPaginatedData(BaseModel, Generic[DataT]):
+    """Cursor-paginated data container"""
+    items: List[DataT]
+    next_cursor: Optional[str] = None
+    has_more: bool
+    page_size: int
+    total: Optional[int] = None
+
+
+class CursorPaginatedResponse(BaseModel, Generic[DataT]):
+    """Standard cursor-paginated response"""
+    success: bool = True
+    data: CursorPaginatedData[DataT]
@@ -0,0 +1,4 @@
+"""
+Services
+Query and computation helpers shared by the API routes
+"""
@@ -0,0 +1,311 @@
+"""
+Attendance Analytics Engine
+Vectorized per-employee analytics over a date-range slice of attendance
+
+The slice is read once, in chunks, into columnar NumPy arrays and every
+metric is a group-by over those arrays (np.bincount on the employee index
+or the minute of day). Nothing rescans the slice per day or per employee.
+
+Memory per row (final arrays):
+
+    employee index  int32   4 bytes
+    day offset      int32   4 bytes
+    status code     int8    1 byte
+    hours worked    float32 4 bytes
+    check-in min    int16   2 bytes
+    check-out min   int16   2 bytes
+                           --------
+                           17 bytes  ->  ~1.7 MB per 100k rows
+
+While loading, one chunk of `chunk_size` Python row tuples is alive at a
+time, and the final concatenation briefly holds the chunk arrays and the
+result together (~3.4 MB peak per 100k rows). The employee-id map adds one
+dict entry per distinct employee in the slice.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from ..models.user import User
+from ..models.employee import Employee
+from ..models.attendance import Attendance, AttendanceStatus
+from . import rollup
+
+
+DEFAULT_CHUNK_SIZE = 10000
+TOP_PERFORMERS_LIMIT = 10
+ISSUE_RATE_THRESHOLD = 80
+NAME_LOOKUP_BATCH = 900
+
+STATUS_CODES = {status: code for code, status in enumerate(AttendanceStatus)}
+PRESENT_CODES = np.array(
+    [STATUS_CODES[AttendanceStatus.PRESENT], STATUS_CODES[AttendanceStatus.LATE]],
+    dtype=np.int8
+)
+LATE_CODE = STATUS_CODES[AttendanceStatus.LATE]
+NO_TIME = -1
+
+
+class AttendanceFrame:
+    """Columnar attendance slice for one date range"""
+
+    def __init__(self, employee_ids, employee, day, status, hours, check_in, check_out):
+        self.employee_ids = employee_ids  # employee index -> Employee.id
+        self.employee = employee
+        self.day = day
+        self.status = status
+        self.hours = hours
+        self.check_in = check_in
+        self.check_out = check_out
+
+    def __len__(self) -> int:
+        return len(self.employee)
+
+    @property
+    def n_employees(self) -> int:
+        return len(self.employee_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays"""
+        return sum(
+            arr.nbytes for arr in
+            (self.employee, self.day, self.status, self.hours, self.check_in, self.check_out)
+        )
+
+
+def _minute_of_day(value) -> int:
+    return value.hour * 60 + value.minute if value is not None else NO_TIME
+
+
+def load_attendance_frame(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    department: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AttendanceFrame:
+    """
+    Read the attendance rows of a date range into columnar arrays
+
+    Args:
+        db: Database session
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        department: Only employees of this department
+        chunk_size: Rows fetched and converted per batch
+
+    Returns:
+        AttendanceFrame
+    """
+    query = db.query(
+        Attendance.employee_id,
+        Attendance.date,
+        Attendance.status,
+        Attendance.hours_worked,
+        Attendance.check_in,
+        Attendance.check_out
+    ).filter(
+        and_(
+            Attendance.date >= start_date,
+            Attendance.date <= end_date
+        )
+    )
+
+    if department:
+        query = query.join(
+            Employee, Attendance.employee_id == Employee.id
+        ).join(
+            User, Employee.user_id == User.id
+        ).filter(User.department == department)
+
+    index: Dict[Any, int] = {}
+    base = start_date.toordinal()
+    columns = {name: [] for name in ("employee", "day", "status", "hours", "check_in", "check_out")}
+
+    result = db.connection().execute(query.statement.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        n = len(rows)
+        columns["employee"].append(np.fromiter(
+            (index.setdefault(r[0], len(index)) for r in rows), dtype=np.int32, count=n))
+        columns["day"].append(np.fromiter(
+            (r[1].toordinal() - base for r in rows), dtype=np.int32, count=n))
+        columns["status"].append(np.fromiter(
+            (STATUS_CODES[AttendanceStatus(r[2])] for r in rows), dtype=np.int8, count=n))
+        columns["hours"].append(np.fromiter(
+            (float(r[3]) if r[3] is not None else np.nan for r in rows), dtype=np.float32, count=n))
+        columns["check_in"].append(np.fromiter(
+            (_minute_of_day(r[4]) for r in rows), dtype=np.int16, count=n))
+        columns["check_out"].append(np.fromiter(
+            (_minute_of_day(r[5]) for r in rows), dtype=np.int16, count=n))
+
+    dtypes = {"employee": np.int32, "day": np.int32, "status": np.int8,
+              "hours": np.float32, "check_in": np.int16, "check_out": np.int16}
+    arrays = {
+        name: np.concatenate(chunks) if chunks else np.empty(0, dtype=dtypes[name])
+        for name, chunks in columns.items()
+    }
+
+    employee_ids = [None] * len(index)
+    for emp_id, i in index.items():
+        employee_ids[i] = emp_id
+
+    return AttendanceFrame(employee_ids=employee_ids, **arrays)
+
+
+def employee_rates(frame: AttendanceFrame) -> Dict[str, np.ndarray]:
+    """
+    Per-employee totals and attendance rate
+
+    Returns:
+        Arrays indexed by employee index: total, present, late, rate
+    """
+    n = frame.n_employees
+    total = np.bincount(frame.employee, minlength=n)
+    present = np.bincount(frame.employee[np.isin(frame.status, PRESENT_CODES)], minlength=n)
+    late = np.bincount(frame.employee[frame.status == LATE_CODE], minlength=n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(total > 0, present / np.maximum(total, 1) * 100, 0.0)
+    return {"total": total, "present": present, "late": late, "rate": np.round(rate, 1)}
+
+
+def peak_minute(minutes: np.ndarray) -> Optional[str]:
+    """Most common minute of day as HH:MM:00, None when there are no values"""
+    valid = minutes[minutes != NO_TIME]
+    if valid.size == 0:
+        return None
+    peak = int(np.argmax(np.bincount(valid, minlength=24 * 60)))
+    return f"{peak // 60:02d}:{peak % 60:02d}:00"
+
+
+def average_hours(frame: AttendanceFrame) -> float:
+    """Total hours worked divided by employees present in the slice"""
+    if frame.n_employees == 0:
+        return 0
+    return round(float(np.nansum(frame.hours, dtype=np.float64)) / frame.n_employees, 1)
+
+
+def _employee_names(db: Session, employee_ids: Iterable) -> Dict[Any, str]:
+    ids = list(employee_ids)
+    names = {}
+    for i in range(0, len(ids), NAME_LOOKUP_BATCH):
+        batch = ids[i:i + NAME_LOOKUP_BATCH]
+        rows = db.query(Employee.id, User.name).join(
+            User, Employee.user_id == User.id
+        ).filter(Employee.id.in_(batch)).all()
+        names.update(rows)
+    return names
+
+
+def compute_employee_analytics(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    department: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Per-employee section of the HR analytics payload
+
+    Returns:
+        top_performers, attendance_issues, average_hours_per_employee and
+        peak_hours in the `/api/hr/analytics` shape
+    """
+    frame = load_attendance_frame(db, start_date, end_date, department)
+    stats = employee_rates(frame)
+    total, present, late, rate = stats["total"], stats["present"], stats["late"], stats["rate"]
+
+    # Highest rate first, more recorded days breaks ties
+    top_idx = np.lexsort((-total, -rate))[:TOP_PERFORMERS_LIMIT]
+    # Lowest rate first
+    issue_idx = np.flatnonzero(rate < ISSUE_RATE_THRESHOLD)
+    issue_idx = issue_idx[np.argsort(rate[issue_idx], kind="stable")]
+
+    names = _employee_names(db, {frame.employee_ids[i] for i in np.concatenate([top_idx, issue_idx])})
+
+    top_performers: List[Dict[str, Any]] = []
+    for i in top_idx:
+        emp_id = frame.employee_ids[i]
+        top_performers.append({
+            "employee_id": str(emp_id),
+            "name": names.get(emp_id),
+            "attendance_rate": float(rate[i]),
+            "total_days": int(total[i])
+        })
+
+    attendance_issues: List[Dict[str, Any]] = []
+    for i in issue_idx:
+        emp_id = frame.employee_ids[i]
+        attendance_issues.append({
+            "employee_id": str(emp_id),
+            "name": names.get(emp_id),
+            "absent_days": int(total[i] - present[i]),
+            "late_days": int(late[i])
+        })
+
+    return {
+        "top_performers": top_performers,
+        "attendance_issues": attendance_issues,
+        "average_hours_per_employee": average_hours(frame),
+        "peak_hours": {
+            "check_in": peak_minute(frame.check_in) or "09:00:00",
+            "check_out": peak_minute(frame.check_out) or "18:00:00"
+        }
+    }
+
+
+def hr_analytics_report(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    department: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    The whole `/api/hr/analytics` payload
+
+    Plain data in and out, so it can run in the report process pool
+    (run_in_report_process) as well as in a thread.
+    """
+    daily = rollup.daily_totals(db, start_date, end_date, department)
+    departments = rollup.department_totals(db, start_date, end_date)
+
+    # Attendance trends (daily)
+    attendance_trends = []
+    current_date = start_date
+    while current_date <= end_date:
+        total_count, present_count, _hours = daily.get(current_date, (0, 0, 0))
+        rate = round((present_count / total_count * 100) if total_count > 0 else 0, 1)
+        attendance_trends.append({
+            "date": current_date.isoformat(),
+            "rate": rate
+        })
+        current_date += timedelta(days=1)
+
+    # Department comparison
+    department_comparison = []
+    for dept, total, present in departments:
+        rate = round((present / total * 100) if total > 0 else 0, 1)
+        department_comparison.append({
+            "department": dept,
+            "attendance_rate": rate
+        })
+
+    # Top performers, attendance issues, average hours and peak times
+    employee_analytics = compute_employee_analytics(db, start_date, end_date, department)
+
+    return {
+        "attendance_trends": attendance_trends,
+        "department_comparison": department_comparison,
+        "top_performers": employee_analytics["top_performers"],
+        "attendance_issues": employee_analytics["attendance_issues"],
+        "leave_patterns": {
+            "sick_leave": 0,  # Will be implemented with leave requests
+            "vacation": 0,
+            "personal": 0
+        },
+        "average_hours_per_employee": employee_analytics["average_hours_per_employee"],
+        "peak_hours": employee_analytics["peak_hours"]
+    }
@@ -0,0 +1,288 @@
+"""
+Attendance Writes
+Upserts against the (employee_id, date) unique key: check-in/check-out and HR bulk marking
+
+All functions run inside the caller's transaction and update the
+attendance rollup alongside the rows; the caller commits.
+"""
+
+import uuid
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Numeric, Time, and_, cast, func, literal, select, tuple_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..database import dialect_insert
+from ..models.user import User
+from ..models.employee import Employee
+from ..models.attendance import Attendance, AttendanceStatus
+from . import rollup
+
+
+# Check-ins after this time are marked late
+LATE_THRESHOLD = dt_time(9, 30, 0)
+
+# Rows per pre-read and upsert chunk (bounds the tuple IN list)
+BULK_CHUNK_SIZE = 500
+
+RETURNED_COLUMNS = (
+    Attendance.id,
+    Attendance.date,
+    Attendance.check_in,
+    Attendance.check_out,
+    Attendance.hours_worked,
+    Attendance.status,
+)
+
+
+def status_for_check_in(check_in: dt_time) -> AttendanceStatus:
+    """PRESENT, or LATE when checking in after LATE_THRESHOLD"""
+    return AttendanceStatus.LATE if check_in > LATE_THRESHOLD else AttendanceStatus.PRESENT
+
+
+def hours_between(day: date, check_in: Optional[dt_time], check_out: Optional[dt_time]) -> Optional[Decimal]:
+    """
+    Hours worked for a check-in/check-out pair, None unless both are set
+
+    Rounded to the column's two decimals so rollup deltas match what the
+    database stores.
+    """
+    if not (check_in and check_out):
+        return None
+    worked = datetime.combine(day, check_out) - datetime.combine(day, check_in)
+    return Decimal(worked.total_seconds() / 3600).quantize(Decimal("0.01"))
+
+
+def hours_since_check_in(db: Session, check_out: dt_time):
+    """
+    SQL expression for the hours between a row's check_in and `check_out`
+
+    Computed by the database so check-out needs no prior read of check_in.
+    """
+    end = literal(check_out, Time())
+    if db.get_bind().dialect.name == "postgresql":
+        seconds = func.extract("epoch", end - Attendance.check_in)
+        return func.round(cast(seconds / 3600, Numeric), 2)
+    return func.round((func.julianday(end) - func.julianday(Attendance.check_in)) * 24, 2)
+
+
+def _today_filter(employee_id, day: date):
+    return and_(Attendance.employee_id == employee_id, Attendance.date == day)
+
+
+def current_department(db: Session, employee_id) -> str:
+    """
+    The employee's department as of this transaction, for rollup deltas
+
+    Call after the attendance write: on SQLite the transaction then holds
+    the write lock, and on PostgreSQL the user row is share-locked, so a
+    concurrent department change (which updates users before moving the
+    history) either already counted this row or has not committed yet.
+    Never take it from the principal cache: a stale department would be
+    booked into the rollup for good.
+    """
+    return db.execute(
+        select(User.department)
+        .join(Employee, Employee.user_id == User.id)
+        .where(Employee.id == employee_id)
+        .with_for_update(read=True, of=User)
+    ).scalar_one()
+
+
+def check_in(db: Session, employee_id, day: date, now: dt_time) -> Optional[Row]:
+    """
+    Record a check-in with INSERT ... ON CONFLICT (employee_id, date)
+
+    The common case (no row for today yet) is one statement. If a row
+    already exists without a check-in (e.g. marked absent by HR) it is
+    claimed with a guarded UPDATE, so concurrent clicks can neither
+    violate uq_employee_date nor check in twice.
+
+    Args:
+        db: Database session
+        employee_id: Employee primary key
+        day: Attendance date
+        now: Check-in time
+
+    Returns:
+        The attendance row (RETURNED_COLUMNS), or None if already checked in
+    """
+    status_value = status_for_check_in(now)
+
+    stmt = dialect_insert(db, Attendance).values(
+        id=uuid.uuid4(),
+        employee_id=employee_id,
+        date=day,
+        check_in=now,
+        status=status_value,
+    )
+    stmt = stmt.on_conflict_do_nothing(
+        index_elements=[Attendance.employee_id, Attendance.date]
+    ).returning(*RETURNED_COLUMNS)
+    row = db.execute(stmt).first()
+    if row is not None:
+        rollup.record_attendance_change(
+            db, current_department(db, employee_id), None, (day, status_value, Decimal(0))
+        )
+        return row
+
+    # ON CONFLICT ... DO UPDATE cannot return the replaced status, which the
+    # rollup needs, so an existing row is read and then updated only if unchanged
+    existing = db.execute(
+        select(Attendance.status, Attendance.hours_worked).where(
+            _today_filter(employee_id, day),
+            Attendance.check_in.is_(None),
+        )
+    ).first()
+    if existing is None:
+        return None
+
+    row = db.execute(
+        update(Attendance)
+        .where(
+            _today_filter(employee_id, day),
+            Attendance.check_in.is_(None),
+            Attendance.status == existing.status,
+        )
+        .values(check_in=now, status=status_value)
+        .returning(*RETURNED_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is not None:
+        hours = Decimal(str(existing.hours_worked or 0))
+        rollup.record_attendance_change(
+            db, current_department(db, employee_id), (day, existing.status, hours), (day, status_value, hours)
+        )
+    return row
+
+
+def check_out(db: Session, employee_id, day: date, now: dt_time) -> Optional[Row]:
+    """
+    Record a check-out with a single UPDATE ... RETURNING
+
+    hours_worked is computed in SQL from the stored check_in. A row without
+    a check-out has no hours yet, so the rollup delta is just the new hours.
+
+    Args:
+        db: Database session
+        employee_id: Employee primary key
+        day: Attendance date
+        now: Check-out time
+
+    Returns:
+        The attendance row (RETURNED_COLUMNS), or None if not checked in
+        or already checked out
+    """
+    row = db.execute(
+        update(Attendance)
+        .where(
+            _today_filter(employee_id, day),
+            Attendance.check_in.isnot(None),
+            Attendance.check_out.is_(None),
+        )
+        .values(check_out=now, hours_worked=hours_since_check_in(db, now))
+        .returning(*RETURNED_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is not None:
+        rollup.record_attendance_change(
+            db, current_department(db, employee_id), (day, row.status, Decimal(0)), (day, row.status, row.hours_worked)
+        )
+    return row
+
+
+def find_employee_departments(db: Session, employee_ids) -> Dict[uuid.UUID, str]:
+    """Map each existing employee id to its department in one query"""
+    if not employee_ids:
+        return {}
+    rows = db.execute(
+        select(Employee.id, User.department)
+        .join(User, Employee.user_id == User.id)
+        .where(Employee.id.in_(employee_ids))
+    ).all()
+    return {employee_id: department for employee_id, department in rows}
+
+
+def bulk_upsert(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    departments: Dict[uuid.UUID, str],
+    marked_by
+) -> Dict[Tuple[uuid.UUID, date], Tuple[uuid.UUID, bool]]:
+    """
+    Insert or overwrite attendance rows in chunked multi-row upserts
+
+    Each chunk reads (and on PostgreSQL locks) the existing rows it is
+    about to replace, for the rollup, then runs one INSERT ... ON CONFLICT (employee_id, date)
+    DO UPDATE ... RETURNING. Rollup changes for all chunks are flushed
+    as a single upsert at the end.
+
+    Args:
+        db: Database session
+        rows: Validated rows with employee_id (UUID), date, status
+            (AttendanceStatus), check_in, check_out and notes; at most one
+            row per (employee_id, date)
+        departments: Department of every employee in `rows`
+        marked_by: User id recorded as the marker
+
+    Returns:
+        {(employee_id, date): (attendance id, created)}
+    """
+    delta = rollup.RollupDelta()
+    written = {}
+
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_CHUNK_SIZE]
+        keys = [(row["employee_id"], row["date"]) for row in chunk]
+
+        existing = {
+            (employee_id, day): (status_value, hours)
+            for employee_id, day, status_value, hours in db.execute(
+                select(Attendance.employee_id, Attendance.date, Attendance.status, Attendance.hours_worked)
+                .where(tuple_(Attendance.employee_id, Attendance.date).in_(keys))
+                .with_for_update()
+            )
+        }
+
+        values = []
+        for row in chunk:
+            hours = hours_between(row["date"], row["check_in"], row["check_out"])
+            values.append({
+                "id": uuid.uuid4(),
+                "employee_id": row["employee_id"],
+                "date": row["date"],
+                "check_in": row["check_in"],
+                "check_out": row["check_out"],
+                "hours_worked": hours,
+                "status": row["status"],
+                "notes": row["notes"],
+                "marked_by": marked_by,
+            })
+
+            key = (row["employee_id"], row["date"])
+            before = existing.get(key)
+            department = departments[row["employee_id"]]
+            if before is not None:
+                delta.record(department, (key[1], before[0], Decimal(str(before[1] or 0))), None)
+            delta.record(department, None, (key[1], row["status"], Decimal(str(hours or 0))))
+
+        # executemany on the Core table, which SQLAlchemy sends as multi-row
+        # VALUES batches ("insertmanyvalues") while compiling the statement once
+        table = Attendance.__table__
+        stmt = dialect_insert(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["employee_id", "date"],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("check_in", "check_out", "hours_worked", "status", "notes", "marked_by")
+            }
+        ).returning(table.c.id, table.c.employee_id, table.c.date)
+
+        for attendance_id, employee_id, day in db.execute(stmt, values):
+            written[(employee_id, day)] = (attendance_id, (employee_id, day) not in existing)
+
+    delta.flush(db)
+    return written
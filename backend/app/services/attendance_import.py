@@ -0,0 +1,266 @@
+"""
+Attendance Import
+Streams badge-reader swipes (CSV or NDJSON) into attendance rows
+
+Swipes are parsed one line at a time and folded into per-(employee, day)
+first/last times. The buffer is written out every `batch_size` keys, so
+memory stays bounded however large the file is. A key seen again in a
+later batch is merged with the row already stored: check-in is the
+earliest swipe and check-out the latest. Status is LATE when the
+check-in is after LATE_THRESHOLD, PRESENT otherwise.
+
+Input columns: `employee_id` (the EMP-... code) and either `timestamp`
+(ISO 8601) or separate `date` and `time` columns.
+"""
+
+import csv
+import io
+import json
+import time
+import uuid
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from ..database import dialect_insert
+from ..models.user import User
+from ..models.employee import Employee
+from ..models.attendance import Attendance
+from . import rollup
+from .attendance import hours_between, status_for_check_in
+
+
+FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 2000
+
+# Rejected rows kept in the report (the count is always exact)
+MAX_REPORTED_REJECTIONS = 100
+
+# (employee uuid, day) -> [first swipe, last swipe]
+SwipeBuffer = Dict[Tuple[uuid.UUID, date], List[dt_time]]
+
+
+class ImportReport:
+    """Counters and a sample of rejected rows for one import"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.swipes_accepted = 0
+        self.rejected = 0
+        self.attendance_created = 0
+        self.attendance_updated = 0
+        self.batches = 0
+        self.rejections: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def reject(self, line: int, reason: str):
+        self.rejected += 1
+        if len(self.rejections) < MAX_REPORTED_REJECTIONS:
+            self.rejections.append({"line": line, "reason": reason})
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "rows_read": self.rows_read,
+            "swipes_accepted": self.swipes_accepted,
+            "rejected": self.rejected,
+            "attendance_created": self.attendance_created,
+            "attendance_updated": self.attendance_updated,
+            "batches": self.batches,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_read / self.elapsed) if self.elapsed else 0,
+            "rejections": self.rejections,
+        }
+
+
+def load_employee_codes(db: Session) -> Dict[str, Tuple[uuid.UUID, str]]:
+    """Map every EMP-... code to (employee uuid, department) in one query"""
+    rows = db.execute(
+        select(Employee.employee_id, Employee.id, User.department)
+        .join(User, Employee.user_id == User.id)
+    ).all()
+    return {code: (employee_id, department) for code, employee_id, department in rows}
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (line number, record) pairs from CSV or NDJSON text lines
+
+    A record is a dict, or an error message string for lines that cannot
+    be parsed at all.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, "Invalid JSON"
+            continue
+        yield line_number, record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def parse_swipe(record: Dict[str, Any]) -> datetime:
+    """Swipe time from a `timestamp` or `date` + `time` record (raises ValueError)"""
+    timestamp = record.get("timestamp")
+    if timestamp:
+        swiped_at = datetime.fromisoformat(str(timestamp).strip())
+    elif record.get("date") and record.get("time"):
+        swiped_at = datetime.combine(
+            date.fromisoformat(str(record["date"]).strip()),
+            dt_time.fromisoformat(str(record["time"]).strip()),
+        )
+    else:
+        raise ValueError("Missing timestamp (or date and time)")
+    # Badge readers report local wall-clock time; drop any offset like check-in does
+    return swiped_at.replace(tzinfo=None)
+
+
+def _flush(db: Session, buffer: SwipeBuffer, departments: Dict[uuid.UUID, str], report: ImportReport):
+    """Merge a batch of first/last swipes into attendance and commit it"""
+    keys = list(buffer)
+    existing = {
+        (employee_id, day): (check_in, check_out, status_value, hours)
+        for employee_id, day, check_in, check_out, status_value, hours in db.execute(
+            select(
+                Attendance.employee_id, Attendance.date, Attendance.check_in,
+                Attendance.check_out, Attendance.status, Attendance.hours_worked
+            )
+            .where(tuple_(Attendance.employee_id, Attendance.date).in_(keys))
+            .with_for_update()
+        )
+    }
+
+    delta = rollup.RollupDelta()
+    values = []
+    for key, (first, last) in buffer.items():
+        employee_id, day = key
+        swipes = [first, last]
+        before = existing.get(key)
+        if before is not None:
+            swipes += [t for t in before[:2] if t is not None]
+        check_in, check_out = min(swipes), max(swipes)
+        if check_out == check_in:
+            check_out = None
+
+        status_value = status_for_check_in(check_in)
+        hours = hours_between(day, check_in, check_out)
+        values.append({
+            "id": uuid.uuid4(),
+            "employee_id": employee_id,
+            "date": day,
+            "check_in": check_in,
+            "check_out": check_out,
+            "hours_worked": hours,
+            "status": status_value,
+        })
+
+        department = departments[employee_id]
+        if before is not None:
+            delta.record(department, (day, before[2], Decimal(str(before[3] or 0))), None)
+            report.attendance_updated += 1
+        else:
+            report.attendance_created += 1
+        delta.record(department, None, (day, status_value, Decimal(str(hours or 0))))
+
+    # executemany on the Core table: the statement is compiled once and
+    # the driver batches the parameter sets
+    stmt = dialect_insert(db, Attendance.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["employee_id", "date"],
+        set_={
+            column: stmt.excluded[column]
+            for column in ("check_in", "check_out", "hours_worked", "status")
+        }
+    )
+    db.execute(stmt, values)
+    delta.flush(db)
+    db.commit()
+
+    report.batches += 1
+    buffer.clear()
+
+
+def import_swipes(
+    db: Session,
+    lines: Iterable[str],
+    fmt: str = "csv",
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> ImportReport:
+    """
+    Import badge swipes, committing one transaction per batch
+
+    Args:
+        db: Database session (committed after every batch)
+        lines: Text lines of the file, read lazily
+        fmt: "csv" or "ndjson"
+        batch_size: (employee, day) keys buffered before each upsert
+
+    Returns:
+        ImportReport with throughput and rejected rows
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    report = ImportReport()
+    codes = load_employee_codes(db)
+    departments = {employee_id: department for employee_id, department in codes.values()}
+    today = date.today()
+    buffer: SwipeBuffer = {}
+
+    for line_number, record in iter_records(lines, fmt):
+        report.rows_read += 1
+        if isinstance(record, str):
+            report.reject(line_number, record)
+            continue
+
+        code = str(record.get("employee_id") or "").strip()
+        employee = codes.get(code)
+        if employee is None:
+            report.reject(line_number, f"Unknown employee ID: {code or '(empty)'}")
+            continue
+
+        try:
+            swiped_at = parse_swipe(record)
+        except ValueError as e:
+            report.reject(line_number, f"Invalid timestamp: {e}")
+            continue
+        if swiped_at.date() > today:
+            report.reject(line_number, "Swipe is in the future")
+            continue
+
+        key = (employee[0], swiped_at.date())
+        swipe = swiped_at.time()
+        times = buffer.get(key)
+        if times is None:
+            buffer[key] = [swipe, swipe]
+        else:
+            times[0] = min(times[0], swipe)
+            times[1] = max(times[1], swipe)
+        report.swipes_accepted += 1
+
+        if len(buffer) >= batch_size:
+            _flush(db, buffer, departments, report)
+
+    if buffer:
+        _flush(db, buffer, departments, report)
+
+    report.finish()
+    return report
+
+
+def text_lines(binary_file, encoding: str = "utf-8-sig") -> io.TextIOWrapper:
+    """Wrap a binary file object so it can be read line by line as text"""
+    return io.TextIOWrapper(binary_file, encoding=encoding, newline="")
@@ -0,0 +1,222 @@
+"""
+Dashboard Aggregation
+Computes HR dashboard statistics with grouped SQL aggregates and the attendance rollup
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import and_, desc, func
+from sqlalchemy.orm import Session
+
+from ..core.response_cache import response_cache
+from ..database import gather_reads
+from ..models.user import User
+from ..models.employee import Employee, EmployeeStatus
+from ..models.attendance import Attendance
+from ..models.leave_request import LeaveRequest, LeaveStatus
+from . import rollup
+
+
+TREND_MONTHS = 6
+RECENT_ACTIVITY_LIMIT = 10
+
+
+def month_starts(today: date, count: int) -> List[date]:
+    """
+    First day of the last `count` calendar months, oldest first
+
+    Args:
+        today: Reference date (its month is the last one returned)
+        count: Number of months
+
+    Returns:
+        List of month start dates
+    """
+    starts = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        starts.append(date(year, month, 1))
+        month -= 1
+        if month == 0:
+            month = 12
+            year -= 1
+    starts.reverse()
+    return starts
+
+
+def next_month(month_start: date) -> date:
+    """Return the first day of the month after `month_start`"""
+    return (month_start + timedelta(days=32)).replace(day=1)
+
+
+def _rate(present: int, total: int) -> float:
+    """Percentage rounded to one decimal, 0 when there is nothing to count"""
+    return round((present / total * 100) if total > 0 else 0, 1)
+
+
+def get_headline_counts(db: Session, today: date) -> Dict[str, int]:
+    """
+    Employee and leave counters in a single statement
+
+    Each counter is a scalar subquery so the database evaluates all of
+    them in one round-trip.
+    """
+    total_employees = db.query(func.count(Employee.id)).scalar_subquery()
+    active_employees = db.query(func.count(Employee.id)).filter(
+        Employee.status == EmployeeStatus.ACTIVE
+    ).scalar_subquery()
+    pending_leave_requests = db.query(func.count()).select_from(LeaveRequest).filter(
+        LeaveRequest.status == LeaveStatus.PENDING
+    ).scalar_subquery()
+    approved_leaves_today = db.query(func.count()).select_from(LeaveRequest).filter(
+        and_(
+            LeaveRequest.status == LeaveStatus.APPROVED,
+            LeaveRequest.start_date <= today,
+            LeaveRequest.end_date >= today
+        )
+    ).scalar_subquery()
+
+    row = db.query(
+        total_employees.label("total_employees"),
+        active_employees.label("active_employees"),
+        pending_leave_requests.label("pending_leave_requests"),
+        approved_leaves_today.label("approved_leaves_today"),
+    ).one()
+
+    return {key: int(value or 0) for key, value in row._mapping.items()}
+
+
+def get_department_distribution(db: Session) -> Dict[str, int]:
+    """
+    Employee headcount per department
+
+    Cached until employees change, so it survives the attendance writes
+    that invalidate the rest of the dashboard.
+    """
+    def count_by_department():
+        rows = db.query(
+            User.department,
+            func.count(Employee.id).label('count')
+        ).join(Employee, User.id == Employee.user_id).group_by(User.department).all()
+        return {dept: count for dept, count in rows}
+
+    return response_cache.get_or_compute_sync("department_distribution", ("employees",), count_by_department)
+
+
+def get_monthly_trend(db: Session, today: date, months: int = TREND_MONTHS) -> List[Dict[str, Any]]:
+    """
+    Attendance rate per calendar month, read from the attendance rollup
+    """
+    starts = month_starts(today, months)
+    by_month = rollup.monthly_totals(db, starts[0], next_month(starts[-1]) - timedelta(days=1))
+
+    trend = []
+    for month_start in starts:
+        total, present = by_month.get((month_start.year, month_start.month), (0, 0))
+        trend.append({
+            "month": month_start.strftime("%b %Y"),
+            "rate": _rate(present, total)
+        })
+    return trend
+
+
+def get_recent_checkins(db: Session, limit: int = RECENT_ACTIVITY_LIMIT) -> List[Dict[str, Any]]:
+    """
+    Latest attendance records with a check-in, employee name included
+
+    Selects the name column in the same statement instead of walking
+    `attendance.employee.user` per row.
+    """
+    rows = db.query(
+        Attendance.id,
+        Attendance.check_in,
+        Attendance.created_at,
+        User.name
+    ).join(
+        Employee, Attendance.employee_id == Employee.id
+    ).join(
+        User, Employee.user_id == User.id
+    ).order_by(desc(Attendance.created_at)).limit(limit).all()
+
+    activities = []
+    for att_id, check_in, created_at, employee_name in rows:
+        if check_in:
+            activities.append({
+                "id": str(att_id),
+                "type": "attendance",
+                "description": f"{employee_name} checked in",
+                "timestamp": created_at.isoformat()
+            })
+    return activities
+
+
+def _dashboard_payload(
+    headline: Dict[str, int],
+    attendance_stats: Dict[str, int],
+    departments: Dict[str, int],
+    trend: List[Dict[str, Any]],
+    recent: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Assemble the dashboard payload from the results of the reads above"""
+    total_employees = headline["total_employees"]
+    active_employees = headline["active_employees"]
+
+    # Today's attendance
+    total_marked = sum(attendance_stats.values())
+    present_today = attendance_stats["present"] + attendance_stats["late"]
+    attendance_stats["attendance_rate"] = _rate(present_today, total_marked)
+
+    # Current month's average: (Present Today + Late Today) / Total Employees * 100
+    monthly_attendance_avg = _rate(present_today, total_employees)
+
+    return {
+        "total_employees": total_employees,
+        "active_employees": active_employees,
+        "inactive_employees": total_employees - active_employees,
+        "today_attendance": attendance_stats,
+        "pending_leave_requests": headline["pending_leave_requests"],
+        "approved_leaves_today": headline["approved_leaves_today"],
+        "departments": departments,
+        "monthly_attendance_trend": trend,
+        "monthly_attendance_avg": monthly_attendance_avg,
+        "recent_activities": recent,
+    }
+
+
+def compute_dashboard_stats(db: Session, today: date = None) -> Dict[str, Any]:
+    """
+    Build the HR dashboard payload
+
+    Args:
+        db: Database session
+        today: Reference date (default: today)
+
+    Returns:
+        Dashboard statistics in the `/api/hr/dashboard/stats` shape
+    """
+    today = today or date.today()
+    return _dashboard_payload(
+        get_headline_counts(db, today),
+        rollup.status_counts(db, today, today),
+        get_department_distribution(db),
+        get_monthly_trend(db, today),
+        get_recent_checkins(db),
+    )
+
+
+async def gather_dashboard_stats(today: date = None) -> Dict[str, Any]:
+    """
+    compute_dashboard_stats() with its independent reads run concurrently
+
+    Each read gets its own session and connection (see gather_reads), so
+    the dashboard takes about as long as its slowest read.
+    """
+    today = today or date.today()
+    return _dashboard_payload(*await gather_reads(
+        lambda db: get_headline_counts(db, today),
+        lambda db: rollup.status_counts(db, today, today),
+        get_department_distribution,
+        lambda db: get_monthly_trend(db, today),
+        get_recent_checkins,
+    ))
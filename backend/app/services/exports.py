@@ -0,0 +1,205 @@
+"""
+Exports
+Streams attendance, employee and leave data as CSV or NDJSON
+
+Rows are read through a server-side cursor (`yield_per`, which turns on
+`stream_results`) and encoded one partition at a time, so memory stays
+bounded whatever the date range and the first bytes go out before the
+query has finished. The generators are synchronous and open their own
+Session; StreamingResponse iterates them in the threadpool.
+"""
+
+import csv
+import enum
+import io
+import json
+import uuid
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import Select, select
+
+from ..database import SessionLocal
+from ..models.user import User
+from ..models.employee import Employee
+from ..models.attendance import Attendance
+from ..models.leave_request import LeaveRequest
+
+
+FORMATS = ("csv", "ndjson")
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched from the cursor and encoded per chunk sent to the client
+STREAM_BATCH_ROWS = 1000
+
+
+def attendance_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    department: Optional[str] = None
+) -> Select:
+    """Attendance rows with employee code, name and department, oldest first"""
+    query = select(
+        Attendance.id,
+        Employee.employee_id.label("employee_code"),
+        User.name,
+        User.department,
+        Attendance.date,
+        Attendance.check_in,
+        Attendance.check_out,
+        Attendance.hours_worked,
+        Attendance.status,
+        Attendance.notes,
+    ).join(
+        Employee, Attendance.employee_id == Employee.id
+    ).join(
+        User, Employee.user_id == User.id
+    )
+
+    if start_date:
+        query = query.where(Attendance.date >= start_date)
+    if end_date:
+        query = query.where(Attendance.date <= end_date)
+    if department:
+        query = query.where(User.department == department)
+
+    return query.order_by(Attendance.date, Attendance.id)
+
+
+def employees_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    department: Optional[str] = None
+) -> Select:
+    """Employees joined with their user, filtered on hire date"""
+    query = select(
+        Employee.id,
+        Employee.employee_id,
+        User.name,
+        User.email,
+        User.phone,
+        User.department,
+        Employee.position,
+        Employee.hire_date,
+        Employee.status,
+        Employee.performance_score,
+        User.is_active,
+    ).join(
+        User, Employee.user_id == User.id
+    )
+
+    if start_date:
+        query = query.where(Employee.hire_date >= start_date)
+    if end_date:
+        query = query.where(Employee.hire_date <= end_date)
+    if department:
+        query = query.where(User.department == department)
+
+    return query.order_by(Employee.employee_id)
+
+
+def leave_requests_query(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    department: Optional[str] = None
+) -> Select:
+    """Leave requests overlapping the date range, by start date"""
+    query = select(
+        LeaveRequest.id,
+        Employee.employee_id.label("employee_code"),
+        User.name,
+        User.department,
+        LeaveRequest.type,
+        LeaveRequest.start_date,
+        LeaveRequest.end_date,
+        LeaveRequest.days,
+        LeaveRequest.status,
+        LeaveRequest.reason,
+        LeaveRequest.submitted_at,
+        LeaveRequest.reviewed_at,
+    ).join(
+        Employee, LeaveRequest.employee_id == Employee.id
+    ).join(
+        User, Employee.user_id == User.id
+    )
+
+    if start_date:
+        query = query.where(LeaveRequest.end_date >= start_date)
+    if end_date:
+        query = query.where(LeaveRequest.start_date <= end_date)
+    if department:
+        query = query.where(User.department == department)
+
+    return query.order_by(LeaveRequest.start_date, LeaveRequest.id)
+
+
+DATASETS = {
+    "attendance": attendance_query,
+    "employees": employees_query,
+    "leave-requests": leave_requests_query,
+}
+
+
+def _plain(value: Any) -> Any:
+    """Convert a column value to a JSON/CSV friendly scalar"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime, dt_time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _encode_csv(columns, rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if columns is not None:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow(["" if value is None else _plain(value) for value in row])
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_ndjson(columns, rows) -> bytes:
+    return "".join(
+        json.dumps({key: _plain(value) for key, value in zip(columns, row)}) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+def stream_export(query: Select, fmt: str = "csv") -> Iterator[bytes]:
+    """
+    Run `query` on a server-side cursor and yield encoded chunks
+
+    The CSV header is sent before the query runs. Each later chunk holds
+    up to STREAM_BATCH_ROWS rows.
+
+    Args:
+        query: Core select of labelled columns
+        fmt: "csv" or "ndjson"
+
+    Yields:
+        UTF-8 encoded CSV or NDJSON
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    columns = [column.key for column in query.selected_columns]
+    if fmt == "csv":
+        yield _encode_csv(columns, [])
+
+    with SessionLocal() as db:
+        result = db.execute(query.execution_options(yield_per=STREAM_BATCH_ROWS))
+        for rows in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(None, rows)
+            else:
+                yield _encode_ndjson(columns, rows)
@@ -0,0 +1,302 @@
+"""
+Attendance Rollup
+Incremental maintenance and reads of the attendance_rollup table
+
+Every attendance write records its before/after state in a RollupDelta,
+which is flushed as one multi-row upsert inside the caller's transaction.
+Reads that only need counts per day, department or status go through the
+helpers below and cost O(days x departments x statuses).
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+
+from ..core.response_cache import tag_changes
+from ..database import dialect_insert
+from ..models.user import User
+from ..models.employee import Employee
+from ..models.attendance import Attendance, AttendanceStatus
+from ..models.attendance_rollup import AttendanceRollup
+
+
+PRESENT_STATUSES = (AttendanceStatus.PRESENT, AttendanceStatus.LATE)
+
+# (date, status, hours_worked) of one attendance row
+AttendanceSnapshot = Tuple[date, AttendanceStatus, Decimal]
+
+
+def snapshot(record: Optional[Attendance]) -> Optional[AttendanceSnapshot]:
+    """
+    Capture the rollup-relevant state of an attendance row
+
+    Take one before mutating a row and one after, then pass both to
+    RollupDelta.record().
+    """
+    if record is None:
+        return None
+    return (
+        record.date,
+        AttendanceStatus(record.status),
+        Decimal(str(record.hours_worked or 0)),
+    )
+
+
+class RollupDelta:
+    """Accumulates rollup changes for one transaction"""
+
+    def __init__(self):
+        self._changes: Dict[Tuple[date, str, AttendanceStatus], List] = {}
+
+    def add(self, day: date, department: str, status: AttendanceStatus, count: int, hours: Decimal):
+        """Add a raw count/hours change for one rollup key"""
+        entry = self._changes.setdefault((day, department, AttendanceStatus(status)), [0, Decimal(0)])
+        entry[0] += count
+        entry[1] += Decimal(str(hours or 0))
+
+    def record(self, department: str, before: Optional[AttendanceSnapshot], after: Optional[AttendanceSnapshot]):
+        """
+        Record an attendance row change
+
+        Args:
+            department: Department of the row's employee
+            before: snapshot() taken before the write (None for inserts)
+            after: snapshot() taken after the write (None for deletes)
+        """
+        if before is not None:
+            self.add(before[0], department, before[1], -1, -before[2])
+        if after is not None:
+            self.add(after[0], department, after[1], 1, after[2])
+
+    def flush(self, db: Session):
+        """Apply the accumulated changes as a single upsert (no commit)"""
+        rows = [
+            {
+                "date": day,
+                "department": department,
+                "status": status,
+                "record_count": count,
+                "hours_worked": hours,
+            }
+            for (day, department, status), (count, hours) in self._changes.items()
+            if count or hours
+        ]
+        # Cached responses for these days are dropped when the caller commits
+        tag_changes(db, {f"attendance:{day}" for day, _department, _status in self._changes})
+        self._changes.clear()
+        if not rows:
+            return
+
+        stmt = dialect_insert(db, AttendanceRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AttendanceRollup.date, AttendanceRollup.department, AttendanceRollup.status],
+            set_={
+                "record_count": AttendanceRollup.record_count + stmt.excluded.record_count,
+                "hours_worked": AttendanceRollup.hours_worked + stmt.excluded.hours_worked,
+            }
+        )
+        db.execute(stmt)
+
+
+def record_attendance_change(
+    db: Session,
+    department: str,
+    before: Optional[AttendanceSnapshot],
+    after: Optional[AttendanceSnapshot]
+):
+    """Apply a single attendance row change to the rollup (no commit)"""
+    delta = RollupDelta()
+    delta.record(department, before, after)
+    delta.flush(db)
+
+
+def move_employee_department(db: Session, employee_id, old_department: str, new_department: str):
+    """
+    Re-attribute an employee's attendance history to a new department
+
+    Called when HR changes an employee's department so rollup reads stay
+    equal to a recount over the current employee/department join.
+    """
+    if old_department == new_department:
+        return
+
+    rows = db.query(
+        Attendance.date,
+        Attendance.status,
+        func.count(Attendance.id),
+        func.coalesce(func.sum(Attendance.hours_worked), 0)
+    ).filter(
+        Attendance.employee_id == employee_id
+    ).group_by(Attendance.date, Attendance.status).all()
+
+    delta = RollupDelta()
+    for day, status_value, count, hours in rows:
+        delta.add(day, old_department, status_value, -count, -Decimal(str(hours)))
+        delta.add(day, new_department, status_value, count, Decimal(str(hours)))
+    delta.flush(db)
+
+
+def rebuild_rollup(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    """
+    Recompute rollup rows from the attendance table (no commit)
+
+    Args:
+        db: Database session
+        start_date: First date to rebuild (default: all history)
+        end_date: Last date to rebuild (default: all history)
+
+    Returns:
+        Number of rollup rows written
+    """
+    delete_query = db.query(AttendanceRollup)
+    if start_date:
+        delete_query = delete_query.filter(AttendanceRollup.date >= start_date)
+    if end_date:
+        delete_query = delete_query.filter(AttendanceRollup.date <= end_date)
+    delete_query.delete(synchronize_session=False)
+
+    source = db.query(
+        Attendance.date,
+        User.department,
+        Attendance.status,
+        func.count(Attendance.id),
+        func.coalesce(func.sum(Attendance.hours_worked), 0)
+    ).join(
+        Employee, Attendance.employee_id == Employee.id
+    ).join(
+        User, Employee.user_id == User.id
+    )
+    if start_date:
+        source = source.filter(Attendance.date >= start_date)
+    if end_date:
+        source = source.filter(Attendance.date <= end_date)
+    source = source.group_by(Attendance.date, User.department, Attendance.status)
+
+    insert_stmt = AttendanceRollup.__table__.insert().from_select(
+        ["date", "department", "status", "record_count", "hours_worked"],
+        source.subquery().select()
+    )
+    result = db.execute(insert_stmt)
+    return result.rowcount if result.rowcount is not None and result.rowcount >= 0 else 0
+
+
+def ensure_rollup(db: Session) -> bool:
+    """
+    Backfill the rollup on first start after the table was added
+
+    Returns:
+        True if a rebuild was performed
+    """
+    has_rollup = db.query(AttendanceRollup.date).first() is not None
+    if has_rollup:
+        return False
+    has_attendance = db.query(Attendance.id).first() is not None
+    if not has_attendance:
+        return False
+    rebuild_rollup(db)
+    db.commit()
+    return True
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+def _range_filter(start_date: date, end_date: date, department: Optional[str] = None):
+    conditions = [AttendanceRollup.date >= start_date, AttendanceRollup.date <= end_date]
+    if department:
+        conditions.append(AttendanceRollup.department == department)
+    return and_(*conditions)
+
+
+def _present_sum():
+    return func.sum(
+        case(
+            (AttendanceRollup.status.in_(PRESENT_STATUSES), AttendanceRollup.record_count),
+            else_=0
+        )
+    )
+
+
+def status_counts(db: Session, start_date: date, end_date: date, department: Optional[str] = None) -> Dict[str, int]:
+    """
+    Attendance counts per status over a date range
+
+    Returns:
+        Mapping of every status value to its count (missing statuses are 0)
+    """
+    rows = db.query(
+        AttendanceRollup.status,
+        func.sum(AttendanceRollup.record_count)
+    ).filter(
+        _range_filter(start_date, end_date, department)
+    ).group_by(AttendanceRollup.status).all()
+
+    counts = {s.value: 0 for s in AttendanceStatus}
+    for status_value, count in rows:
+        counts[AttendanceStatus(status_value).value] = int(count or 0)
+    return counts
+
+
+def daily_totals(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    department: Optional[str] = None
+) -> Dict[date, Tuple[int, int, Decimal]]:
+    """
+    Per-day totals over a date range
+
+    Returns:
+        Mapping of date to (total records, present+late records, hours worked)
+    """
+    rows = db.query(
+        AttendanceRollup.date,
+        func.sum(AttendanceRollup.record_count),
+        _present_sum(),
+        func.sum(AttendanceRollup.hours_worked)
+    ).filter(
+        _range_filter(start_date, end_date, department)
+    ).group_by(AttendanceRollup.date).all()
+
+    return {
+        day: (int(total or 0), int(present or 0), Decimal(str(hours or 0)))
+        for day, total, present, hours in rows
+    }
+
+
+def monthly_totals(db: Session, start_date: date, end_date: date) -> Dict[Tuple[int, int], Tuple[int, int]]:
+    """
+    Per-month totals over a date range
+
+    Returns:
+        Mapping of (year, month) to (total records, present+late records)
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for day, (total, present, _hours) in daily_totals(db, start_date, end_date).items():
+        entry = totals[(day.year, day.month)]
+        entry[0] += total
+        entry[1] += present
+    return {key: (total, present) for key, (total, present) in totals.items()}
+
+
+def department_totals(db: Session, start_date: date, end_date: date) -> List[Tuple[str, int, int]]:
+    """
+    Per-department totals over a date range
+
+    Returns:
+        List of (department, total records, present+late records)
+    """
+    rows = db.query(
+        AttendanceRollup.department,
+        func.sum(AttendanceRollup.record_count),
+        _present_sum()
+    ).filter(
+        _range_filter(start_date, end_date)
+    ).group_by(AttendanceRollup.department).all()
+
+    return [(dept, int(total or 0), int(present or 0)) for dept, total, present in rows if total]
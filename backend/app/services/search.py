@@ -0,0 +1,213 @@
+"""
+Employee Search
+Indexed substring search over employee name, email, employee ID and position
+
+- SQLite: an FTS5 table with the trigram tokenizer (`employee_search`),
+  kept in sync by triggers on `users` and `employees`, ranked by bm25.
+- PostgreSQL: pg_trgm GIN indexes on the searched columns, so the
+  ILIKE '%term%' filter is index-assisted, ranked by similarity().
+- Anything else (or if the index could not be created): plain ILIKE.
+"""
+
+from typing import Any, Tuple
+
+from sqlalchemy import Select, column, func, literal, or_, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.user import User
+from ..models.employee import Employee
+
+
+# Databases on which ensure_search_index() succeeded -> dialect name.
+# Keyed by database rather than Engine so the sync engine that creates the
+# index and the async engine used by the routes share the entry.
+_indexed_databases = {}
+
+# Trigram matching needs at least this many characters
+MIN_TRIGRAM_LENGTH = 3
+
+employee_search = table(
+    "employee_search",
+    column("employee_pk"),
+    column("rank"),
+    column("name"),
+    column("email"),
+    column("code"),
+    column("position"),
+)
+
+# Rows are keyed by employees.id, not employees.rowid: the primary key is
+# a UUID, so the rowid is not stable across VACUUM or table rebuilds
+SQLITE_TRIGGERS = ("employee_search_ai", "employee_search_au", "employee_search_ad", "employee_search_user_au")
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS employee_search
+    USING fts5(employee_pk UNINDEXED, name, email, code, position, tokenize='trigram')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employee_search_ai AFTER INSERT ON employees BEGIN
+        INSERT INTO employee_search(employee_pk, name, email, code, position)
+        SELECT new.id, u.name, u.email, new.employee_id, new.position
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employee_search_au AFTER UPDATE OF id, employee_id, position, user_id ON employees BEGIN
+        DELETE FROM employee_search WHERE employee_pk = old.id;
+        INSERT INTO employee_search(employee_pk, name, email, code, position)
+        SELECT new.id, u.name, u.email, new.employee_id, new.position
+        FROM users u WHERE u.id = new.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employee_search_ad AFTER DELETE ON employees BEGIN
+        DELETE FROM employee_search WHERE employee_pk = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS employee_search_user_au AFTER UPDATE OF name, email ON users BEGIN
+        UPDATE employee_search SET name = new.name, email = new.email
+        WHERE employee_pk IN (SELECT id FROM employees WHERE user_id = new.id);
+    END
+    """,
+]
+
+SQLITE_BACKFILL = """
+    INSERT INTO employee_search(employee_pk, name, email, code, position)
+    SELECT e.id, u.name, u.email, e.employee_id, e.position
+    FROM employees e JOIN users u ON u.id = e.user_id
+"""
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_employees_employee_id_trgm ON employees USING gin (employee_id gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_employees_position_trgm ON employees USING gin (position gin_trgm_ops)",
+]
+
+
+def _database_key(engine: Engine) -> Tuple[Any, ...]:
+    url = engine.url
+    return (url.get_backend_name(), url.host, url.port, url.database)
+
+
+def _ensure_sqlite_index(conn) -> None:
+    columns = {row[1] for row in conn.execute(text("PRAGMA table_info(employee_search)"))}
+    if columns and "employee_pk" not in columns:
+        # Built by an earlier version, keyed by rowid: start over
+        for trigger in SQLITE_TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text("DROP TABLE employee_search"))
+        columns = set()
+
+    for ddl in SQLITE_DDL:
+        conn.execute(text(ddl))
+
+    if columns:
+        # Writes that bypassed the triggers (bulk loads with triggers
+        # off, restores) leave the counts apart: refill from scratch
+        indexed = conn.execute(text("SELECT count(*) FROM employee_search")).scalar()
+        employees = conn.execute(text("SELECT count(*) FROM employees")).scalar()
+        if indexed == employees:
+            return
+        conn.execute(text("DELETE FROM employee_search"))
+    conn.execute(text(SQLITE_BACKFILL))
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """
+    Create the search index for the engine's dialect if it is missing
+
+    Idempotent; safe to call on every startup. On SQLite, an index from
+    an older layout or with a row count different from employees is
+    rebuilt.
+
+    Returns:
+        True if indexed search is available on this engine
+    """
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                _ensure_sqlite_index(conn)
+            elif dialect == "postgresql":
+                for ddl in POSTGRES_DDL:
+                    conn.execute(text(ddl))
+            else:
+                return False
+    except Exception as e:
+        print(f"⚠️ Employee search index unavailable, falling back to ILIKE: {e}")
+        return False
+
+    _indexed_databases[_database_key(engine)] = dialect
+    return True
+
+
+def _ilike_filter(term: str):
+    pattern = f"%{term}%"
+    return or_(
+        User.name.ilike(pattern),
+        User.email.ilike(pattern),
+        Employee.employee_id.ilike(pattern),
+        Employee.position.ilike(pattern)
+    )
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def apply_search(db: AsyncSession, query: Select, term: str) -> Tuple[Select, Any]:
+    """
+    Restrict an Employee/User query to employees matching `term`
+
+    Args:
+        db: Database session
+        query: Statement selecting Employee and already joined to User
+        term: Search text (substring of name, email, employee ID or position)
+
+    Returns:
+        (filtered query, relevance expression where higher is better)
+    """
+    dialect = _indexed_databases.get(_database_key(db.get_bind()))
+
+    if dialect == "sqlite":
+        if len(term) >= MIN_TRIGRAM_LENGTH:
+            match = text("employee_search MATCH :search_phrase").bindparams(search_phrase=_fts_phrase(term))
+            score = (-employee_search.c.rank).label("score")
+        else:
+            # Too short for trigrams: scan the (small) FTS table with LIKE
+            pattern = f"%{term}%"
+            match = or_(
+                employee_search.c.name.like(pattern),
+                employee_search.c.email.like(pattern),
+                employee_search.c.code.like(pattern),
+                employee_search.c.position.like(pattern)
+            )
+            score = literal(0.0).label("score")
+
+        matches = select(
+            Employee.id.label("employee_pk"),
+            score
+        ).join_from(
+            Employee, employee_search, Employee.id == employee_search.c.employee_pk
+        ).where(match).subquery("search_matches")
+
+        query = query.join(matches, matches.c.employee_pk == Employee.id)
+        return query, matches.c.score
+
+    query = query.filter(_ilike_filter(term))
+
+    if dialect == "postgresql":
+        score = func.greatest(
+            func.similarity(User.name, term),
+            func.similarity(User.email, term),
+            func.similarity(Employee.employee_id, term),
+            func.similarity(Employee.position, term)
+        )
+        return query, score
+
+    return query, literal(0.0)
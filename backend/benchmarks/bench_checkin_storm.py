@@ -0,0 +1,147 @@
+"""
+Check-in Storm Load Test
+Thousands of employees checking in within the same minute
+
+Starts one uvicorn worker on a synthetic SQLite database with no
+attendance for today, then sends one POST /api/employee/attendance/checkin
+per employee at random times inside --window seconds (at most
+--concurrency in flight). A fraction of employees double-click: a second
+check-in is sent at the same moment. Afterwards it verifies that every
+employee has exactly one row, that duplicates were rejected with 400
+rather than a 500 from uq_employee_date, and that the attendance rollup
+matches a recount.
+
+Usage:
+    python benchmarks/bench_checkin_storm.py
+    python benchmarks/bench_checkin_storm.py --employees 5000 --window 60 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import date
+
+from common import auth_headers, build_dataset, clear_day, make_sessionmaker, percentile, start_api_server
+
+import httpx
+from sqlalchemy import func, select
+
+from app.database import engine
+from app.models.attendance import Attendance
+from app.models.attendance_rollup import AttendanceRollup
+from app.services.rollup import rebuild_rollup
+
+
+async def storm(base_url: str, headers_list, window: float, concurrency: int, double_click: float, seed: int):
+    """Send the check-ins; return (latencies_ms, status counts, elapsed seconds)"""
+    rng = random.Random(seed)
+    requests = []
+    for headers in headers_list:
+        at = rng.uniform(0, window)
+        requests.append((at, headers))
+        if rng.random() < double_click:
+            requests.append((at, headers))
+    requests.sort(key=lambda item: item[0])
+
+    latencies, statuses = [], Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        started = time.perf_counter()
+
+        async def one(at, headers):
+            delay = at - (time.perf_counter() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/api/employee/attendance/checkin", headers=headers)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError:
+                    statuses["error"] += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(one(at, headers) for at, headers in requests))
+        elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def rollup_snapshot(day: date):
+    """Non-empty rollup rows for one day"""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(AttendanceRollup.department, AttendanceRollup.status, AttendanceRollup.record_count)
+            .where(AttendanceRollup.date == day, AttendanceRollup.record_count != 0)
+        ).all()
+    return sorted((department, status.value, count) for department, status, count in rows)
+
+
+def verify(day: date, employees: int) -> bool:
+    """Check row counts and that the incrementally maintained rollup matches a recount"""
+    with engine.connect() as conn:
+        rows, distinct = conn.execute(
+            select(func.count(Attendance.id), func.count(func.distinct(Attendance.employee_id)))
+            .where(Attendance.date == day)
+        ).one()
+
+    incremental = rollup_snapshot(day)
+    db = make_sessionmaker(engine)()
+    try:
+        rebuild_rollup(db, day, day)
+        db.commit()
+    finally:
+        db.close()
+    recounted = rollup_snapshot(day)
+
+    ok = rows == distinct == employees and incremental == recounted
+    print(f"attendance rows {rows} for {distinct} employees (expected {employees}); "
+          f"rollup {'matches' if incremental == recounted else 'DIFFERS FROM'} recount")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check-in storm load test")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--window", type=float, default=60, help="Seconds over which check-ins arrive")
+    parser.add_argument("--concurrency", type=int, default=200, help="Maximum requests in flight")
+    parser.add_argument("--double-click", type=float, default=0.1, help="Fraction of employees sending twice")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("CHECK-IN STORM")
+    print("=" * 60)
+
+    today = date.today()
+    ids = build_dataset(engine, employees=args.employees, days=1, seed=args.seed)
+    clear_day(engine, today)
+    headers_list = [auth_headers(user_id) for user_id, _ in ids]
+
+    process, base_url = start_api_server(str(engine.url))
+    try:
+        latencies, statuses, elapsed = asyncio.run(
+            storm(base_url, headers_list, args.window, args.concurrency, args.double_click, args.seed)
+        )
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{len(latencies)} requests in {elapsed:.1f} s ({len(latencies) / elapsed:.0f} req/s) | "
+          f"p50 {statistics.median(latencies):.1f} ms | p99 {percentile(latencies, 99):.1f} ms | "
+          f"max {max(latencies):.1f} ms")
+    print("status codes: " + ", ".join(f"{code}: {count}" for code, count in sorted(statuses.items(), key=str)))
+
+    ok = verify(today, args.employees) and statuses[201] == args.employees
+    ok = ok and set(statuses) <= {201, 400}
+    print("✓ consistent" if ok else "✗ inconsistent")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Concurrency Benchmark
+Check-in latency while HR analytics requests run in parallel
+
+Starts one uvicorn worker on a synthetic SQLite database and drives it
+over HTTP from this process: a steady stream of
+POST /api/employee/attendance/checkin (one per employee, so every call
+writes) is measured alone and again while several clients hammer
+GET /api/hr/analytics. Any blocking database call in a route stalls the
+worker's event loop and shows up directly in the check-in tail latency.
+(The client deliberately runs in a separate process; sharing the loop
+would hide the stalls, since requests could not be sent while it blocks.)
+
+Usage:
+    python benchmarks/bench_concurrency.py
+    python benchmarks/bench_concurrency.py --employees 5000 --checkins 500 --analytics-clients 4
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, datetime
+
+from common import auth_headers, build_dataset, clear_day, percentile, start_api_server
+
+import httpx
+from sqlalchemy import insert
+
+from app.database import engine
+from app.models.user import User, UserRole
+
+
+def prepare(employees: int, days: int):
+    """Build the dataset without today's attendance and add an HR user"""
+    ids = build_dataset(engine, employees=employees, days=days)
+    clear_day(engine, date.today())
+    now = datetime.utcnow()
+    hr_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "id": hr_id, "email": "bench.hr@staffsync.com", "password_hash": "x",
+            "role": UserRole.HR_ADMINISTRATOR, "name": "Bench HR", "department": "HR",
+            "is_active": True, "created_at": now, "updated_at": now,
+        }])
+    return ids, hr_id
+
+
+async def run_checkins(client, headers_list, interval: float):
+    """Fire check-ins at a fixed rate; return per-request latencies (ms)"""
+    latencies, failures = [], 0
+
+    async def one(headers):
+        nonlocal failures
+        start = time.perf_counter()
+        response = await client.post("/api/employee/attendance/checkin", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 201:
+            failures += 1
+
+    tasks = []
+    for headers in headers_list:
+        tasks.append(asyncio.create_task(one(headers)))
+        await asyncio.sleep(interval)
+    await asyncio.gather(*tasks)
+    return latencies, failures
+
+
+async def run_analytics(client, headers, stop: asyncio.Event, durations):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/api/hr/analytics", headers=headers)
+        durations.append((time.perf_counter() - start) * 1000)
+
+
+def report(label, latencies, failures):
+    print(f"{label:<28} n={len(latencies):>5} | p50 {statistics.median(latencies):>8.1f} ms | "
+          f"p99 {percentile(latencies, 99):>8.1f} ms | max {max(latencies):>8.1f} ms | "
+          f"{failures} failed")
+
+
+async def main_async(args):
+    ids, hr_id = prepare(args.employees, args.days)
+    hr_headers = auth_headers(hr_id, UserRole.HR_ADMINISTRATOR)
+    employee_headers = [auth_headers(user_id) for user_id, _ in ids]
+    half = args.checkins
+
+    process, base_url = start_api_server(str(engine.url))
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # Warm up connection pools and caches
+        await client.get("/api/hr/analytics", headers=hr_headers)
+
+        latencies, failures = await run_checkins(client, employee_headers[:half], args.interval)
+        report("check-in alone", latencies, failures)
+
+        stop, durations = asyncio.Event(), []
+        workers = [
+            asyncio.create_task(run_analytics(client, hr_headers, stop, durations))
+            for _ in range(args.analytics_clients)
+        ]
+        await asyncio.sleep(args.interval)
+        latencies, failures = await run_checkins(client, employee_headers[half:2 * half], args.interval)
+        stop.set()
+        await asyncio.gather(*workers)
+        report("check-in + analytics", latencies, failures)
+        if durations:
+            print(f"{'analytics (concurrent)':<28} n={len(durations):>5} | "
+                  f"p50 {statistics.median(durations):>8.1f} ms")
+
+    process.terminate()
+    process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check-in latency under concurrent analytics load")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=30, help="Days of attendance history")
+    parser.add_argument("--checkins", type=int, default=300, help="Check-ins per phase")
+    parser.add_argument("--analytics-clients", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between check-ins")
+    args = parser.parse_args()
+    if args.checkins * 2 > args.employees:
+        parser.error("--employees must be at least twice --checkins")
+
+    print("\n" + "=" * 60)
+    print("CHECK-IN LATENCY UNDER ANALYTICS LOAD")
+    print("=" * 60)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
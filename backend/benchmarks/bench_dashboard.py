@@ -0,0 +1,85 @@
+"""
+Dashboard Stats Benchmark
+Statement count and latency of the HR dashboard aggregation at several organisation sizes
+
+"sequential" runs the reads one after another on one session;
+"concurrent" runs them on separate connections (gather_dashboard_stats).
+The response cache is off so both measure the queries.
+
+Usage:
+    python benchmarks/bench_dashboard.py
+    python benchmarks/bench_dashboard.py --sizes 1000 10000 50000 --days 30
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("RESPONSE_CACHE_TTL", "0")
+
+from common import build_dataset, count_statements, make_sessionmaker, temp_sqlite_url, timed
+
+from sqlalchemy import create_engine
+
+from app.database import SessionLocal
+from app.services.dashboard import compute_dashboard_stats, gather_dashboard_stats
+
+
+def timed_concurrent(repeat: int) -> float:
+    """Median milliseconds of gather_dashboard_stats() over `repeat` runs in one event loop"""
+    async def measure():
+        await gather_dashboard_stats()  # warm-up
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            await gather_dashboard_stats()
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1000
+
+    return asyncio.run(measure())
+
+
+def run(size: int, days: int, repeat: int):
+    engine = create_engine(temp_sqlite_url(f"dashboard-{size}.db"))
+    build_dataset(engine, employees=size, days=days)
+    Session = make_sessionmaker(engine)
+
+    def call():
+        db = Session()
+        try:
+            return compute_dashboard_stats(db)
+        finally:
+            db.close()
+
+    with count_statements(engine) as counter:
+        call()
+    median_ms, stats = timed(call, repeat=repeat)
+    # gather_reads opens its sessions from the application's SessionLocal
+    SessionLocal.configure(bind=engine)
+    concurrent_ms = timed_concurrent(repeat)
+
+    print(f"{size:>8} employees | {size * days:>10} attendance rows | "
+          f"{counter.count:>3} statements | {median_ms:>9.1f} ms sequential | "
+          f"{concurrent_ms:>9.1f} ms concurrent | "
+          f"today rate {stats['today_attendance']['attendance_rate']}%")
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GET /api/hr/dashboard/stats aggregation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--days", type=int, default=30, help="Days of attendance history")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("HR DASHBOARD STATS BENCHMARK")
+    print("=" * 60)
+    for size in args.sizes:
+        run(size, args.days, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Export Benchmark
+Time to first byte, throughput and server memory of the streaming exports
+
+Starts one uvicorn worker on a synthetic SQLite database and downloads
+GET /api/hr/exports/{dataset} in each format. Server memory is read
+from /proc (peak RSS), so it is only reported on Linux; with streaming it
+should stay flat as --days grows.
+
+Usage:
+    python benchmarks/bench_export.py
+    python benchmarks/bench_export.py --employees 2000 --days 365
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime
+
+from common import auth_headers, build_dataset, start_api_server
+
+import httpx
+from sqlalchemy import insert
+
+from app.database import engine
+from app.models.user import User, UserRole
+
+
+def peak_rss_mb(pid: int):
+    """Peak resident set size of a process in MB, or None off Linux"""
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def download(client, path: str, headers):
+    """Stream one export; return (first byte s, total s, lines, bytes)"""
+    start = time.perf_counter()
+    first_byte = None
+    lines = size = 0
+    with client.stream("GET", path, headers=headers) as response:
+        response.raise_for_status()
+        for chunk in response.iter_bytes():
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+    return first_byte, time.perf_counter() - start, lines, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export benchmark")
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=180, help="Days of attendance history")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("STREAMING EXPORTS")
+    print("=" * 60)
+
+    build_dataset(engine, employees=args.employees, days=args.days)
+    now = datetime.utcnow()
+    hr_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "id": hr_id, "email": "bench.hr@staffsync.com", "password_hash": "x",
+            "role": UserRole.HR_ADMINISTRATOR, "name": "Bench HR", "department": "HR",
+            "is_active": True, "created_at": now, "updated_at": now,
+        }])
+    headers = auth_headers(hr_id, UserRole.HR_ADMINISTRATOR)
+
+    process, base_url = start_api_server(str(engine.url))
+    try:
+        with httpx.Client(base_url=base_url, timeout=600) as client:
+            print(f"server peak RSS at start: {peak_rss_mb(process.pid) or 0:.0f} MB")
+            for dataset in ("attendance", "employees", "leave-requests"):
+                for fmt in ("csv", "ndjson"):
+                    first_byte, total, lines, size = download(
+                        client, f"/api/hr/exports/{dataset}?format={fmt}", headers
+                    )
+                    print(f"{dataset + '.' + fmt:<22} {lines:>9} lines | {size / 1e6:>7.1f} MB | "
+                          f"first byte {first_byte * 1000:>6.1f} ms | total {total:>6.2f} s | "
+                          f"{lines / total:>8.0f} rows/s | server peak RSS "
+                          f"{peak_rss_mb(process.pid) or 0:.0f} MB")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Middleware Benchmark
+Requests/second on /api/health with and without the middleware stack
+
+Calls the ASGI app in-process (no sockets, no HTTP parsing), so the
+differences are the middleware alone. Every diagnostic that adds
+middleware is switched on (X-Query-Count, Server-Timing, metrics) and
+three stacks are compared:
+
+- none: the bare application
+- BaseHTTPMiddleware: CORS plus the previous @app.middleware("http")
+  process-time and query-count functions
+- ASGI: the application's own stack
+
+Usage:
+    python benchmarks/bench_middleware.py
+    python benchmarks/bench_middleware.py --requests 20000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ["QUERY_COUNT_HEADER"] = "true"
+os.environ["SERVER_TIMING_HEADER"] = "true"
+os.environ["METRICS_ENABLED"] = "true"
+
+import common  # noqa: F401  (temporary database, import path)
+
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import settings
+from app.core.instrumentation import track_queries
+from app.main import app
+
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+    "scheme": "http", "path": "/api/health", "raw_path": b"/api/health", "root_path": "",
+    "query_string": b"", "headers": [(b"host", b"localhost"), (b"origin", b"http://localhost:5173")],
+    "client": ("127.0.0.1", 50000), "server": ("localhost", 8000),
+}
+
+
+async def add_process_time_header(request, call_next):
+    start_time = time.time()
+    response = await call_next(request)
+    response.headers["X-Process-Time"] = str(time.time() - start_time)
+    return response
+
+
+async def add_query_count_header(request, call_next):
+    with track_queries(request.scope) as stats:
+        response = await call_next(request)
+    response.headers["X-Query-Count"] = str(stats.statements)
+    response.headers["Server-Timing"] = stats.server_timing()
+    return response
+
+
+def stacks():
+    """(label, user middleware) for each variant"""
+    cors = Middleware(
+        CORSMiddleware, allow_origins=settings.cors_origins_list, allow_credentials=True,
+        allow_methods=["*"], allow_headers=["*"],
+    )
+    return [
+        ("none", []),
+        ("BaseHTTPMiddleware", [
+            Middleware(BaseHTTPMiddleware, dispatch=add_query_count_header),
+            Middleware(BaseHTTPMiddleware, dispatch=add_process_time_header),
+            cors,
+        ]),
+        ("ASGI", list(app.user_middleware)),
+    ]
+
+
+async def run(asgi_app, requests: int, concurrency: int) -> float:
+    """Send `requests` GETs with `concurrency` in flight; return requests/second"""
+    def make_receive():
+        sent = False
+
+        async def receive():
+            # The request body once, then nothing until the server cancels the wait
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.Event().wait()
+
+        return receive
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    async def client(count):
+        for _ in range(count):
+            await asgi_app(dict(SCOPE, headers=list(SCOPE["headers"])), make_receive(), send)
+
+    share, extra = divmod(requests, concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(share + (i < extra)) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    assert set(statuses) == {200}, set(statuses)
+    return requests / elapsed
+
+
+async def main_async(args):
+    results = {}
+    for label, middleware in stacks():
+        app.user_middleware = middleware
+        asgi_app = app.build_middleware_stack()
+        await run(asgi_app, min(1000, args.requests), args.concurrency)  # warm-up
+        results[label] = max([await run(asgi_app, args.requests, args.concurrency) for _ in range(args.rounds)])
+
+    baseline = results["none"]
+    for label, rate in results.items():
+        overhead = (1 / rate - 1 / baseline) * 1e6
+        print(f"{label:<20} {rate:>9,.0f} req/s | +{overhead:>5.0f} µs/request over none")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/health throughput per middleware stack")
+    parser.add_argument("--requests", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight")
+    parser.add_argument("--rounds", type=int, default=3, help="Best of this many runs")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"MIDDLEWARE STACK: /api/health ({args.requests} requests, {args.concurrency} in flight)")
+    print("=" * 60)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+SQLite Profile Benchmark
+Read/write mix throughput with SQLITE_TUNING off and on
+
+Builds one synthetic SQLite database, then runs the same closed-loop mix
+on a fresh copy per profile. The default profile's copy is switched back
+to the rollback journal, since WAL mode is stored in the database file.
+
+--mode engine (default) drives the database directly from a thread pool,
+so the numbers reflect SQLite alone:
+
+- writes: update one attendance row, one transaction each
+- reads: an employee's attendance history
+
+--mode http starts uvicorn on the copy (two workers by default, like a
+branch office server) and mixes check-ins/leave requests, attendance
+history reads and the occasional 30-day HR export, which holds a read
+open while it streams. Without WAL that read blocks every commit until
+the busy timeout turns it into "database is locked"; failed requests
+are counted separately from the throughput.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py
+    python benchmarks/bench_sqlite_profile.py --write-ratio 0.5 --threads 16
+    python benchmarks/bench_sqlite_profile.py --mode http --clients 16 --workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from common import auth_headers, build_dataset, clear_day, percentile, start_api_server
+
+import httpx
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.pool import QueuePool
+
+from app.database import apply_sqlite_tuning, engine, init_db
+from app.models.user import User, UserRole
+from app.models.attendance import Attendance
+
+PROFILES = (("default", False), ("tuned", True))
+
+
+def prepare(employees: int, days: int):
+    """Build the dataset without today's attendance and add an HR user"""
+    init_db()
+    ids = build_dataset(engine, employees=employees, days=days)
+    clear_day(engine, date.today())
+    now = datetime.utcnow()
+    hr_id = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "id": hr_id, "email": "bench.hr@staffsync.com", "password_hash": "x",
+            "role": UserRole.HR_ADMINISTRATOR, "name": "Bench HR", "department": "HR",
+            "is_active": True, "created_at": now, "updated_at": now,
+        }])
+    # Closing the last connection checkpoints the WAL into the file
+    engine.dispose()
+    return ids, hr_id
+
+
+def copy_database(source: str, name: str, tuned: bool) -> str:
+    """Copy the dataset for one profile, in that profile's journal mode"""
+    path = os.path.join(os.path.dirname(source), f"{name}.db")
+    shutil.copyfile(source, path)
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode={'WAL' if tuned else 'DELETE'}")
+    conn.close()
+    return path
+
+
+def run_engine_mix(path: str, tuned: bool, ids, args):
+    """Threads reading and writing through SQLAlchemy; return {kind: (latencies ms, failures)}"""
+    mix_engine = create_engine(
+        f"sqlite:///{path}", poolclass=QueuePool, pool_size=args.threads,
+        connect_args={"check_same_thread": False},
+    )
+    if tuned:
+        apply_sqlite_tuning(mix_engine)
+    attendance = Attendance.__table__
+    results = {kind: ([], [0]) for kind in ("write", "read")}
+    errors = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        local = {kind: [] for kind in results}
+        failures = {kind: 0 for kind in results}
+        while time.perf_counter() < deadline:
+            employee_id = rng.choice(ids)[1]
+            kind = "write" if rng.random() < args.write_ratio else "read"
+            start = time.perf_counter()
+            try:
+                if kind == "write":
+                    day = date.today() - timedelta(days=rng.randint(1, args.days - 1))
+                    with mix_engine.begin() as conn:
+                        conn.execute(
+                            update(attendance)
+                            .where(attendance.c.employee_id == employee_id, attendance.c.date == day)
+                            .values(notes=f"benchmark {seed}")
+                        )
+                else:
+                    with mix_engine.connect() as conn:
+                        conn.execute(
+                            select(attendance)
+                            .where(attendance.c.employee_id == employee_id)
+                            .order_by(attendance.c.date.desc())
+                        ).all()
+                local[kind].append((time.perf_counter() - start) * 1000)
+            except Exception as e:
+                failures[kind] += 1
+                errors.setdefault(type(e).__name__, str(e).splitlines()[0])
+        with lock:
+            for kind in results:
+                results[kind][0].extend(local[kind])
+                results[kind][1][0] += failures[kind]
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    mix_engine.dispose()
+    for name, message in errors.items():
+        print(f"  first {name}: {message}")
+    return results
+
+
+async def run_http_mix(base_url, ids, hr_id, args):
+    """Closed-loop HTTP clients; return {kind: (latencies ms, failures)}"""
+    rng = random.Random(7)
+    employee_headers = [auth_headers(user_id) for user_id, _ in ids]
+    hr_headers = auth_headers(hr_id, UserRole.HR_ADMINISTRATOR)
+    unchecked = list(range(len(ids)))
+    rng.shuffle(unchecked)
+    export_start = (date.today() - timedelta(days=30)).isoformat()
+    leave_day = date.today() + timedelta(days=30)
+    results = {kind: ([], [0]) for kind in ("write", "read", "export")}
+    deadline = time.perf_counter() + args.duration
+
+    async def request(client, kind):
+        if kind == "write":
+            if unchecked:
+                return await client.post(
+                    "/api/employee/attendance/checkin", headers=employee_headers[unchecked.pop()]
+                )
+            return await client.post("/api/employee/leave-requests", headers=rng.choice(employee_headers), json={
+                "leave_type": "personal", "start_date": leave_day.isoformat(),
+                "end_date": leave_day.isoformat(), "reason": "benchmark leave request",
+            })
+        if kind == "read":
+            return await client.get("/api/employee/attendance", headers=rng.choice(employee_headers))
+        return await client.get(
+            f"/api/hr/exports/attendance?start_date={export_start}", headers=hr_headers
+        )
+
+    async def client_loop(client):
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            kind = "write" if roll < args.write_ratio else (
+                "export" if roll < args.write_ratio + args.export_ratio else "read"
+            )
+            start = time.perf_counter()
+            try:
+                response = await request(client, kind)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies, failures = results[kind]
+            if ok:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                failures[0] += 1
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(args.clients)))
+    return results
+
+
+def report(name: str, tuned: bool, results, duration: float):
+    total = sum(len(latencies) for latencies, _ in results.values())
+    failed = sum(failures[0] for _, failures in results.values())
+    print(f"\n{name} (SQLITE_TUNING={tuned}): {total / duration:.0f} ops/s ok, {failed} failed")
+    for kind, (latencies, failures) in results.items():
+        if latencies:
+            print(f"  {kind:<7} {len(latencies) / duration:>7.0f}/s | p50 {statistics.median(latencies):>8.1f} ms | "
+                  f"p99 {percentile(latencies, 99):>8.1f} ms | {failures[0]} failed")
+        else:
+            print(f"  {kind:<7} {0:>7}/s | {failures[0]} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite read/write mix with and without tuning")
+    parser.add_argument("--mode", choices=("engine", "http"), default="engine")
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=60, help="Days of attendance history")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per profile")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--threads", type=int, default=8, help="engine mode: worker threads")
+    parser.add_argument("--clients", type=int, default=16, help="http mode: concurrent clients")
+    parser.add_argument("--workers", type=int, default=2, help="http mode: uvicorn workers")
+    parser.add_argument("--export-ratio", type=float, default=0.02, help="http mode: share of exports")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"SQLITE PROFILE: READ/WRITE MIX ({args.mode})")
+    print("=" * 60)
+
+    ids, hr_id = prepare(args.employees, args.days)
+
+    for name, tuned in PROFILES:
+        path = copy_database(engine.url.database, name, tuned)
+        if args.mode == "engine":
+            results = run_engine_mix(path, tuned, ids, args)
+        else:
+            process, base_url = start_api_server(
+                f"sqlite:///{path}", workers=args.workers, env={"SQLITE_TUNING": str(tuned)}
+            )
+            try:
+                results = asyncio.run(run_http_mix(base_url, ids, hr_id, args))
+            finally:
+                process.terminate()
+                process.wait()
+        report(name, tuned, results, args.duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Index Check
+Asserts that the hot queries are answered from the intended indexes
+
+Migrates a fresh database, loads a synthetic dataset, then runs EXPLAIN
+(EXPLAIN QUERY PLAN on SQLite, EXPLAIN (FORMAT JSON) on PostgreSQL) for
+each query shape below. A check passes when the plan reads the table
+through an index whose leading columns are the expected ones and, where
+required, returns rows in index order without a separate sort. Also
+fails if the migrations and the models disagree. Exits with status 1 on
+any failure.
+
+Usage:
+    python benchmarks/check_indexes.py
+    DATABASE_URL=postgresql://... python benchmarks/check_indexes.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+
+from common import build_dataset
+
+from sqlalchemy import desc, func, insert, inspect, or_, select
+
+from app.database import engine, init_db, schema_diff
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.leave_request import LeaveRequest, LeaveStatus
+from app.models.notification import Notification
+from app.models.task import Task, TaskPriority, TaskStatus
+
+
+def seed_tasks_and_notifications(ids, per_employee: int = 10, seed: int = 42):
+    """Spread tasks and notifications over all employees, like a real inbox"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    today = date.today()
+    tasks, notifications = [], []
+    for user_id, employee_id in ids:
+        for i in range(per_employee):
+            tasks.append({
+                "id": uuid.uuid4(), "employee_id": employee_id, "title": f"Task {i}",
+                "priority": TaskPriority.MEDIUM, "status": rng.choice(list(TaskStatus)),
+                "due_date": today + timedelta(days=rng.randint(-30, 30)), "created_at": now,
+            })
+            notifications.append({
+                "id": uuid.uuid4(), "sender_id": user_id, "recipient_id": user_id,
+                "title": f"Notification {i}", "message": "Benchmark",
+                "is_read": rng.random() < 0.8, "created_at": now - timedelta(hours=rng.randint(0, 2000)),
+            })
+    with engine.begin() as conn:
+        conn.execute(insert(Task.__table__), tasks)
+        conn.execute(insert(Notification.__table__), notifications)
+
+
+def hot_queries(employee_id, user_id, today: date):
+    """(label, statement, table, expected leading columns, must be sort-free)"""
+    return [
+        (
+            "attendance: day + status count",
+            select(func.count()).select_from(Attendance).where(
+                Attendance.date == today, Attendance.status == AttendanceStatus.ABSENT
+            ),
+            "attendance", ("date", "status"), False,
+        ),
+        (
+            "attendance: HR list by date range",
+            select(Attendance.id).where(
+                Attendance.date >= today - timedelta(days=7), Attendance.date <= today
+            ).order_by(desc(Attendance.date)),
+            "attendance", ("date",), True,
+        ),
+        (
+            "attendance: employee history",
+            select(Attendance).where(
+                Attendance.employee_id == employee_id,
+                Attendance.date >= today - timedelta(days=30),
+            ).order_by(desc(Attendance.date)),
+            "attendance", ("employee_id", "date"), True,
+        ),
+        (
+            "tasks: open tasks of an employee",
+            select(Task).where(
+                Task.employee_id == employee_id,
+                Task.status.in_([TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
+            ),
+            "tasks", ("employee_id", "status"), False,
+        ),
+        (
+            "tasks: due today",
+            select(Task).where(
+                Task.employee_id == employee_id,
+                Task.status == TaskStatus.PENDING,
+                Task.due_date == today,
+            ),
+            "tasks", ("employee_id", "status", "due_date"), False,
+        ),
+        (
+            "notifications: unread count",
+            select(func.count()).select_from(Notification).where(
+                or_(Notification.recipient_id == user_id, Notification.recipient_id.is_(None)),
+                Notification.is_read.is_(False),
+            ),
+            "notifications", ("recipient_id", "is_read"), False,
+        ),
+        (
+            "notifications: inbox",
+            select(Notification).where(
+                or_(Notification.recipient_id == user_id, Notification.recipient_id.is_(None))
+            ).order_by(desc(Notification.created_at)).limit(20),
+            "notifications", ("recipient_id",), False,
+        ),
+        (
+            "leave: pending count",
+            select(func.count()).select_from(LeaveRequest).where(
+                LeaveRequest.status == LeaveStatus.PENDING
+            ),
+            "leave_requests", ("status",), False,
+        ),
+        (
+            "leave: approved overlapping today",
+            select(func.count()).select_from(LeaveRequest).where(
+                LeaveRequest.status == LeaveStatus.APPROVED,
+                LeaveRequest.start_date <= today,
+                LeaveRequest.end_date >= today,
+            ),
+            "leave_requests", ("status", "start_date"), False,
+        ),
+    ]
+
+
+def index_columns(conn):
+    """Map every index name (including ones backing constraints) to its columns"""
+    columns = {}
+    if conn.dialect.name == "sqlite":
+        for (table,) in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'"):
+            for index in conn.exec_driver_sql(f"PRAGMA index_list('{table}')").all():
+                info = conn.exec_driver_sql(f"PRAGMA index_info('{index[1]}')").all()
+                columns[index[1]] = tuple(row[2] for row in info)
+        return columns
+
+    inspector = inspect(conn)
+    for table in inspector.get_table_names():
+        for index in inspector.get_indexes(table):
+            columns[index["name"]] = tuple(index["column_names"])
+        pk = inspector.get_pk_constraint(table)
+        if pk.get("name"):
+            columns[pk["name"]] = tuple(pk["constrained_columns"])
+    return columns
+
+
+def explain(conn, statement, table: str):
+    """Return (indexes used on `table`, plan sorts rows, plan text)"""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+    if conn.dialect.name == "sqlite":
+        details = [row[3] for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+        used = set()
+        for detail in details:
+            words = detail.split()
+            if words[:2] in (["SEARCH", table], ["SCAN", table]) and "INDEX" in words:
+                used.add(words[words.index("INDEX") + 1])
+        sorts = any("TEMP B-TREE" in detail for detail in details)
+        return used, sorts, "\n".join(details)
+
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + sql).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+    used, sorts = set(), False
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if node.get("Relation Name") == table and "Index Name" in node:
+            used.add(node["Index Name"])
+        if node["Node Type"] == "Bitmap Index Scan":
+            used.add(node["Index Name"])
+        if node["Node Type"] in ("Sort", "Incremental Sort"):
+            sorts = True
+        nodes.extend(node.get("Plans", []))
+    return used, sorts, json.dumps(plan, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that hot queries use their indexes")
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    init_db()
+    ids = build_dataset(engine, employees=args.employees, days=args.days)
+    seed_tasks_and_notifications(ids)
+
+    print("\n" + "=" * 60)
+    print("INDEX USAGE CHECK")
+    print("=" * 60)
+
+    failures = 0
+    with engine.connect() as conn:
+        diffs = schema_diff(conn)
+        failures += bool(diffs)
+        print(f"{'✓' if not diffs else '✗'} {'migrations match models':<40} {diffs or ''}")
+
+        conn.exec_driver_sql("ANALYZE")
+        if conn.dialect.name == "postgresql":
+            # Judge whether an index can serve the query, not whether the
+            # planner prefers a scan on a small synthetic table
+            conn.exec_driver_sql("SET enable_seqscan = off")
+
+        columns = index_columns(conn)
+        user_id, employee_id = ids[0]
+        for label, statement, table, expected, sort_free in hot_queries(employee_id, user_id, date.today()):
+            used, sorts, plan = explain(conn, statement, table)
+            matching = [name for name in used if columns.get(name, ())[:len(expected)] == expected]
+            ok = bool(matching) and not (sort_free and sorts)
+            failures += not ok
+            detail = ", ".join(sorted(used)) or "no index"
+            if sort_free and sorts:
+                detail += " + sort"
+            print(f"{'✓' if ok else '✗'} {label:<40} {detail}")
+            if args.verbose or not ok:
+                print("    " + plan.replace("\n", "\n    "))
+
+    print(f"\n{failures} check(s) failed" if failures else "\nAll hot queries use their indexes")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Query Budget Check
+Asserts that list endpoints run a fixed number of SQL statements regardless of page size
+
+Uses the X-Query-Count header (QUERY_COUNT_HEADER=true) against a synthetic
+dataset, requesting each endpoint with a small and a large page once the
+principal cache is warm. Exits with status 1 if any endpoint exceeds its
+budget or scales with the page size.
+
+Usage:
+    python benchmarks/check_query_budget.py
+    python benchmarks/check_query_budget.py --employees 500
+"""
+
+import argparse
+import os
+import sys
+import uuid
+from datetime import date, datetime, timedelta
+
+os.environ["QUERY_COUNT_HEADER"] = "true"
+# Statements run by report worker processes are not counted; keep them in-process
+os.environ["REPORT_POOL"] = "thread"
+
+from common import auth_headers, build_dataset
+
+from sqlalchemy import insert
+
+from app.database import engine, init_db
+from app.models.user import User, UserRole
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.document import Document, DocumentCategory
+from app.models.announcement import Announcement, AnnouncementPriority, TargetAudience
+from app.models.notification import Notification, NotificationType
+
+# (portal, path, extra params, page size parameter, statement budget)
+ENDPOINTS = [
+    ("employee", "/api/auth/me", {}, None, 0),
+    ("hr", "/api/hr/employees", {}, "page_size", 2),
+    ("hr", "/api/hr/employees", {"search": "Employee 1"}, "page_size", 2),
+    ("hr", "/api/hr/employees", {"cursor": ""}, "page_size", 1),
+    ("hr", "/api/hr/attendance", {}, "page_size", 3),
+    ("hr", "/api/hr/attendance", {"cursor": ""}, "page_size", 1),
+    ("hr", "/api/hr/leave-requests", {}, "page_size", 3),
+    ("hr", "/api/hr/notifications", {}, "limit", 1),
+    ("hr", "/api/hr/notifications/sent", {}, "limit", 1),
+    ("hr", "/api/hr/recent-activity", {}, None, 3),
+    ("hr", "/api/hr/analytics", {}, None, 4),
+    ("hr", "/api/hr/dashboard/stats", {}, None, 5),
+    ("employee", "/api/employee/tasks", {}, None, 2),
+    ("employee", "/api/employee/documents", {}, None, 1),
+    ("employee", "/api/employee/announcements", {}, "page_size", 2),
+    ("employee", "/api/employee/notifications", {}, "limit", 2),
+    ("employee", "/api/employee/leave-requests", {}, None, 1),
+    ("employee", "/api/employee/bootstrap", {}, None, 14),
+]
+
+PAGE_SIZES = (5, 50)
+
+
+def seed_extras(ids):
+    """Add an HR user plus tasks, documents, announcements and notifications"""
+    now = datetime.utcnow()
+    hr_id = uuid.uuid4()
+    user_ids = [user_id for user_id, _ in ids]
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [{
+            "id": hr_id, "email": "bench.hr@staffsync.com", "password_hash": "x",
+            "role": UserRole.HR_ADMINISTRATOR, "name": "Bench HR", "department": "HR",
+            "is_active": True, "created_at": now, "updated_at": now,
+        }])
+        # Every row gets a distinct related user so lazy loads would show up
+        conn.execute(insert(Task.__table__), [{
+            "id": uuid.uuid4(), "employee_id": ids[0][1], "title": f"Task {i}",
+            "priority": TaskPriority.MEDIUM, "status": TaskStatus.PENDING,
+            "due_date": date.today() + timedelta(days=i), "assigned_by": user_ids[i],
+            "created_at": now,
+        } for i in range(60)])
+        conn.execute(insert(Document.__table__), [{
+            "id": uuid.uuid4(), "employee_id": ids[0][1], "title": f"Document {i}",
+            "category": DocumentCategory.OTHER, "file_name": f"{i}.pdf",
+            "file_path": f"uploads/{i}.pdf", "file_size": 1024, "uploaded_by": user_ids[i],
+            "uploaded_at": now,
+        } for i in range(60)])
+        conn.execute(insert(Announcement.__table__), [{
+            "id": uuid.uuid4(), "title": f"Announcement {i}", "content": "Benchmark",
+            "priority": AnnouncementPriority.NORMAL, "target_audience": TargetAudience.ALL,
+            "created_by": user_ids[i], "created_at": now,
+        } for i in range(60)])
+        conn.execute(insert(Notification.__table__), [{
+            "id": uuid.uuid4(), "sender_id": user_ids[i], "recipient_id": hr_id,
+            "title": f"Notification {i}", "message": "Benchmark", "type": NotificationType.INFO,
+            "is_read": False, "created_at": now,
+        } for i in range(60)] + [{
+            "id": uuid.uuid4(), "sender_id": hr_id, "recipient_id": user_ids[i],
+            "title": f"Sent {i}", "message": "Benchmark", "type": NotificationType.INFO,
+            "is_read": False, "created_at": now,
+        } for i in range(60)] + [{
+            "id": uuid.uuid4(), "sender_id": user_ids[i], "recipient_id": ids[0][0],
+            "title": f"Inbox {i}", "message": "Benchmark", "type": NotificationType.INFO,
+            "is_read": False, "created_at": now,
+        } for i in range(60)])
+    return hr_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-endpoint SQL statement budgets")
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    init_db()
+    ids = build_dataset(engine, employees=args.employees, days=args.days)
+    hr_id = seed_extras(ids)
+    headers = {
+        "hr": auth_headers(hr_id, UserRole.HR_ADMINISTRATOR),
+        "employee": auth_headers(ids[0][0]),
+    }
+
+    print("\n" + "=" * 60)
+    print("SQL STATEMENT BUDGET CHECK")
+    print("=" * 60)
+
+    failures = 0
+    with TestClient(app, raise_server_exceptions=False) as client:
+        # Budgets assume a warm principal cache, i.e. no SQL for authentication
+        for portal_headers in headers.values():
+            client.get("/api/auth/me", headers=portal_headers)
+
+        for portal, path, params, size_param, budget in ENDPOINTS:
+            sizes = PAGE_SIZES if size_param else (None,)
+            counts = []
+            for size in sizes:
+                query = dict(params)
+                if size_param:
+                    query[size_param] = size
+                response = client.get(path, params=query, headers=headers[portal])
+                if response.status_code != 200:
+                    counts.append(None)
+                    continue
+                counts.append(int(response.headers["X-Query-Count"]))
+
+            ok = None not in counts and len(set(counts)) == 1 and counts[0] <= budget
+            failures += not ok
+            label = f"{path}?{'&'.join(f'{k}={v}' for k, v in params.items())}".rstrip("?")
+            print(f"{'✓' if ok else '✗'} {label:<45} statements {counts} budget {budget}")
+
+    print(f"\n{failures} endpoint(s) over budget" if failures else "\nAll endpoints within budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Benchmark Helpers
+Synthetic data generation and statement counting shared by the benchmark scripts
+
+The scripts in this directory are run by hand from the backend directory:
+
+    python benchmarks/bench_dashboard.py --sizes 1000 10000
+"""
+
+import os
+import sys
+import random
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, time as dt_time, timedelta
+from decimal import Decimal
+
+# Benchmarks never touch the development database unless asked to
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='staffsync-bench-'), 'bench.db')}"
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.user import User, UserRole
+from app.models.employee import Employee, EmployeeStatus
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.leave_request import LeaveRequest, LeaveStatus, LeaveType
+from app.services.rollup import rebuild_rollup
+
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance"]
+BATCH_SIZE = 5000
+
+
+def temp_sqlite_url(name: str) -> str:
+    """Return a URL for a fresh SQLite file in a temporary directory"""
+    directory = tempfile.mkdtemp(prefix="staffsync-bench-")
+    return f"sqlite:///{os.path.join(directory, name)}"
+
+
+def _insert_batches(conn, table, rows):
+    for i in range(0, len(rows), BATCH_SIZE):
+        conn.execute(insert(table), rows[i:i + BATCH_SIZE])
+
+
+def build_dataset(engine, employees: int, days: int = 30, seed: int = 42):
+    """
+    Create the schema and load a synthetic organisation
+
+    Args:
+        engine: Target engine (schema is created if missing)
+        employees: Number of employees
+        days: Days of attendance history per employee, ending today
+        seed: Random seed for reproducible data
+
+    Returns:
+        List of (user_id, employee_uuid) tuples
+    """
+    rng = random.Random(seed)
+    Base.metadata.create_all(bind=engine)
+    today = date.today()
+    now = datetime.utcnow()
+
+    users, emps, ids = [], [], []
+    for i in range(employees):
+        user_id, emp_id = uuid.uuid4(), uuid.uuid4()
+        ids.append((user_id, emp_id))
+        users.append({
+            "id": user_id,
+            "email": f"bench.{i}@staffsync.com",
+            "password_hash": "x",
+            "role": UserRole.EMPLOYEE,
+            "name": f"Bench Employee {i}",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+            "is_active": True,
+            "created_at": now,
+            "updated_at": now,
+        })
+        emps.append({
+            "id": emp_id,
+            "user_id": user_id,
+            "employee_id": f"EMP-{today.strftime('%Y%m%d')}-{i + 1:06d}",
+            "position": "Engineer",
+            "hire_date": today - timedelta(days=365),
+            "status": EmployeeStatus.ACTIVE if i % 10 else EmployeeStatus.INACTIVE,
+        })
+
+    with engine.begin() as conn:
+        _insert_batches(conn, User.__table__, users)
+        _insert_batches(conn, Employee.__table__, emps)
+
+        leave = []
+        for user_id, emp_id in ids[::20]:
+            start = today - timedelta(days=rng.randint(0, 10))
+            leave.append({
+                "id": uuid.uuid4(),
+                "employee_id": emp_id,
+                "start_date": start,
+                "end_date": start + timedelta(days=2),
+                "type": LeaveType.VACATION,
+                "reason": "benchmark",
+                "status": rng.choice(list(LeaveStatus)),
+                "days": 3,
+                "submitted_at": now,
+            })
+        _insert_batches(conn, LeaveRequest.__table__, leave)
+
+        for offset in range(days):
+            day = today - timedelta(days=offset)
+            rows = []
+            for user_id, emp_id in ids:
+                roll = rng.random()
+                if roll < 0.08:
+                    rows.append({
+                        "id": uuid.uuid4(),
+                        "employee_id": emp_id,
+                        "date": day,
+                        "check_in": None,
+                        "check_out": None,
+                        "hours_worked": None,
+                        "status": AttendanceStatus.ABSENT if roll < 0.05 else AttendanceStatus.ON_LEAVE,
+                        "created_at": now,
+                    })
+                    continue
+                check_in = dt_time(rng.randint(8, 9), rng.randint(0, 59))
+                check_out = dt_time(rng.randint(17, 19), rng.randint(0, 59))
+                late = check_in > dt_time(9, 30)
+                hours = (check_out.hour * 60 + check_out.minute - check_in.hour * 60 - check_in.minute) / 60
+                rows.append({
+                    "id": uuid.uuid4(),
+                    "employee_id": emp_id,
+                    "date": day,
+                    "check_in": check_in,
+                    "check_out": check_out,
+                    "hours_worked": Decimal(f"{hours:.2f}"),
+                    "status": AttendanceStatus.LATE if late else AttendanceStatus.PRESENT,
+                    "created_at": now,
+                })
+            _insert_batches(conn, Attendance.__table__, rows)
+
+    db = make_sessionmaker(engine)()
+    try:
+        rebuild_rollup(db)
+        db.commit()
+    finally:
+        db.close()
+
+    return ids
+
+
+def make_sessionmaker(engine):
+    """Session factory matching `app.database.SessionLocal`"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class StatementCounter:
+    """Counts SQL statements executed on an engine"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@contextmanager
+def count_statements(engine):
+    """Context manager yielding a StatementCounter attached to `engine`"""
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+def timed(fn, repeat: int = 5):
+    """
+    Run `fn` several times
+
+    Returns:
+        (median_ms, last_result)
+    """
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def auth_headers(user_id, role: UserRole = UserRole.EMPLOYEE):
+    """Bearer headers for a user, without going through /auth/login"""
+    from app.core.security import create_access_token
+    token = create_access_token({"sub": str(user_id), "role": role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def clear_day(engine, day: date):
+    """Delete one day's attendance and rebuild its rollup rows"""
+    with engine.begin() as conn:
+        conn.execute(delete(Attendance.__table__).where(Attendance.date == day))
+    db = make_sessionmaker(engine)()
+    try:
+        rebuild_rollup(db, day, day)
+        db.commit()
+    finally:
+        db.close()
+
+
+def start_api_server(database_url: str, workers: int = 1, env=None):
+    """
+    Run uvicorn against `database_url`
+
+    Args:
+        database_url: DATABASE_URL for the server
+        workers: Number of uvicorn worker processes
+        env: Extra environment variables for the server
+
+    Returns:
+        (process, base_url); terminate the process when done
+    """
+    import httpx
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning",
+         "--workers", str(workers)],
+        cwd=backend_dir,
+        env={**os.environ, **(env or {}), "DATABASE_URL": database_url},
+        stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{base_url}/api/health").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
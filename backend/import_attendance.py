@@ -0,0 +1,63 @@
+"""
+Attendance Import Script
+Loads a badge-reader dump (CSV or NDJSON swipes) into attendance
+
+Usage:
+    python import_attendance.py swipes.csv
+    python import_attendance.py swipes.ndjson --batch-size 5000
+    cat swipes.csv | python import_attendance.py - --format csv
+"""
+
+import os
+import sys
+import argparse
+
+# Add app to path
+sys.path.insert(0, '.')
+
+from app.database import SessionLocal, init_db
+from app.services.attendance_import import DEFAULT_BATCH_SIZE, FORMATS, import_swipes, text_lines
+
+
+def main():
+    """Main import function"""
+    parser = argparse.ArgumentParser(description='Import badge-reader swipes into attendance')
+    parser.add_argument('path', help='CSV or NDJSON file, or - for stdin')
+    parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Employee-days per upsert batch')
+    args = parser.parse_args()
+    
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.path)[1].lower()
+        fmt = 'ndjson' if extension in ('.ndjson', '.jsonl') else 'csv'
+    
+    init_db()
+    db = SessionLocal()
+    source = sys.stdin.buffer if args.path == '-' else open(args.path, 'rb')
+    
+    try:
+        report = import_swipes(db, text_lines(source), fmt, args.batch_size)
+    except Exception as e:
+        print(f"\n❌ Error during import: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        source.close()
+    
+    print(f"✅ Imported {report.swipes_accepted} swipes from {report.rows_read} rows "
+          f"in {report.elapsed:.1f}s ({report.as_dict()['rows_per_second']} rows/s)")
+    print(f"   Attendance: {report.attendance_created} created, {report.attendance_updated} updated "
+          f"in {report.batches} batches")
+    if report.rejected:
+        print(f"⚠️ Rejected {report.rejected} rows:")
+        for rejection in report.rejections:
+            print(f"   line {rejection['line']}: {rejection['reason']}")
+        if report.rejected > len(report.rejections):
+            print(f"   ... and {report.rejected - len(report.rejections)} more")
+
+
+if __name__ == "__main__":
+    main()
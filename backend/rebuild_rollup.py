@@ -0,0 +1,45 @@
+"""
+Attendance Rollup Rebuild Script
+Recomputes the attendance_rollup table from raw attendance rows
+
+Usage:
+    python rebuild_rollup.py                                  # Rebuild all history
+    python rebuild_rollup.py --start 2024-06-01 --end 2024-06-30
+"""
+
+import sys
+import argparse
+from datetime import date
+
+# Add app to path
+sys.path.insert(0, '.')
+
+from app.database import SessionLocal, init_db
+from app.services.rollup import rebuild_rollup
+
+
+def main():
+    """Main rebuild function"""
+    parser = argparse.ArgumentParser(description='Rebuild the attendance rollup table')
+    parser.add_argument('--start', type=date.fromisoformat, help='First date to rebuild (YYYY-MM-DD)')
+    parser.add_argument('--end', type=date.fromisoformat, help='Last date to rebuild (YYYY-MM-DD)')
+    args = parser.parse_args()
+    
+    init_db()
+    db = SessionLocal()
+    
+    try:
+        rows = rebuild_rollup(db, start_date=args.start, end_date=args.end)
+        db.commit()
+        scope = f"{args.start or 'beginning'} to {args.end or 'today'}"
+        print(f"✅ Attendance rollup rebuilt ({scope}): {rows} rows")
+    except Exception as e:
+        print(f"\n❌ Error during rebuild: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
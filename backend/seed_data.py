@@ -20,10 +20,12 @@ from app.database import SessionLocal, init_db
 from app.models.user import User, UserRole
 from app.models.employee import Employee, EmployeeStatus
 from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance_rollup import AttendanceRollup
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.models.document import Document, DocumentCategory
 from app.models.announcement import Announcement, AnnouncementPriority, TargetAudience
 from app.core.security import get_password_hash
+from app.services.rollup import rebuild_rollup
 
 
 # Indian names for realistic data
@@ -88,6 +90,7 @@ def clear_data(db):
     db.query(Announcement).delete()
     db.query(Document).delete()
     db.query(Task).delete()
+    db.query(AttendanceRollup).delete()
     db.query(Attendance).delete()
     db.query(Employee).delete()
     db.query(User).delete()
@@ -274,6 +277,10 @@ def create_attendance_records(db, employees, days=60):
     
     db.commit()
     print(f"✅ {total_records} attendance records created")
+    
+    rebuild_rollup(db)
+    db.commit()
+    print("✅ Attendance rollup rebuilt")
 
 
 def create_tasks(db, employees, count=40):